@@ -0,0 +1 @@
+# 공통 모듈
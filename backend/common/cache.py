@@ -0,0 +1,212 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from urllib.parse import urlencode
+
+from flask import Response, make_response, request
+
+from .db import Database
+
+# 응답 캐시 설정
+#  - RESPONSE_CACHE_BACKEND: memory(워커별 LRU) 또는 sqlite(워커들이 공유하는 파일)
+#  - RESPONSE_CACHE_SIZE: 최대 항목 수, RESPONSE_CACHE_TTL: 항목 유효 시간(초)
+CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'memory')
+CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', 1024))
+CACHE_TTL = float(os.environ.get('RESPONSE_CACHE_TTL', 30))
+CACHE_FILE = os.environ.get(
+    'RESPONSE_CACHE_FILE',
+    os.path.join(os.path.dirname(__file__), '../../database/response_cache.db')
+)
+
+
+class MemoryBackend:
+    """프로세스 안의 LRU + TTL 저장소 (세대 번호도 프로세스 안에서만 유지)"""
+
+    def __init__(self, max_entries=CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def generation(self, resource):
+        return self._generations.get(resource, 0)
+
+    def bump(self, resource):
+        with self._lock:
+            self._generations[resource] = self._generations.get(resource, 0) + 1
+            return self._generations[resource]
+
+    def info(self):
+        return {
+            'backend': 'memory',
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'evictions': self.evictions
+        }
+
+
+class SQLiteBackend:
+    """여러 워커가 공유하는 SQLite 파일 저장소
+
+    세대 번호와 항목을 모두 파일에 두므로 한 워커의 쓰기가 다른 워커의 캐시도 무효화한다.
+    적중 때마다 쓰기가 생기지 않도록 LRU 대신 만료/저장 순서로 max_entries 를 유지한다.
+    """
+
+    # 이 횟수만큼 저장할 때마다 만료/초과 항목 정리
+    PRUNE_EVERY = 64
+
+    def __init__(self, path=CACHE_FILE, max_entries=CACHE_SIZE):
+        self.max_entries = max_entries
+        self.db = Database(path)
+        self.evictions = 0
+        self._sets = 0
+        with self.db.transaction() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS cache_generations (
+                    resource TEXT PRIMARY KEY,
+                    generation INTEGER NOT NULL DEFAULT 0
+                ) WITHOUT ROWID
+            ''')
+
+    def get(self, key):
+        row = self.db.connection().execute(
+            'SELECT value FROM cache_entries WHERE key = ? AND expires_at >= ?', (key, time.time())
+        ).fetchone()
+        return None if row is None else bytes(row[0])
+
+    def set(self, key, value, ttl):
+        with self.db.transaction() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO cache_entries (key, value, expires_at) VALUES (?, ?, ?)',
+                (key, value, time.time() + ttl)
+            )
+            self._sets += 1
+            if self._sets % self.PRUNE_EVERY == 0:
+                self.evictions += conn.execute('DELETE FROM cache_entries WHERE expires_at < ?', (time.time(),)).rowcount
+                self.evictions += conn.execute('''
+                    DELETE FROM cache_entries WHERE rowid IN (
+                        SELECT rowid FROM cache_entries ORDER BY rowid DESC LIMIT -1 OFFSET ?
+                    )
+                ''', (self.max_entries,)).rowcount
+
+    def generation(self, resource):
+        row = self.db.connection().execute(
+            'SELECT generation FROM cache_generations WHERE resource = ?', (resource,)
+        ).fetchone()
+        return 0 if row is None else row[0]
+
+    def bump(self, resource):
+        with self.db.transaction() as conn:
+            conn.execute('''
+                INSERT INTO cache_generations (resource, generation) VALUES (?, 1)
+                ON CONFLICT (resource) DO UPDATE SET generation = generation + 1
+            ''', (resource,))
+            return conn.execute(
+                'SELECT generation FROM cache_generations WHERE resource = ?', (resource,)
+            ).fetchone()[0]
+
+    def info(self):
+        return {
+            'backend': 'sqlite',
+            'entries': self.db.connection().execute('SELECT COUNT(*) FROM cache_entries').fetchone()[0],
+            'max_entries': self.max_entries,
+            'evictions': self.evictions
+        }
+
+
+class ResponseCache:
+    """라우트 + 쿼리 문자열 단위 GET 응답 캐시 (자원별 세대 번호로 무효화)
+
+    캐시 키에 자원의 현재 세대 번호를 넣어 두고, 쓰기 처리부가 invalidate(자원) 으로
+    세대를 올리면 그 자원을 읽는 모든 응답이 한 번에 무효가 된다 (옛 항목은 LRU/TTL 로 사라짐).
+    세대 번호는 응답을 만들기 전에 읽으므로, 만드는 도중에 쓰기가 일어난 응답은 옛 세대로
+    저장되어 다시 쓰이지 않는다.
+    """
+
+    def __init__(self, backend, ttl=CACHE_TTL):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def cached(self, *resources):
+        """GET 뷰 데코레이터 - 200 JSON 응답을 resources 세대별로 캐시"""
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                generations = ','.join(f'{resource}:{self.backend.generation(resource)}' for resource in resources)
+                # 값 안의 '&', '=' 등이 다른 쿼리와 같은 키를 만들지 않도록 다시 인코딩
+                query = urlencode(sorted(request.args.items(multi=True)))
+                key = f'{generations}|{request.path}?{query}'
+
+                body = self.backend.get(key)
+                if body is not None:
+                    self.hits += 1
+                    return Response(body, mimetype='application/json', headers={'X-Cache': 'HIT'})
+
+                self.misses += 1
+                response = make_response(view(*args, **kwargs))
+                if response.status_code == 200 and response.mimetype == 'application/json':
+                    self.backend.set(key, response.get_data(), self.ttl)
+                response.headers['X-Cache'] = 'MISS'
+                return response
+            return wrapper
+        return decorator
+
+    def invalidate(self, *resources):
+        """자원의 세대 번호를 올려 관련 캐시 응답을 모두 무효화"""
+        for resource in resources:
+            self.backend.bump(resource)
+            self.invalidations += 1
+
+    def info(self):
+        return {
+            **self.backend.info(),
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+            'hit_rate': round(self.hits / (self.hits + self.misses), 4) if self.hits + self.misses else None
+        }
+
+
+def create_backend(name=CACHE_BACKEND):
+    if name == 'sqlite':
+        return SQLiteBackend()
+    if name == 'memory':
+        return MemoryBackend()
+    raise ValueError(f'알 수 없는 응답 캐시 저장소: {name}')
+
+
+# 워커 전역 응답 캐시
+response_cache = ResponseCache(create_backend())
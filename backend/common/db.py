@@ -0,0 +1,201 @@
+import math
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+# 기본 PRAGMA 설정
+#  - WAL: 쓰기 중에도 읽기가 막히지 않음
+#  - synchronous=NORMAL: WAL 모드에서는 체크포인트 시에만 fsync (커밋 내구성은 유지)
+#  - cache_size: 음수면 KiB 단위 (약 20MB)
+#  - busy_timeout: 쓰기 잠금 대기 시간(ms), "database is locked" 대신 대기
+DEFAULT_PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('cache_size', -20000),
+    ('mmap_size', 256 * 1024 * 1024),
+    ('busy_timeout', 5000),
+    ('temp_store', 'MEMORY'),
+)
+
+# 연결마다 보관할 준비된 SQL 문 개수 (sqlite3 모듈의 statement cache)
+STATEMENT_CACHE_SIZE = 256
+
+# 반납된 연결을 보관할 최대 개수 (넘치면 닫음)
+DEFAULT_POOL_SIZE = 16
+
+
+# 일부 SQLite 빌드에는 수학 함수가 없으므로 없을 때만 파이썬 구현을 등록
+_MATH_FUNCTIONS = {
+    'radians': (1, math.radians),
+    'sin': (1, math.sin),
+    'cos': (1, math.cos),
+    'asin': (1, math.asin),
+    'sqrt': (1, math.sqrt),
+    'pow': (2, math.pow),
+}
+
+
+def ensure_math_functions(conn):
+    """SQL 에서 radians/sin/cos/asin/sqrt/pow 를 사용할 수 있도록 보장"""
+    try:
+        conn.execute('SELECT cos(radians(0)), asin(sqrt(pow(0, 2)))').fetchone()
+        return
+    except sqlite3.OperationalError:
+        pass
+    for name, (n_args, func) in _MATH_FUNCTIONS.items():
+        conn.create_function(name, n_args, _null_safe(func), deterministic=True)
+
+
+def _null_safe(func):
+    def wrapper(*args):
+        if any(arg is None for arg in args):
+            return None
+        return func(*args)
+    return wrapper
+
+
+class Database:
+    """스레드별 SQLite 연결을 재사용하는 데이터베이스 접근 계층
+
+    요청마다 connect/close 하는 대신 연결을 풀에 두고 재사용하여
+    PRAGMA 설정과 준비된 SQL 문(statement cache)을 유지한다.
+    요청 중에는 스레드마다 연결 하나를 쓰고, 요청이 끝나면(release) 풀에 반납하므로
+    요청마다 스레드를 만드는 서버(app.run)에서도 연결 수가 동시 요청 수를 넘지 않는다.
+    반납하지 않고 끝난 스레드의 연결은 새 연결을 만들기 전에 회수한다.
+    fork 된 워커에서는 부모 프로세스의 연결을 쓰지 않고 새로 연결한다.
+    """
+
+    def __init__(self, path, pragmas=DEFAULT_PRAGMAS, timeout=5.0, pool_size=DEFAULT_POOL_SIZE):
+        self.path = path
+        self.pragmas = tuple(pragmas)
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self._local = threading.local()
+        self._connections = {}  # 이 프로세스의 연결 -> 사용 중인 스레드 (풀에 있으면 None)
+        self._idle = []  # 반납된 연결 (최대 pool_size 개)
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+
+    def connect(self):
+        """설정이 적용된 새 연결 생성"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.timeout,
+            cached_statements=STATEMENT_CACHE_SIZE,
+            check_same_thread=False
+        )
+        conn.row_factory = sqlite3.Row
+        ensure_math_functions(conn)
+        for name, value in self.pragmas:
+            conn.execute(f'PRAGMA {name} = {value}')
+        return conn
+
+    def connection(self):
+        """현재 스레드의 연결 (없으면 풀에서 꺼내거나 새로 생성)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        with self._lock:
+            if self._pid != os.getpid():
+                # fork 된 워커 - 부모의 연결은 닫지 않고 버림
+                self._connections = {}
+                self._idle = []
+                self._pid = os.getpid()
+            if not self._idle:
+                self._reclaim()
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = self.connect()
+
+        with self._lock:
+            self._connections[conn] = threading.current_thread()
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def _reclaim(self):
+        # 반납하지 않고 끝난 스레드의 연결을 풀로 회수 (self._lock 을 잡은 상태에서 호출)
+        for conn, owner in list(self._connections.items()):
+            if owner is None or owner.is_alive():
+                continue
+            if conn.in_transaction:
+                conn.rollback()
+            if len(self._idle) < self.pool_size:
+                self._connections[conn] = None
+                self._idle.append(conn)
+            else:
+                del self._connections[conn]
+                conn.close()
+
+    def release(self):
+        """요청 종료 시 호출 - 남은 트랜잭션을 롤백하고 연결을 풀에 반납"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            return
+        self._local.conn = None
+        if self._local.pid != os.getpid():
+            return
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if conn not in self._connections:
+                # close_all() 로 이미 닫힌 연결
+                return
+            if len(self._idle) < self.pool_size:
+                self._connections[conn] = None
+                self._idle.append(conn)
+                return
+            del self._connections[conn]
+        conn.close()
+
+    @contextmanager
+    def transaction(self, immediate=True):
+        """쓰기 트랜잭션 (성공 시 커밋, 예외 시 롤백)"""
+        conn = self.connection()
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute('BEGIN IMMEDIATE' if immediate else 'BEGIN')
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+
+    def close(self):
+        """현재 스레드의 연결 닫기"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            return
+        self._local.conn = None
+        if self._local.pid == os.getpid():
+            with self._lock:
+                self._connections.pop(conn, None)
+            conn.close()
+
+    def close_all(self):
+        """이 프로세스에서 연 모든 연결 닫기"""
+        with self._lock:
+            connections = list(self._connections) if self._pid == os.getpid() else []
+            self._connections = {}
+            self._idle = []
+            self._pid = os.getpid()
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
+
+    def info(self):
+        return {
+            'connections': len(self._connections),
+            'idle': len(self._idle),
+            'pool_size': self.pool_size
+        }
@@ -0,0 +1,340 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# 구독자별 전달 대기 이벤트 상한 (넘으면 느린 구독자로 보고 연결 종료)
+DEFAULT_MAX_PENDING = 1000
+
+# 이벤트 기록 확인 주기 (초), 기록 보관 기간 (일)
+POLL_INTERVAL = float(os.environ.get('STREAM_POLL_INTERVAL', 1.0))
+RETENTION_DAYS = 1
+
+# 한 번에 읽는 이벤트 기록 수, 재연결(Last-Event-ID) 시 기록별로 다시 보내 줄 최대 이벤트 수
+POLL_BATCH = 1000
+REPLAY_LIMIT = 1000
+
+# SQLite 정수 최댓값 (읽을 범위의 끝이 없을 때)
+MAX_SEQ = 2 ** 63 - 1
+
+
+class Event:
+    """허브로 발행된 이벤트 (SSE 메시지는 발행 시 한 번만 만들어 모든 구독자가 공유)
+
+    source/seq 는 이벤트를 읽은 기록 테이블 번호와 그 안의 seq.
+    """
+
+    __slots__ = ('id', 'kind', 'data', 'category', 'lat', 'lng', 'source', 'seq', 'message')
+
+    def __init__(self, event_id, kind, data, category=None, lat=None, lng=None, source=None, seq=None):
+        self.id = event_id
+        self.kind = kind
+        self.data = data
+        self.category = category
+        self.lat = lat
+        self.lng = lng
+        self.source = source
+        self.seq = seq
+        payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        self.message = f'id: {event_id}\nevent: {kind}\ndata: {payload}\n\n'
+
+
+class Subscription:
+    """구독자 한 명의 필터와 전달 대기열
+
+    kinds/categories 는 허용할 값의 집합(None 이면 전부), bbox 는 (최소 위도, 최소 경도,
+    최대 위도, 최대 경도). 카테고리 필터는 카테고리가 있는 이벤트에만, 영역 필터는
+    모든 이벤트에 적용된다 (좌표가 없는 이벤트는 영역 밖으로 취급). after 는 기록별로
+    이미 받은 마지막 seq 로, 다른 워커에서 더 앞서 받은 이벤트를 다시 보내지 않는다.
+    """
+
+    def __init__(self, kinds=None, categories=None, bbox=None, max_pending=DEFAULT_MAX_PENDING, after=None):
+        self.kinds = kinds
+        self.categories = categories
+        self.bbox = bbox
+        self.after = after
+        self.max_pending = max_pending
+        self.closed = False
+        self.overflowed = False
+        self._events = deque()
+        self._cond = threading.Condition(threading.Lock())
+
+    def matches(self, event):
+        if self.after is not None and event.source is not None and event.seq <= self.after[event.source]:
+            return False
+        if self.kinds is not None and event.kind not in self.kinds:
+            return False
+        if self.categories is not None and event.category is not None and event.category not in self.categories:
+            return False
+        if self.bbox is not None:
+            if event.lat is None or event.lng is None:
+                return False
+            min_lat, min_lng, max_lat, max_lng = self.bbox
+            if not (min_lat <= event.lat <= max_lat and min_lng <= event.lng <= max_lng):
+                return False
+        return True
+
+    def offer(self, event):
+        """필터에 맞으면 대기열에 추가 (대기열이 가득 차면 구독 종료)"""
+        if self.closed or not self.matches(event):
+            return False
+        with self._cond:
+            if len(self._events) >= self.max_pending:
+                self.overflowed = True
+                self.closed = True
+            else:
+                self._events.append(event)
+            self._cond.notify()
+        return not self.closed
+
+    def prepend(self, events):
+        """놓친 이벤트를 대기열 앞에 넣음 (재연결 시 이후 이벤트보다 먼저 전달)"""
+        events = [event for event in events if self.matches(event)]
+        if self.closed or not events:
+            return
+        with self._cond:
+            self._events.extendleft(reversed(events))
+            self._cond.notify()
+
+    def wait(self, timeout):
+        """대기 중인 이벤트 목록 (timeout 초 동안 없으면 빈 목록, 종료된 구독이면 None)"""
+        with self._cond:
+            if not self._events and not self.closed:
+                self._cond.wait(timeout)
+            if self.closed:
+                return None
+            events = list(self._events)
+            self._events.clear()
+            return events
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify()
+
+
+class EventHub:
+    """프로세스 내 발행/구독 허브
+
+    EventFeed 가 publish() 하면 필터에 맞는 구독자 대기열에 이벤트를 넣고 깨운다.
+    구독자는 데이터베이스를 읽지 않으므로 구독자 수와 무관하게 연결을 쓰지 않는다.
+    """
+
+    def __init__(self, max_pending=DEFAULT_MAX_PENDING):
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._wakeup = threading.Event()
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    def publish(self, event):
+        """이벤트를 구독자에게 전달 - 전달한 구독자 수 반환"""
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self.published += 1
+
+        delivered = 0
+        for subscription in subscribers:
+            if subscription.offer(event):
+                delivered += 1
+            elif subscription.overflowed and self.unsubscribe(subscription):
+                self.dropped += 1
+        self.delivered += delivered
+        return delivered
+
+    def subscribe(self, kinds=None, categories=None, bbox=None, after=None):
+        """구독 등록"""
+        subscription = Subscription(kinds, categories, bbox, self.max_pending, after)
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """구독 해제 - 등록되어 있던 구독이면 True"""
+        subscription.close()
+        with self._lock:
+            if subscription not in self._subscribers:
+                return False
+            self._subscribers.discard(subscription)
+            return True
+
+    def notify(self):
+        """쓰기 처리부가 커밋 후 호출 - 기록을 읽는 스레드를 주기보다 일찍 깨움"""
+        self._wakeup.set()
+
+    def wait_for_writes(self, timeout):
+        self._wakeup.wait(timeout)
+        self._wakeup.clear()
+
+    def info(self):
+        return {
+            'subscribers': len(self._subscribers),
+            'published': self.published,
+            'delivered': self.delivered,
+            'dropped_subscribers': self.dropped
+        }
+
+
+class EventLog:
+    """트리거가 쓰는 이벤트 기록 테이블 하나 (seq INTEGER PRIMARY KEY AUTOINCREMENT, created_at)
+
+    to_event(row) 는 기록 행 -> (종류, 데이터, 카테고리, 위도, 경도).
+    """
+
+    def __init__(self, db, table, to_event):
+        self.db = db
+        self.table = table
+        self.to_event = to_event
+
+    def last_seq(self):
+        cursor = self.db.connection().cursor()
+        cursor.execute(f'SELECT COALESCE(MAX(seq), 0) FROM {self.table}')
+        return cursor.fetchone()[0]
+
+    def read(self, after, until=None, limit=POLL_BATCH, latest=False):
+        """after < seq <= until 인 기록 (seq 순, latest 면 그중 마지막 limit 개)"""
+        cursor = self.db.connection().cursor()
+        cursor.execute(f'''
+            SELECT * FROM {self.table}
+            WHERE seq > ? AND seq <= ?
+            ORDER BY seq {'DESC' if latest else ''}
+            LIMIT ?
+        ''', (after, MAX_SEQ if until is None else until, limit))
+        rows = cursor.fetchall()
+        return rows[::-1] if latest else rows
+
+    def prune(self, retention_days=RETENTION_DAYS):
+        with self.db.transaction() as conn:
+            conn.execute(
+                f"DELETE FROM {self.table} WHERE created_at < datetime('now', ?)",
+                (f'-{retention_days} days',)
+            )
+
+
+class EventFeed:
+    """이벤트 기록 테이블들을 주기적으로 읽어 허브로 발행하는 스레드
+
+    쓰는 쪽(API, 다른 워커, derive_hotzones.py 등)은 트리거로 기록 테이블에만 쓰고,
+    워커마다 이 스레드 하나가 새 기록을 읽어 발행한다. 이벤트 id 는 기록별 seq 를
+    '-' 로 이은 값(예: '120-35')이라 워커나 재시작과 무관하게 같은 이벤트는 같은 id 를
+    가지며, 재연결 시 Last-Event-ID 이후의 기록을 데이터베이스에서 다시 읽어 보낸다.
+    """
+
+    def __init__(self, hub, logs, interval=POLL_INTERVAL):
+        self.hub = hub
+        self.logs = logs
+        self.interval = interval
+        self.cursor = None
+        self.last_error = None
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def format_id(self, cursor):
+        return '-'.join(str(seq) for seq in cursor)
+
+    def parse_id(self, value):
+        """'120-35' -> (120, 35) (형식이 다르면 ValueError)"""
+        parts = tuple(int(part) for part in value.split('-'))
+        if len(parts) != len(self.logs) or min(parts) < 0:
+            raise ValueError(f'이벤트 id 형식이 올바르지 않습니다: {value}')
+        return parts
+
+    def start(self):
+        """발행 스레드 시작 (이미 실행 중이면 무시, fork 된 워커에서는 새로 시작)
+
+        시작 시점의 마지막 기록 위치를 먼저 읽으므로 그 이후의 기록만 발행한다.
+        """
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self.cursor = tuple(log.last_seq() for log in self.logs)
+                self._thread = threading.Thread(target=self._run, name='event-feed', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        last_pruned = 0.0
+        while True:
+            try:
+                self.poll()
+                if time.monotonic() - last_pruned > 3600:
+                    for log in self.logs:
+                        log.prune()
+                    last_pruned = time.monotonic()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+            finally:
+                for log in self.logs:
+                    log.db.release()
+            self.hub.wait_for_writes(self.interval)
+
+    def _events(self, cursor, batches):
+        """기록별 행 목록 -> (Event 목록, 마지막 위치), 여러 기록은 created_at 순으로 섞음"""
+        cursor = list(cursor)
+        rows = sorted(
+            ((row['created_at'] or '', i, row) for i, rows in enumerate(batches) for row in rows),
+            key=lambda item: item[:2]
+        )
+        events = []
+        for _, i, row in rows:
+            cursor[i] = row['seq']
+            kind, data, category, lat, lng = self.logs[i].to_event(row)
+            events.append(Event(self.format_id(cursor), kind, data, category, lat, lng, i, row['seq']))
+        return events, tuple(cursor)
+
+    def poll(self):
+        """새 기록을 이벤트로 발행 - 발행한 수 반환"""
+        published = 0
+        while True:
+            batches = [log.read(seq) for log, seq in zip(self.logs, self.cursor)]
+            with self._lock:
+                events, self.cursor = self._events(self.cursor, batches)
+                for event in events:
+                    self.hub.publish(event)
+            published += len(events)
+            if all(len(rows) < POLL_BATCH for rows in batches):
+                return published
+
+    def subscribe(self, kinds=None, categories=None, bbox=None, last_event_id=None):
+        """구독 등록 (last_event_id 가 있으면 그 이후의 기록을 데이터베이스에서 읽어 먼저 전달)
+
+        등록과 현재 위치 확인을 발행과 같은 잠금 안에서 하므로, 다시 읽는 범위
+        (last_event_id, 현재 위치] 와 이후 발행되는 이벤트가 겹치거나 비지 않는다.
+        """
+        after = None if last_event_id is None else self.parse_id(last_event_id)
+        self.start()
+        with self._lock:
+            subscription = self.hub.subscribe(kinds, categories, bbox, after)
+            until = self.cursor
+        if after is not None:
+            subscription.prepend(self.replay(after, until))
+        return subscription
+
+    def replay(self, after, until):
+        """기록별 위치 after 이후 until 까지의 이벤트 (기록별 최근 REPLAY_LIMIT 개까지)"""
+        try:
+            batches = [
+                log.read(seq, limit, REPLAY_LIMIT, latest=True)
+                for log, seq, limit in zip(self.logs, after, until)
+            ]
+        finally:
+            for log in self.logs:
+                log.db.release()
+        return self._events(after, batches)[0]
+
+    def info(self):
+        return {
+            'last_event_id': None if self.cursor is None else self.format_id(self.cursor),
+            'poll_interval': self.interval,
+            'last_error': self.last_error
+        }
+
+
+# 워커 전역 허브
+event_hub = EventHub()
@@ -0,0 +1,27 @@
+import math
+
+import numpy as np
+
+# 지구 평균 반지름 (km)
+EARTH_RADIUS_KM = 6371.0088
+
+# 위도 1도당 거리 (km)
+KM_PER_DEG_LAT = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """두 좌표(또는 좌표 배열) 사이의 대원 거리 (km)"""
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = np.radians(np.subtract(lng2, lng1))
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+
+def degree_span(lat, radius_km):
+    """반경을 위도/경도 방향 각도 폭으로 변환"""
+    dlat = radius_km / KM_PER_DEG_LAT
+    cos_lat = max(math.cos(math.radians(min(abs(lat) + dlat, 89.9))), 1e-6)
+    dlng = radius_km / (KM_PER_DEG_LAT * cos_lat)
+    return dlat, dlng
@@ -0,0 +1,132 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+# 한 트랜잭션에 묶는 최대 쓰기 수 / 첫 쓰기 이후 더 모으는 최대 시간 (초)
+# 대기 시간이 0 이면 이전 배치를 커밋하는 동안 쌓인 쓰기만 묶음 (부하가 클수록 배치가 커짐)
+DEFAULT_MAX_BATCH = 256
+DEFAULT_MAX_DELAY = 0.0
+
+
+class BatchWriter:
+    """쓰기 작업을 모아 하나의 트랜잭션으로 커밋하는 백그라운드 writer (group commit)
+
+    submit(func, *args) 로 넣은 작업은 writer 스레드에서 func(cursor, *args) 로 실행된다.
+    첫 작업이 들어온 뒤 max_delay 초 또는 max_batch 개까지 모아 한 번에 커밋하고,
+    커밋이 끝난 뒤에야 Future 에 func 의 반환값(예: lastrowid)을 넘긴다.
+    작업마다 SAVEPOINT 를 두므로 한 작업이 실패해도 같은 배치의 다른 작업은 커밋된다.
+    """
+
+    def __init__(self, db, max_batch=DEFAULT_MAX_BATCH, max_delay=DEFAULT_MAX_DELAY):
+        self.db = db
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue = queue.Queue()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.writes = 0
+        self.failed = 0
+        self.largest_batch = 0
+
+    def submit(self, func, *args):
+        """쓰기 작업 추가 - 커밋 후 결과가 채워지는 Future 반환"""
+        future = Future()
+        self._ensure_thread()
+        self._queue.put((func, args, future))
+        return future
+
+    def execute(self, func, *args, timeout=None):
+        """쓰기 작업을 넣고 커밋될 때까지 대기하여 결과 반환 (실패 시 예외)"""
+        return self.submit(func, *args).result(timeout)
+
+    def _ensure_thread(self):
+        # fork 된 워커에는 부모의 스레드가 없으므로 프로세스마다 새로 시작
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                if self._pid != os.getpid():
+                    self._queue = queue.Queue()
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='batch-writer', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            batch = [job]
+            stop = False
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    job = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if job is None:
+                    stop = True
+                    break
+                batch.append(job)
+            self._flush(batch)
+            if stop:
+                return
+
+    def _flush(self, batch):
+        outcomes = []
+        try:
+            with self.db.transaction() as conn:
+                cursor = conn.cursor()
+                for func, args, future in batch:
+                    cursor.execute('SAVEPOINT batch_write')
+                    try:
+                        value = func(cursor, *args)
+                    except Exception as e:
+                        cursor.execute('ROLLBACK TO batch_write')
+                        outcomes.append((future, None, e))
+                    else:
+                        outcomes.append((future, value, None))
+                    cursor.execute('RELEASE batch_write')
+        except Exception as e:
+            # 커밋 자체가 실패하면 배치 전체 실패
+            self.failed += len(batch)
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.writes += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        for future, value, error in outcomes:
+            if error is not None:
+                self.failed += 1
+                future.set_exception(error)
+            else:
+                future.set_result(value)
+
+    def close(self, timeout=None):
+        """남은 작업을 모두 커밋하고 writer 스레드 종료"""
+        thread = self._thread
+        if thread is None or self._pid != os.getpid() or not thread.is_alive():
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+        self._thread = None
+
+    def info(self):
+        return {
+            'enabled': True,
+            'queued': self._queue.qsize(),
+            'max_batch': self.max_batch,
+            'max_delay_ms': self.max_delay * 1000,
+            'batches': self.batches,
+            'writes': self.writes,
+            'failed': self.failed,
+            'largest_batch': self.largest_batch,
+            'avg_batch_size': round(self.writes / self.batches, 2) if self.batches else None
+        }
@@ -0,0 +1,78 @@
+# 새 게시물/댓글 기록 (트리거로 기록, 실시간 스트림의 EventFeed 가 읽어 이벤트로 발행)
+# 워커가 여럿이거나 다른 연결이 글을 써도 모든 워커의 구독자가 같은 이벤트를 받고,
+# 재연결(Last-Event-ID) 시 이 테이블에서 놓친 이벤트를 다시 읽는다
+COMMUNITY_EVENTS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS community_events (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        kind TEXT NOT NULL,
+        record_id INTEGER NOT NULL,
+        post_id INTEGER NOT NULL,
+        title TEXT,
+        content TEXT,
+        author TEXT,
+        location TEXT,
+        category TEXT,
+        latitude REAL,
+        longitude REAL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+# 이벤트에 담는 본문 길이
+EVENT_CONTENT_LENGTH = 100
+
+COMMUNITY_EVENT_TRIGGERS = [
+    f'''
+    CREATE TRIGGER IF NOT EXISTS posts_event_insert AFTER INSERT ON posts
+    BEGIN
+        INSERT INTO community_events
+            (kind, record_id, post_id, title, content, author, location, category, latitude, longitude)
+        VALUES
+            ('post', NEW.id, NEW.id, NEW.title, substr(NEW.content, 1, {EVENT_CONTENT_LENGTH}), NEW.author,
+             NEW.location, NEW.category, NEW.latitude, NEW.longitude);
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS comments_event_insert AFTER INSERT ON comments
+    BEGIN
+        INSERT INTO community_events
+            (kind, record_id, post_id, content, author, category, latitude, longitude)
+        SELECT 'comment', NEW.id, NEW.post_id, substr(NEW.content, 1, {EVENT_CONTENT_LENGTH}), NEW.author,
+               category, latitude, longitude
+        FROM posts WHERE id = NEW.post_id;
+    END
+    ''',
+]
+
+
+def init_community_events(cursor):
+    """게시물/댓글 기록 테이블/트리거 생성"""
+    cursor.execute(COMMUNITY_EVENTS_TABLE)
+    for statement in COMMUNITY_EVENT_TRIGGERS:
+        cursor.execute(statement)
+
+
+def event_payload(row):
+    """기록 행 -> 이벤트 데이터"""
+    if row['kind'] == 'comment':
+        return {
+            'id': row['record_id'],
+            'post_id': row['post_id'],
+            'content': row['content'],
+            'author': row['author']
+        }
+    return {
+        'id': row['record_id'],
+        'title': row['title'],
+        'content': row['content'],
+        'author': row['author'],
+        'location': row['location'],
+        'latitude': row['latitude'],
+        'longitude': row['longitude'],
+        'category': row['category']
+    }
+
+
+def community_event(row):
+    """기록 행 -> (종류, 데이터, 카테고리, 위도, 경도)"""
+    return row['kind'], event_payload(row), row['category'], row['latitude'], row['longitude']
@@ -1,125 +1,427 @@
 from flask import Blueprint, jsonify, request
-import json
 import os
-from datetime import datetime
-import sqlite3
+from datetime import datetime, timezone
+
+from common.cache import response_cache
+from common.db import Database
+from common.events import event_hub
+from common.writer import BatchWriter
+from .events import init_community_events
+from .search import init_search, match_query, ngram_text, post_terms, search_posts
+from .spatial import find_posts_near, init_post_rtree
+from .summary import init_comment_counters, init_post_counts, post_count
 
 community_bp = Blueprint('community', __name__)
 
 # 데이터베이스 파일 경로
 DB_FILE = os.path.join(os.path.dirname(__file__), '../../database/community.db')
+db = Database(DB_FILE)
+
+# 게시물/댓글 쓰기 묶음 처리(group commit) 사용 여부
+# 켜면 writer 스레드가 모인 쓰기(최대 BATCH_SIZE 개, 첫 쓰기 후 BATCH_DELAY_MS 까지)를
+# 한 트랜잭션으로 커밋 (기본은 요청마다 커밋)
+WRITE_BATCHING = os.environ.get('COMMUNITY_WRITE_BATCHING', '0') == '1'
+WRITE_BATCH_SIZE = int(os.environ.get('COMMUNITY_WRITE_BATCH_SIZE', 256))
+WRITE_BATCH_DELAY_MS = float(os.environ.get('COMMUNITY_WRITE_BATCH_DELAY_MS', 0))
+writer = BatchWriter(db, max_batch=WRITE_BATCH_SIZE, max_delay=WRITE_BATCH_DELAY_MS / 1000) if WRITE_BATCHING else None
+
+# 게시물 목록 페이지 크기
+MAX_POSTS_PER_PAGE = 100
+
+# 검색 결과 페이지 크기
+MAX_SEARCH_PER_PAGE = 50
+
+# 게시물 상세의 댓글 페이지 크기
+DEFAULT_COMMENTS_PER_PAGE = 50
+MAX_COMMENTS_PER_PAGE = 200
+
+# 근처 게시물 기본/최대 반경 (km), 페이지 크기
+DEFAULT_NEARBY_RADIUS_KM = 1.0
+MAX_NEARBY_RADIUS_KM = 20.0
+MAX_NEARBY_PER_PAGE = 100
+
+# 목록/검색에서 보여주는 본문 길이
+PREVIEW_LENGTH = 100
+
+# 목록/검색용 게시물 컬럼 (본문은 SQL 에서 잘라 전체 본문을 가져오지 않음)
+POST_LIST_COLUMNS = f'''
+    p.id, p.title,
+    CASE WHEN length(p.content) > {PREVIEW_LENGTH}
+        THEN substr(p.content, 1, {PREVIEW_LENGTH}) || '...'
+        ELSE p.content
+    END AS content,
+    p.author, p.location, p.latitude, p.longitude, p.category, p.created_at,
+    p.comment_count, p.last_comment_at
+'''
 
 def init_database():
     """커뮤니티 데이터베이스 초기화"""
     try:
         os.makedirs(os.path.dirname(DB_FILE), exist_ok=True)
         
-        conn = sqlite3.connect(DB_FILE)
-        cursor = conn.cursor()
-        
-        # 커뮤니티 게시물 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS posts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL,
-                content TEXT NOT NULL,
-                author TEXT NOT NULL,
-                location TEXT,
-                latitude REAL,
-                longitude REAL,
-                category TEXT DEFAULT '일반',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # 댓글 테이블
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS comments (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                post_id INTEGER NOT NULL,
-                content TEXT NOT NULL,
-                author TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (post_id) REFERENCES posts (id)
-            )
-        ''')
-        
+        conn = get_db_connection()
+        init_schema(conn.cursor())
         conn.commit()
-        conn.close()
         
         print("✅ 커뮤니티 데이터베이스 초기화 완료")
         
     except Exception as e:
         print(f"❌ 데이터베이스 초기화 실패: {e}")
 
+def init_schema(cursor):
+    """커뮤니티 테이블/인덱스/트리거 생성"""
+    # 커뮤니티 게시물 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS posts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            author TEXT NOT NULL,
+            location TEXT,
+            latitude REAL,
+            longitude REAL,
+            category TEXT DEFAULT '일반',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            comment_count INTEGER NOT NULL DEFAULT 0,
+            last_comment_at TIMESTAMP
+        )
+    ''')
+    
+    # 댓글 테이블
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS comments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            post_id INTEGER NOT NULL,
+            content TEXT NOT NULL,
+            author TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (post_id) REFERENCES posts (id)
+        )
+    ''')
+    
+    # 목록 정렬/커서 페이지네이션용 인덱스 (카테고리별, 전체)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_posts_category_created ON posts (category, created_at, id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_posts_created ON posts (created_at, id)')
+    
+    # 게시물별 댓글 조회/커서 페이지네이션용 인덱스 (id 는 rowid 로 포함됨)
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_comments_post_created ON comments (post_id, created_at)')
+    
+    # 게시물별 댓글 수 / 최근 댓글 시각 (트리거로 유지)
+    init_comment_counters(cursor)
+    
+    # 카테고리별 게시물 수 (트리거로 유지)
+    init_post_counts(cursor)
+    
+    # 게시물/댓글 전문 검색 색인 (n-gram 컬럼을 트리거로 색인)
+    init_search(cursor)
+    
+    # 좌표가 있는 게시물 공간 색인 (트리거로 유지)
+    init_post_rtree(cursor)
+    
+    # 실시간 스트림용 새 게시물/댓글 기록 (트리거로 기록)
+    init_community_events(cursor)
+
+def parse_cursor(value):
+    """'created_at,id' 형식의 커서를 (created_at, id) 로 변환"""
+    created_at, row_id = value.rsplit(',', 1)
+    return created_at, int(row_id)
+
+def parse_since(value):
+    """since 일시를 created_at 과 같은 UTC 'YYYY-MM-DD HH:MM:SS' 문자열로 변환
+
+    시간대가 없으면 UTC 로 간주한다 (created_at 은 CURRENT_TIMESTAMP, UTC).
+    """
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.strftime('%Y-%m-%d %H:%M:%S')
+
+def post_summary(post):
+    """목록/검색 결과용 게시물 딕셔너리 (POST_LIST_COLUMNS 행)"""
+    return {
+        'id': post['id'],
+        'title': post['title'],
+        'content': post['content'],
+        'author': post['author'],
+        'location': post['location'],
+        'latitude': post['latitude'],
+        'longitude': post['longitude'],
+        'category': post['category'],
+        'created_at': post['created_at'],
+        'comment_count': post['comment_count'],
+        'last_comment_at': post['last_comment_at']
+    }
+
+def fetch_comments(cursor, post_id, after=None, limit=DEFAULT_COMMENTS_PER_PAGE):
+    """게시물의 댓글을 오래된 순으로 limit 개 조회 (after 커서 이후)
+
+    (post_id, created_at) 인덱스를 순서대로 읽으므로 댓글 수와 무관하게 limit 개만 읽는다.
+    반환값은 (댓글 목록, 다음 커서 또는 None).
+    """
+    conditions = ['post_id = ?']
+    params = [post_id]
+    if after is not None:
+        conditions.append('(created_at, id) > (?, ?)')
+        params.extend(after)
+    cursor.execute(f'''
+        SELECT id, content, author, created_at FROM comments
+        WHERE {' AND '.join(conditions)}
+        ORDER BY created_at, id
+        LIMIT ?
+    ''', params + [limit + 1])
+    comments = cursor.fetchall()
+    has_more = len(comments) > limit
+    comments = comments[:limit]
+    next_cursor = f"{comments[-1]['created_at']},{comments[-1]['id']}" if has_more else None
+    
+    comments_list = []
+    for comment in comments:
+        comments_list.append({
+            'id': comment['id'],
+            'content': comment['content'],
+            'author': comment['author'],
+            'created_at': comment['created_at']
+        })
+    return comments_list, next_cursor
+
+def insert_post(cursor, values):
+    """게시물 INSERT 후 id 반환 (values: 제목, 내용, 작성자, 위치, 위도, 경도, 카테고리)
+
+    검색용 n-gram 컬럼도 같은 INSERT 로 쓰며, 색인은 트리거가 갱신한다.
+    """
+    cursor.execute('''
+        INSERT INTO posts (title, content, author, location, latitude, longitude, category,
+                           title_terms, content_terms, location_terms)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', tuple(values) + post_terms(values[0], values[1], values[3]))
+    return cursor.lastrowid
+
+def insert_comment(cursor, post_id, content, author):
+    """게시물이 있으면 댓글 INSERT 후 댓글 id 반환, 없으면 None"""
+    cursor.execute('SELECT id FROM posts WHERE id = ?', (post_id,))
+    if not cursor.fetchone():
+        return None
+    cursor.execute('''
+        INSERT INTO comments (post_id, content, author, content_terms)
+        VALUES (?, ?, ?, ?)
+    ''', (post_id, content, author, ngram_text(content)))
+    return cursor.lastrowid
+
+def execute_write(func, *args):
+    """쓰기 작업 func(cursor, *args) 실행 후 결과 반환 (커밋된 뒤 반환)
+
+    묶음 처리를 켜면 writer 스레드의 배치 트랜잭션에서, 아니면 현재 스레드에서 바로 커밋한다.
+    """
+    if writer is not None:
+        return writer.execute(func, *args)
+    with db.transaction() as conn:
+        return func(conn.cursor(), *args)
+
 def get_db_connection():
-    """데이터베이스 연결"""
-    conn = sqlite3.connect(DB_FILE)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """데이터베이스 연결 (스레드별 연결 재사용)"""
+    return db.connection()
+
+@community_bp.teardown_request
+def release_db_connection(exc):
+    """요청 종료 시 남은 트랜잭션 정리 (연결은 닫지 않고 재사용)"""
+    db.release()
 
 @community_bp.route('/', methods=['GET'])
+@response_cache.cached('posts')
 def get_posts():
     """게시물 목록 조회"""
     try:
-        page = request.args.get('page', 1, type=int)
-        per_page = request.args.get('per_page', 10, type=int)
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = min(max(request.args.get('per_page', 10, type=int), 1), MAX_POSTS_PER_PAGE)
         category = request.args.get('category', 'all')
+        after = request.args.get('after')
+        
+        try:
+            after = parse_cursor(after) if after else None
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': 'after 는 "created_at,id" 형식이어야 합니다.'
+            }), 400
         
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        # 카테고리별 필터링
+        # 카테고리별 필터링 + 커서 (created_at, id) 이전 게시물
+        # (category, created_at, id) / (created_at, id) 인덱스를 역순으로 읽으므로 정렬 없이 LIMIT 에서 멈춤
+        conditions = []
+        params = []
         if category != 'all':
-            cursor.execute('''
-                SELECT * FROM posts 
-                WHERE category = ? 
-                ORDER BY created_at DESC 
-                LIMIT ? OFFSET ?
-            ''', (category, per_page, (page - 1) * per_page))
-        else:
-            cursor.execute('''
-                SELECT * FROM posts 
-                ORDER BY created_at DESC 
-                LIMIT ? OFFSET ?
-            ''', (per_page, (page - 1) * per_page))
+            conditions.append('category = ?')
+            params.append(category)
+        if after is not None:
+            conditions.append('(created_at, id) < (?, ?)')
+            params.extend(after)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        
+        # 커서가 없으면 기존 page 방식 (OFFSET)
+        offset = 0 if after is not None else (page - 1) * per_page
+        cursor.execute(f'''
+            SELECT {POST_LIST_COLUMNS} FROM posts p
+            {where}
+            ORDER BY created_at DESC, id DESC
+            LIMIT ? OFFSET ?
+        ''', params + [per_page + 1, offset])
         
         posts = cursor.fetchall()
+        has_more = len(posts) > per_page
+        posts = posts[:per_page]
+        next_cursor = f"{posts[-1]['created_at']},{posts[-1]['id']}" if has_more else None
         
-        # 전체 게시물 수 조회
-        if category != 'all':
-            cursor.execute('SELECT COUNT(*) FROM posts WHERE category = ?', (category,))
-        else:
-            cursor.execute('SELECT COUNT(*) FROM posts')
+        # 전체 게시물 수 (카테고리별 개수 테이블)
+        total_count = post_count(cursor, None if category == 'all' else category)
+        
+        # 딕셔너리로 변환
+        posts_list = [post_summary(post) for post in posts]
+        
+        return jsonify({
+            'success': True,
+            'data': posts_list,
+            'pagination': {
+                'page': None if after is not None else page,
+                'per_page': per_page,
+                'total_count': total_count,
+                'total_pages': (total_count + per_page - 1) // per_page,
+                'has_more': has_more,
+                'next_cursor': next_cursor
+            }
+        })
         
-        total_count = cursor.fetchone()[0]
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@community_bp.route('/search', methods=['GET'])
+def search():
+    """게시물 검색 (제목/내용/위치/댓글, 관련도 순)"""
+    try:
+        q = request.args.get('q', '').strip()
+        page = max(request.args.get('page', 1, type=int), 1)
+        per_page = min(max(request.args.get('per_page', 10, type=int), 1), MAX_SEARCH_PER_PAGE)
+        category = request.args.get('category', 'all')
         
-        conn.close()
+        expression = match_query(q)
+        if expression is None:
+            return jsonify({
+                'success': False,
+                'error': '검색어는 2글자 이상이어야 합니다.'
+            }), 400
+        
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        posts = search_posts(
+            cursor, expression, POST_LIST_COLUMNS,
+            category=None if category == 'all' else category,
+            limit=per_page + 1,
+            offset=(page - 1) * per_page
+        )
+        has_more = len(posts) > per_page
+        posts = posts[:per_page]
         
-        # 딕셔너리로 변환
         posts_list = []
         for post in posts:
-            posts_list.append({
-                'id': post['id'],
-                'title': post['title'],
-                'content': post['content'][:100] + '...' if len(post['content']) > 100 else post['content'],
-                'author': post['author'],
-                'location': post['location'],
-                'latitude': post['latitude'],
-                'longitude': post['longitude'],
-                'category': post['category'],
-                'created_at': post['created_at']
-            })
+            summary = post_summary(post)
+            summary['score'] = round(-post['score'], 4)
+            posts_list.append(summary)
         
         return jsonify({
             'success': True,
+            'query': q,
             'data': posts_list,
             'pagination': {
                 'page': page,
                 'per_page': per_page,
-                'total_count': total_count,
-                'total_pages': (total_count + per_page - 1) // per_page
+                'has_more': has_more
+            }
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@community_bp.route('/nearby', methods=['GET'])
+def get_nearby_posts():
+    """특정 위치 반경 안의 게시물 조회 (최신순)"""
+    try:
+        lat = request.args.get('lat', type=float)
+        lng = request.args.get('lng', type=float)
+        radius = request.args.get('radius', DEFAULT_NEARBY_RADIUS_KM, type=float)
+        per_page = min(max(request.args.get('per_page', 20, type=int), 1), MAX_NEARBY_PER_PAGE)
+        since = request.args.get('since')
+        before = request.args.get('before')
+        
+        if lat is None or lng is None or not (-90 <= lat <= 90 and -180 <= lng <= 180):
+            return jsonify({
+                'success': False,
+                'error': '위도(lat)와 경도(lng)가 필요합니다.'
+            }), 400
+        
+        if not 0 < radius <= MAX_NEARBY_RADIUS_KM:
+            return jsonify({
+                'success': False,
+                'error': f'radius 는 0 초과 {MAX_NEARBY_RADIUS_KM:g}km 이하여야 합니다.'
+            }), 400
+        
+        try:
+            since = parse_since(since) if since else None
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': 'since 는 ISO 8601 일시여야 합니다.'
+            }), 400
+        
+        try:
+            before = parse_cursor(before) if before else None
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': 'before 는 "created_at,id" 형식이어야 합니다.'
+            }), 400
+        
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        # R*Tree 로 주변 후보만 읽어 반경/기간 판정 후 최신순으로 자름
+        nearby = find_posts_near(cursor, lat, lng, radius, since=since, before=before, limit=per_page)
+        has_more = len(nearby) > per_page
+        nearby = nearby[:per_page]
+        
+        posts = {}
+        if nearby:
+            cursor.execute(f'''
+                SELECT {POST_LIST_COLUMNS} FROM posts p
+                WHERE p.id IN ({','.join('?' * len(nearby))})
+            ''', [post_id for post_id, _ in nearby])
+            posts = {post['id']: post for post in cursor.fetchall()}
+        
+        posts_list = []
+        for post_id, distance in nearby:
+            summary = post_summary(posts[post_id])
+            summary['distance_km'] = round(distance, 3)
+            posts_list.append(summary)
+        
+        next_cursor = f"{posts_list[-1]['created_at']},{posts_list[-1]['id']}" if has_more else None
+        
+        return jsonify({
+            'success': True,
+            'data': posts_list,
+            'center': {'lat': lat, 'lng': lng},
+            'radius_km': radius,
+            'pagination': {
+                'per_page': per_page,
+                'has_more': has_more,
+                'next_cursor': next_cursor
             }
         })
         
@@ -141,13 +443,7 @@ def create_post():
                 'error': '제목, 내용, 작성자가 필요합니다.'
             }), 400
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO posts (title, content, author, location, latitude, longitude, category)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
+        values = (
             data['title'],
             data['content'],
             data['author'],
@@ -155,11 +451,12 @@ def create_post():
             data.get('latitude'),
             data.get('longitude'),
             data.get('category', '일반')
-        ))
+        )
+        post_id = execute_write(insert_post, values)
+        response_cache.invalidate('posts')
         
-        post_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        # 실시간 스트림 기록은 트리거가 남김 - 이 워커의 스트림이 바로 읽도록 깨움
+        event_hub.notify()
         
         return jsonify({
             'success': True,
@@ -175,8 +472,10 @@ def create_post():
 
 @community_bp.route('/<int:post_id>', methods=['GET'])
 def get_post(post_id):
-    """특정 게시물 조회"""
+    """특정 게시물 조회 (댓글은 오래된 순으로 comments_limit 개, 이후는 /<post_id>/comments)"""
     try:
+        comments_limit = min(max(request.args.get('comments_limit', DEFAULT_COMMENTS_PER_PAGE, type=int), 1), MAX_COMMENTS_PER_PAGE)
+        
         conn = get_db_connection()
         cursor = conn.cursor()
         
@@ -185,27 +484,13 @@ def get_post(post_id):
         post = cursor.fetchone()
         
         if not post:
-            conn.close()
             return jsonify({
                 'success': False,
                 'error': '게시물을 찾을 수 없습니다.'
             }), 404
         
-        # 댓글 조회
-        cursor.execute('SELECT * FROM comments WHERE post_id = ? ORDER BY created_at ASC', (post_id,))
-        comments = cursor.fetchall()
-        
-        conn.close()
-        
-        # 댓글 딕셔너리로 변환
-        comments_list = []
-        for comment in comments:
-            comments_list.append({
-                'id': comment['id'],
-                'content': comment['content'],
-                'author': comment['author'],
-                'created_at': comment['created_at']
-            })
+        # 댓글 첫 페이지 조회
+        comments_list, next_cursor = fetch_comments(cursor, post_id, limit=comments_limit)
         
         return jsonify({
             'success': True,
@@ -220,7 +505,60 @@ def get_post(post_id):
                 'category': post['category'],
                 'created_at': post['created_at'],
                 'updated_at': post['updated_at'],
-                'comments': comments_list
+                'comment_count': post['comment_count'],
+                'last_comment_at': post['last_comment_at'],
+                'comments': comments_list,
+                'comments_pagination': {
+                    'per_page': comments_limit,
+                    'total_count': post['comment_count'],
+                    'has_more': next_cursor is not None,
+                    'next_cursor': next_cursor
+                }
+            }
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@community_bp.route('/<int:post_id>/comments', methods=['GET'])
+def get_comments(post_id):
+    """게시물 댓글 목록 조회 (after 커서 이후, 오래된 순)"""
+    try:
+        per_page = min(max(request.args.get('per_page', DEFAULT_COMMENTS_PER_PAGE, type=int), 1), MAX_COMMENTS_PER_PAGE)
+        after = request.args.get('after')
+        
+        try:
+            after = parse_cursor(after) if after else None
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': 'after 는 "created_at,id" 형식이어야 합니다.'
+            }), 400
+        
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT comment_count FROM posts WHERE id = ?', (post_id,))
+        post = cursor.fetchone()
+        if not post:
+            return jsonify({
+                'success': False,
+                'error': '게시물을 찾을 수 없습니다.'
+            }), 404
+        
+        comments_list, next_cursor = fetch_comments(cursor, post_id, after=after, limit=per_page)
+        
+        return jsonify({
+            'success': True,
+            'data': comments_list,
+            'pagination': {
+                'per_page': per_page,
+                'total_count': post['comment_count'],
+                'has_more': next_cursor is not None,
+                'next_cursor': next_cursor
             }
         })
         
@@ -242,27 +580,18 @@ def add_comment(post_id):
                 'error': '댓글 내용과 작성자가 필요합니다.'
             }), 400
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # 게시물 존재 확인
-        cursor.execute('SELECT id FROM posts WHERE id = ?', (post_id,))
-        if not cursor.fetchone():
-            conn.close()
+        # 게시물 존재 확인 + 댓글 추가 (같은 트랜잭션)
+        comment_id = execute_write(insert_comment, post_id, data['content'], data['author'])
+        if comment_id is None:
             return jsonify({
                 'success': False,
                 'error': '게시물을 찾을 수 없습니다.'
             }), 404
+        # 목록의 댓글 수/최근 댓글 시각이 바뀜
+        response_cache.invalidate('posts')
         
-        # 댓글 추가
-        cursor.execute('''
-            INSERT INTO comments (post_id, content, author)
-            VALUES (?, ?, ?)
-        ''', (post_id, data['content'], data['author']))
-        
-        comment_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        # 실시간 스트림 기록은 트리거가 남김 (게시물의 카테고리/좌표로 필터링)
+        event_hub.notify()
         
         return jsonify({
             'success': True,
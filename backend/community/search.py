@@ -0,0 +1,195 @@
+import re
+
+# 한국어는 2글자 단어가 많아 3-gram(trigram)으로는 짧은 검색어를 찾을 수 없으므로
+# 단어를 2-gram 으로 풀어 쓴 문자열을 FTS5(unicode61)에 색인한다.
+# 예) '강남역 폭행' -> '강남 남역 폭행', 검색어 '강남역' -> 구문 "강남 남역"
+NGRAM_SIZE = 2
+
+_WORD = re.compile(r'[^\W_]+')
+
+# n-gram 문자열은 쓰는 쪽(insert_post/insert_comment)이 파이썬에서 만들어 원문과 같은
+# INSERT 문으로 posts/comments 의 *_terms 컬럼에 넣고, 그 컬럼을 외부 콘텐츠(external content)
+# FTS5 테이블로 색인한다. 색인 동기화 트리거는 컬럼 값만 옮기므로 SQL 함수가 필요 없어
+# sqlite3 CLI, 백업/마이그레이션 스크립트 등 다른 연결도 게시물/댓글을 쓸 수 있고,
+# *_terms 를 채워 쓰는 행은 어느 연결에서 쓰든 바로 검색된다.
+# (*_terms 없이 쓴 행은 다음 시작 때 init_search 가 채움)
+POST_TERM_COLUMNS = ('title_terms', 'content_terms', 'location_terms')
+COMMENT_TERM_COLUMNS = ('content_terms',)
+
+SEARCH_TABLES = {
+    'posts_fts': '''
+        CREATE VIRTUAL TABLE posts_fts
+        USING fts5(title_terms, content_terms, location_terms, content='posts', content_rowid='id', tokenize='unicode61')
+    ''',
+    'comments_fts': '''
+        CREATE VIRTUAL TABLE comments_fts
+        USING fts5(content_terms, content='comments', content_rowid='id', tokenize='unicode61')
+    ''',
+}
+
+_POST_INSERT = '''
+    INSERT INTO posts_fts (rowid, title_terms, content_terms, location_terms)
+    VALUES ({row}.id, {row}.title_terms, {row}.content_terms, {row}.location_terms);
+'''
+_POST_DELETE = '''
+    INSERT INTO posts_fts (posts_fts, rowid, title_terms, content_terms, location_terms)
+    VALUES ('delete', {row}.id, {row}.title_terms, {row}.content_terms, {row}.location_terms);
+'''
+_COMMENT_INSERT = '''
+    INSERT INTO comments_fts (rowid, content_terms) VALUES ({row}.id, {row}.content_terms);
+'''
+_COMMENT_DELETE = '''
+    INSERT INTO comments_fts (comments_fts, rowid, content_terms) VALUES ('delete', {row}.id, {row}.content_terms);
+'''
+
+SEARCH_TRIGGERS = {
+    'posts_fts_insert': f'''
+        CREATE TRIGGER posts_fts_insert AFTER INSERT ON posts
+        BEGIN
+            {_POST_INSERT.format(row='NEW')}
+        END
+    ''',
+    'posts_fts_update': f'''
+        CREATE TRIGGER posts_fts_update AFTER UPDATE OF title_terms, content_terms, location_terms ON posts
+        BEGIN
+            {_POST_DELETE.format(row='OLD')}
+            {_POST_INSERT.format(row='NEW')}
+        END
+    ''',
+    'posts_fts_delete': f'''
+        CREATE TRIGGER posts_fts_delete AFTER DELETE ON posts
+        BEGIN
+            {_POST_DELETE.format(row='OLD')}
+        END
+    ''',
+    'comments_fts_insert': f'''
+        CREATE TRIGGER comments_fts_insert AFTER INSERT ON comments
+        BEGIN
+            {_COMMENT_INSERT.format(row='NEW')}
+        END
+    ''',
+    'comments_fts_update': f'''
+        CREATE TRIGGER comments_fts_update AFTER UPDATE OF content_terms ON comments
+        BEGIN
+            {_COMMENT_DELETE.format(row='OLD')}
+            {_COMMENT_INSERT.format(row='NEW')}
+        END
+    ''',
+    'comments_fts_delete': f'''
+        CREATE TRIGGER comments_fts_delete AFTER DELETE ON comments
+        BEGIN
+            {_COMMENT_DELETE.format(row='OLD')}
+        END
+    ''',
+}
+
+# bm25 열 가중치 (제목, 내용, 위치), 댓글 일치는 게시물 일치보다 낮게
+POST_WEIGHTS = (10.0, 1.0, 5.0)
+COMMENT_WEIGHT = 0.5
+
+
+def ngram_text(text):
+    """텍스트를 단어별 2-gram 토큰 문자열로 변환 (2글자 이하 단어는 그대로)"""
+    if text is None:
+        return None
+    tokens = []
+    for word in _WORD.findall(str(text).lower()):
+        if len(word) <= NGRAM_SIZE:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + NGRAM_SIZE] for i in range(len(word) - NGRAM_SIZE + 1))
+    return ' '.join(tokens)
+
+
+def match_query(q):
+    """검색어 -> FTS5 MATCH 식 (단어마다 2-gram 구문, 모든 단어 AND)
+
+    NGRAM_SIZE 보다 짧은 단어는 찾을 수 없으므로 제외하며, 남는 단어가 없으면 None.
+    """
+    phrases = []
+    for word in _WORD.findall(q.lower()):
+        if len(word) < NGRAM_SIZE:
+            continue
+        phrases.append('"{}"'.format(ngram_text(word).replace('"', '""')))
+    return ' AND '.join(phrases) or None
+
+
+def post_terms(title, content, location):
+    """게시물 (제목, 내용, 위치) -> *_terms 컬럼 값"""
+    return ngram_text(title), ngram_text(content), ngram_text(location)
+
+
+def fill_missing_terms(cursor):
+    """*_terms 없이 쓰인 게시물/댓글의 n-gram 을 채움 (트리거가 색인) - 채운 (게시물 수, 댓글 수) 반환"""
+    cursor.execute('SELECT id, title, content, location FROM posts WHERE title_terms IS NULL')
+    posts = [post_terms(row[1], row[2], row[3]) + (row[0],) for row in cursor.fetchall()]
+    cursor.executemany(
+        'UPDATE posts SET title_terms = ?, content_terms = ?, location_terms = ? WHERE id = ?', posts
+    )
+    cursor.execute('SELECT id, content FROM comments WHERE content_terms IS NULL')
+    comments = [(ngram_text(row[1]), row[0]) for row in cursor.fetchall()]
+    cursor.executemany('UPDATE comments SET content_terms = ? WHERE id = ?', comments)
+    return len(posts), len(comments)
+
+
+def init_search(cursor):
+    """n-gram 컬럼, 검색 색인 테이블/트리거 생성 후 n-gram 이 없는 게시물/댓글 색인
+
+    이전 형식(ngrams() 함수 트리거, 자체 저장 색인)은 새 형식으로 다시 만든다.
+    """
+    for table, columns in (('posts', POST_TERM_COLUMNS), ('comments', COMMENT_TERM_COLUMNS)):
+        cursor.execute(f'PRAGMA table_info({table})')
+        existing_columns = {column[1] for column in cursor.fetchall()}
+        for column in columns:
+            if column not in existing_columns:
+                cursor.execute(f'ALTER TABLE {table} ADD COLUMN {column} TEXT')
+
+    cursor.execute("SELECT name, sql FROM sqlite_master WHERE type IN ('table', 'trigger')")
+    existing = {row[0]: row[1] or '' for row in cursor.fetchall()}
+    for name, statement in SEARCH_TRIGGERS.items():
+        if existing.get(name) is not None and existing[name] != statement.strip():
+            cursor.execute(f'DROP TRIGGER {name}')
+            existing.pop(name)
+    created = []
+    for name, statement in SEARCH_TABLES.items():
+        if name in existing and existing[name] != statement.strip():
+            cursor.execute(f'DROP TABLE {name}')
+            existing.pop(name)
+        if name not in existing:
+            cursor.execute(statement)
+            created.append(name)
+    for name, statement in SEARCH_TRIGGERS.items():
+        if name not in existing:
+            cursor.execute(statement)
+    # 새로 만든 색인은 이미 채워진 *_terms 로 다시 만들고, 빈 행은 채우면서 트리거가 색인
+    for name in created:
+        cursor.execute(f"INSERT INTO {name} ({name}) VALUES ('rebuild')")
+    fill_missing_terms(cursor)
+
+
+def search_posts(cursor, expression, columns='p.*', category=None, limit=20, offset=0):
+    """MATCH 식으로 게시물 검색 (게시물 또는 댓글 일치, bm25 순)
+
+    columns 는 posts 를 p 로 가리키는 SELECT 컬럼 목록이며, 점수는 score 컬럼으로 붙는다.
+
+    게시물별 점수는 게시물 일치와 댓글 일치 중 가장 좋은 값 (bm25 는 작을수록 관련도 높음).
+    """
+    category_filter = 'WHERE p.category = ?' if category else ''
+    params = [expression, expression] + ([category] if category else []) + [limit, offset]
+    cursor.execute(f'''
+        WITH hits AS (
+            SELECT rowid AS post_id, bm25(posts_fts, {', '.join(map(str, POST_WEIGHTS))}) AS score
+            FROM posts_fts WHERE posts_fts MATCH ?
+            UNION ALL
+            SELECT c.post_id, bm25(comments_fts) * {COMMENT_WEIGHT} AS score
+            FROM comments_fts JOIN comments c ON c.id = comments_fts.rowid
+            WHERE comments_fts MATCH ?
+        )
+        SELECT {columns}, MIN(h.score) AS score
+        FROM hits h JOIN posts p ON p.id = h.post_id
+        {category_filter}
+        GROUP BY p.id
+        ORDER BY score, p.id DESC
+        LIMIT ? OFFSET ?
+    ''', params)
+    return cursor.fetchall()
@@ -0,0 +1,129 @@
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from common.geo import degree_span, haversine_km
+
+# 좌표가 있는 게시물을 (위도, 경도, 작성 시각) 3차원 점으로 R*Tree 에 관리
+# - 시각 축은 1970-01-01 부터의 일 수 (반경 + 기간 조건을 색인에서 함께 거름)
+# - R*Tree 좌표는 32비트 실수라 정확한 위치/작성 시각은 보조 컬럼(+)에 함께 저장하여
+#   거리 판정과 최신순 정렬을 posts 를 읽지 않고 처리한다
+_DAYS = "(julianday({}) - 2440587.5)"
+
+_POINT_VALUES = f'''
+    {{row}}.id,
+    {{row}}.latitude, {{row}}.latitude,
+    {{row}}.longitude, {{row}}.longitude,
+    {_DAYS.format('{row}.created_at')}, {_DAYS.format('{row}.created_at')},
+    {{row}}.latitude, {{row}}.longitude, {{row}}.created_at
+'''
+
+POST_RTREE_TABLE = '''
+    CREATE VIRTUAL TABLE posts_rtree
+    USING rtree(id, min_lat, max_lat, min_lng, max_lng, min_t, max_t, +latitude, +longitude, +created_at)
+'''
+
+POST_RTREE_TRIGGERS = [
+    f'''
+    CREATE TRIGGER IF NOT EXISTS posts_rtree_insert AFTER INSERT ON posts
+    WHEN NEW.latitude IS NOT NULL AND NEW.longitude IS NOT NULL AND NEW.created_at IS NOT NULL
+    BEGIN
+        INSERT OR REPLACE INTO posts_rtree VALUES ({_POINT_VALUES.format(row='NEW')});
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS posts_rtree_update AFTER UPDATE OF latitude, longitude, created_at ON posts
+    BEGIN
+        DELETE FROM posts_rtree WHERE id = OLD.id;
+        INSERT INTO posts_rtree
+        SELECT {_POINT_VALUES.format(row='NEW')}
+        WHERE NEW.latitude IS NOT NULL AND NEW.longitude IS NOT NULL AND NEW.created_at IS NOT NULL;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS posts_rtree_delete AFTER DELETE ON posts
+    BEGIN
+        DELETE FROM posts_rtree WHERE id = OLD.id;
+    END
+    ''',
+]
+
+# 최신순 조회 시 차례로 넓혀 보는 기간 (일, None 은 기간 제한 없음)
+# 최근 기간에서 결과가 다 차면 오래된 게시물은 읽지 않는다
+NEARBY_WINDOWS_DAYS = (1, 7, 30, 365, None)
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def init_post_rtree(cursor):
+    """게시물 R*Tree 테이블/트리거 생성 (처음 만들 때는 좌표가 있는 게시물로 채움)"""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'posts_rtree'")
+    if cursor.fetchone() is None:
+        cursor.execute(POST_RTREE_TABLE)
+        cursor.execute(f'''
+            INSERT INTO posts_rtree
+            SELECT {_POINT_VALUES.format(row='p')}
+            FROM posts p
+            WHERE p.latitude IS NOT NULL AND p.longitude IS NOT NULL AND p.created_at IS NOT NULL
+        ''')
+    for statement in POST_RTREE_TRIGGERS:
+        cursor.execute(statement)
+
+
+def _query_box(cursor, box, since, before):
+    """사각형 + [since, before) 기간 안의 (id, 위도, 경도, 작성 시각) 후보"""
+    conditions = ['max_lat >= ? AND min_lat <= ? AND max_lng >= ? AND min_lng <= ?']
+    params = list(box)
+    if since is not None:
+        # R*Tree 좌표는 바깥쪽으로 반올림되므로 색인 조건은 느슨하게, 보조 컬럼으로 정확히
+        conditions.append(f"max_t >= {_DAYS.format('?')} AND created_at >= ?")
+        params.extend([since, since])
+    if before is not None:
+        conditions.append(f"min_t <= {_DAYS.format('?')} AND (created_at < ? OR (created_at = ? AND id < ?))")
+        params.extend([before[0], before[0], before[0], before[1]])
+    cursor.execute(f'''
+        SELECT id, latitude, longitude, created_at FROM posts_rtree
+        WHERE {' AND '.join(conditions)}
+    ''', params)
+    return cursor.fetchall()
+
+
+def find_posts_near(cursor, lat, lng, radius_km, since=None, before=None, limit=20):
+    """(lat, lng) 반경 radius_km 안의 게시물을 최신순으로 limit 개 조회
+
+    R*Tree 에서 사각형과 기간 안의 후보만 읽어 하버사인 거리로 거른 뒤 (created_at, id)
+    내림차순으로 자른다. 최근 기간(NEARBY_WINDOWS_DAYS)부터 넓혀 가며 limit 개가 차면
+    멈추므로, 비용은 전체 게시물 수가 아니라 주변의 최근 게시물 수에 비례한다.
+    since 는 created_at 하한, before 는 (created_at, id) 커서.
+    반환값은 (게시물 id, 거리 km) 목록 (limit 보다 많으면 limit + 1 개).
+    """
+    dlat, dlng = degree_span(lat, radius_km)
+    box = (lat - dlat, lat + dlat, lng - dlng, lng + dlng)
+    # 기간은 커서(없으면 현재 시각)부터 거슬러 올라감 (기준 시각은 읽는 양에만 영향)
+    latest = datetime.now(timezone.utc).replace(tzinfo=None)
+    if before is not None:
+        try:
+            latest = datetime.strptime(before[0], TIMESTAMP_FORMAT)
+        except ValueError:
+            pass
+
+    for days in NEARBY_WINDOWS_DAYS:
+        window_since = since
+        if days is not None:
+            window_start = (latest - timedelta(days=days)).strftime(TIMESTAMP_FORMAT)
+            if since is None or window_start > since:
+                window_since = window_start
+        candidates = _query_box(cursor, box, window_since, before)
+
+        inside = []
+        if candidates:
+            lats = np.array([row[1] for row in candidates], dtype=np.float64)
+            lngs = np.array([row[2] for row in candidates], dtype=np.float64)
+            distances = haversine_km(lat, lng, lats, lngs)
+            inside = np.flatnonzero(distances <= radius_km).tolist()
+
+        # 기간 안에서 limit + 1 개가 찼거나 더 넓힐 기간이 없으면 확정
+        if len(inside) > limit or window_since == since:
+            inside.sort(key=lambda i: (candidates[i][3], candidates[i][0]), reverse=True)
+            return [(candidates[i][0], float(distances[i])) for i in inside[:limit + 1]]
+    return []
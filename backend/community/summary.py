@@ -0,0 +1,117 @@
+# 카테고리별 게시물 수 (목록의 전체 개수를 COUNT(*) 없이 조회)
+# 게시물은 여러 경로에서 쓰이므로 트리거로 유지
+POST_COUNTS_TABLE = '''
+    CREATE TABLE post_counts (
+        category TEXT PRIMARY KEY,
+        post_count INTEGER NOT NULL DEFAULT 0
+    ) WITHOUT ROWID
+'''
+
+_POST_COUNT_ADD = '''
+    INSERT INTO post_counts (category, post_count) VALUES (COALESCE({row}.category, ''), 1)
+    ON CONFLICT (category) DO UPDATE SET post_count = post_count + 1;
+'''
+_POST_COUNT_REMOVE = '''
+    UPDATE post_counts SET post_count = post_count - 1 WHERE category = COALESCE({row}.category, '');
+'''
+
+POST_COUNT_TRIGGERS = [
+    f'''
+    CREATE TRIGGER IF NOT EXISTS posts_count_insert AFTER INSERT ON posts
+    BEGIN
+        {_POST_COUNT_ADD.format(row='NEW')}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS posts_count_update AFTER UPDATE OF category ON posts
+    WHEN OLD.category IS NOT NEW.category
+    BEGIN
+        {_POST_COUNT_REMOVE.format(row='OLD')}
+        {_POST_COUNT_ADD.format(row='NEW')}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS posts_count_delete AFTER DELETE ON posts
+    BEGIN
+        {_POST_COUNT_REMOVE.format(row='OLD')}
+    END
+    ''',
+]
+
+
+def init_post_counts(cursor):
+    """카테고리별 게시물 수 테이블/트리거 생성 (처음 만들 때는 posts 로 채움)"""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'post_counts'")
+    if cursor.fetchone() is None:
+        cursor.execute(POST_COUNTS_TABLE)
+        cursor.execute('''
+            INSERT INTO post_counts (category, post_count)
+            SELECT COALESCE(category, ''), COUNT(*) FROM posts GROUP BY 1
+        ''')
+    for statement in POST_COUNT_TRIGGERS:
+        cursor.execute(statement)
+
+
+def post_count(cursor, category=None):
+    """카테고리(없으면 전체)의 게시물 수"""
+    if category is None:
+        cursor.execute('SELECT COALESCE(SUM(post_count), 0) FROM post_counts')
+    else:
+        cursor.execute('SELECT COALESCE(SUM(post_count), 0) FROM post_counts WHERE category = ?', (category,))
+    return cursor.fetchone()[0]
+
+
+# 게시물별 댓글 수 / 최근 댓글 시각 (posts 컬럼, 댓글 트리거로 유지)
+# 목록에서 댓글을 집계하지 않고 게시물 행만 읽도록 함
+_COMMENT_COUNTER_REFRESH = '''
+    UPDATE posts SET
+        comment_count = (SELECT COUNT(*) FROM comments WHERE post_id = posts.id),
+        last_comment_at = (SELECT MAX(created_at) FROM comments WHERE post_id = posts.id)
+'''
+
+COMMENT_COUNTER_TRIGGERS = [
+    '''
+    CREATE TRIGGER IF NOT EXISTS comments_counter_insert AFTER INSERT ON comments
+    BEGIN
+        UPDATE posts SET
+            comment_count = comment_count + 1,
+            last_comment_at = CASE
+                WHEN last_comment_at IS NULL OR last_comment_at < NEW.created_at THEN NEW.created_at
+                ELSE last_comment_at
+            END
+        WHERE id = NEW.post_id;
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS comments_counter_update AFTER UPDATE OF post_id, created_at ON comments
+    BEGIN
+        {_COMMENT_COUNTER_REFRESH} WHERE id IN (OLD.post_id, NEW.post_id);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS comments_counter_delete AFTER DELETE ON comments
+    BEGIN
+        UPDATE posts SET
+            comment_count = comment_count - 1,
+            last_comment_at = (SELECT MAX(created_at) FROM comments WHERE post_id = OLD.post_id)
+        WHERE id = OLD.post_id;
+    END
+    ''',
+]
+
+
+def init_comment_counters(cursor):
+    """posts.comment_count / last_comment_at 컬럼과 트리거 생성 (컬럼이 없던 DB 는 댓글로 채움)
+
+    comments(post_id, created_at) 인덱스가 먼저 있어야 채우기가 빠르다.
+    """
+    cursor.execute('PRAGMA table_info(posts)')
+    columns = {column[1] for column in cursor.fetchall()}
+    if 'comment_count' not in columns:
+        cursor.execute('ALTER TABLE posts ADD COLUMN comment_count INTEGER NOT NULL DEFAULT 0')
+    if 'last_comment_at' not in columns:
+        cursor.execute('ALTER TABLE posts ADD COLUMN last_comment_at TIMESTAMP')
+    if not {'comment_count', 'last_comment_at'} <= columns:
+        cursor.execute(_COMMENT_COUNTER_REFRESH)
+    for statement in COMMENT_COUNTER_TRIGGERS:
+        cursor.execute(statement)
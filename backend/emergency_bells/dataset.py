@@ -0,0 +1,176 @@
+import sys
+
+import numpy as np
+
+# 좌표 컬럼
+LAT_COLUMN = 'WGS84위도'
+LNG_COLUMN = 'WGS84경도'
+
+# 범주형으로 저장할 컬럼 (코드 + 범주 목록)
+CATEGORICAL_COLUMNS = ('설치목적', '설치장소유형', '관리기관명')
+
+# 값이 없는 경우의 코드 (0보다 작은 코드는 모두 값 없음으로 집계)
+MISSING = -1
+
+# 범주 컬럼에서 레코드에 키 자체가 없는 경우의 코드 (MISSING은 값이 None인 경우)
+ABSENT = -2
+
+# 레코드에 키 자체가 없는 경우를 구분하기 위한 표시
+_ABSENT = object()
+
+
+def parse_coordinate(value):
+    """좌표 문자열을 float로 변환, 유효하지 않으면 NaN"""
+    try:
+        number = float(value)
+    except (ValueError, TypeError):
+        return np.nan
+    return number if number != 0 else np.nan
+
+
+class BellDataset:
+    """컬럼 단위로 저장된 안전벨 데이터
+
+    - 좌표: float64 배열 (유효하지 않은 좌표는 NaN)
+    - 설치목적/설치장소유형/관리기관명: 범주 코드 배열 + 범주 목록
+    - 나머지 컬럼: 전체 컬럼이 공유하는 문자열 테이블에 대한 int32 코드 행렬
+
+    응답에 필요한 행만 row()/rows()로 dict를 만든다.
+    """
+
+    def __init__(self, columns, lat, lng, categories, codes, string_table, string_columns, string_codes):
+        self.columns = list(columns)
+        self.lat = lat
+        self.lng = lng
+        self.categories = categories          # 컬럼명 -> 범주 값 목록
+        self.codes = codes                    # 컬럼명 -> 코드 배열
+        self.string_table = string_table      # 문자열 값 목록
+        self.string_columns = list(string_columns)
+        self.string_codes = string_codes      # (행 수, 문자열 컬럼 수) 코드 행렬
+        self.valid = np.isfinite(lat) & np.isfinite(lng)
+        self._category_index = {
+            name: {value: code for code, value in enumerate(values)}
+            for name, values in categories.items()
+        }
+
+    @classmethod
+    def from_records(cls, records):
+        """dict 레코드 목록에서 컬럼형 데이터셋 생성"""
+        columns = []
+        seen = set()
+        for record in records:
+            for key in record:
+                if key not in seen:
+                    seen.add(key)
+                    columns.append(key)
+
+        n = len(records)
+        lat = np.fromiter((parse_coordinate(r.get(LAT_COLUMN)) for r in records), dtype=np.float64, count=n)
+        lng = np.fromiter((parse_coordinate(r.get(LNG_COLUMN)) for r in records), dtype=np.float64, count=n)
+
+        categories = {}
+        codes = {}
+        for name in CATEGORICAL_COLUMNS:
+            values, column_codes = _encode(record.get(name, _ABSENT) for record in records)
+            categories[name] = values
+            codes[name] = np.asarray(column_codes, dtype=np.int32)
+
+        string_columns = [c for c in columns if c not in CATEGORICAL_COLUMNS]
+        table = {}
+        string_codes = np.full((n, len(string_columns)), MISSING, dtype=np.int32)
+        for j, name in enumerate(string_columns):
+            column = string_codes[:, j]
+            for i, record in enumerate(records):
+                value = record.get(name, _ABSENT)
+                if value is _ABSENT:
+                    continue
+                code = table.get(value)
+                if code is None:
+                    code = table[value] = len(table)
+                column[i] = code
+
+        return cls(columns, lat, lng, categories, codes, list(table), string_columns, string_codes)
+
+    def __len__(self):
+        return len(self.lat)
+
+    def row(self, i):
+        """i번째 행을 원래 형태의 dict로 변환"""
+        return self.rows([i])[0]
+
+    def rows(self, indices, fields=None):
+        """지정한 행들만 dict로 변환 (fields 가 주어지면 해당 컬럼만)"""
+        indices = np.asarray(indices, dtype=np.int64)
+        table = self.string_table
+        columns = []  # (컬럼명, 값 목록, 코드 목록)
+        string_codes = self.string_codes[indices]
+        for j, name in enumerate(self.string_columns):
+            if fields is None or name in fields:
+                columns.append((name, table, string_codes[:, j].tolist()))
+        for name in CATEGORICAL_COLUMNS:
+            if fields is None or name in fields:
+                # 값이 None인 행은 키를 None으로 살리고, 키가 없던 행만 건너뜀
+                values = self.categories[name] + [None]
+                column_codes = self.codes[name][indices]
+                column_codes = np.where(column_codes == MISSING, len(values) - 1, column_codes)
+                columns.append((name, values, column_codes.tolist()))
+        order = {name: position for position, name in enumerate(self.columns)}
+        columns.sort(key=lambda column: order.get(column[0], len(order)))
+
+        result = [{} for _ in range(len(indices))]
+        for name, values, column_codes in columns:
+            for record, code in zip(result, column_codes):
+                if code >= 0:
+                    record[name] = values[code]
+        return result
+
+    def category_code(self, name, value):
+        """범주 값의 코드, 없으면 None"""
+        return self._category_index[name].get(value)
+
+    def mask(self, name, value):
+        """범주 컬럼이 value인 행의 불리언 마스크"""
+        code = self.category_code(name, value)
+        if code is None:
+            return np.zeros(len(self), dtype=bool)
+        return self.codes[name] == code
+
+    def value_counts(self, name, default='기타'):
+        """범주 컬럼 값별 개수 (값이 없는 행은 default로 집계)"""
+        column_codes = self.codes[name]
+        counts = np.bincount(column_codes[column_codes >= 0], minlength=len(self.categories[name]))
+        stats = {value: int(count) for value, count in zip(self.categories[name], counts) if count}
+        missing = int(np.count_nonzero(column_codes < 0))
+        if missing:
+            stats[default] = stats.get(default, 0) + missing
+        return stats
+
+    def nbytes(self):
+        """대략적인 메모리 사용량 (bytes)"""
+        arrays = [self.lat, self.lng, self.valid, self.string_codes, *self.codes.values()]
+        total = sum(array.nbytes for array in arrays)
+        if isinstance(self.string_table, list):
+            total += sys.getsizeof(self.string_table) + sum(sys.getsizeof(s) for s in self.string_table)
+        else:
+            total += self.string_table.nbytes
+        for values in self.categories.values():
+            total += sys.getsizeof(values) + sum(sys.getsizeof(s) for s in values)
+        return total
+
+
+def _encode(values):
+    """값 목록을 (범주 목록, 코드 목록)으로 인코딩 (None은 MISSING, 키 없음은 ABSENT)"""
+    index = {}
+    codes = []
+    for value in values:
+        if value is _ABSENT:
+            codes.append(ABSENT)
+            continue
+        if value is None:
+            codes.append(MISSING)
+            continue
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(index)
+        codes.append(code)
+    return list(index), codes
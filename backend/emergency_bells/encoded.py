@@ -0,0 +1,84 @@
+import gzip
+import hashlib
+import threading
+
+from flask import Response, current_app, request
+
+try:
+    import brotli
+except ImportError:  # brotli는 선택 의존성
+    brotli = None
+
+# gzip 압축 레벨 (한 번만 압축하므로 높게 설정)
+GZIP_LEVEL = 9
+
+
+class EncodedBody:
+    """한 번 직렬화/압축해 둔 응답 본문"""
+
+    def __init__(self, body, tag):
+        self.tag = tag
+        self.bodies = {'identity': body, 'gzip': gzip.compress(body, GZIP_LEVEL, mtime=0)}
+        if brotli is not None:
+            self.bodies['br'] = brotli.compress(body)
+
+    def etag(self, encoding):
+        # 강한 ETag는 인코딩마다 달라야 하므로 접미사로 구분
+        return self.tag if encoding == 'identity' else f'{self.tag}-{encoding}'
+
+    def etags(self):
+        return [self.etag(encoding) for encoding in self.bodies]
+
+
+def encode_payload(payload, version):
+    """payload 를 JSON 직렬화/압축하여 EncodedBody 생성"""
+    body = current_app.json.dumps(payload).encode('utf-8')
+    digest = hashlib.sha1(body).hexdigest()[:16]
+    return EncodedBody(body, f'{version}-{digest}')
+
+
+class EncodedResponses:
+    """데이터셋 버전별 직렬화 응답 캐시 (버전이 바뀌면 스냅샷과 함께 교체됨)"""
+
+    def __init__(self, version):
+        self.version = version or 'empty'
+        self._bodies = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, build):
+        """key 에 해당하는 응답 본문, 없으면 build()로 payload를 만들어 직렬화"""
+        encoded = self._bodies.get(key)
+        if encoded is None:
+            with self._lock:
+                encoded = self._bodies.get(key)
+                if encoded is None:
+                    encoded = encode_payload(build(), self.version)
+                    self._bodies[key] = encoded
+        return encoded
+
+
+def choose_encoding(encoded):
+    """Accept-Encoding 에 맞는 인코딩 선택 (br > gzip > identity)"""
+    accepted = request.accept_encodings
+    for encoding in ('br', 'gzip'):
+        if encoding in encoded.bodies and accepted[encoding]:
+            return encoding
+    return 'identity'
+
+
+def send_encoded(encoded):
+    """미리 인코딩된 본문을 ETag / If-None-Match 처리와 함께 전송"""
+    encoding = choose_encoding(encoded)
+    etag = encoded.etag(encoding)
+
+    if any(request.if_none_match.contains(tag) for tag in encoded.etags()):
+        response = Response(status=304)
+    else:
+        response = Response(encoded.bodies[encoding], mimetype='application/json')
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+
+    response.set_etag(etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
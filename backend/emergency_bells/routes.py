@@ -1,34 +1,50 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 import json
 import os
 from datetime import datetime
 
+import numpy as np
+
+from .encoded import encode_payload, send_encoded
+from .store import bell_store
+from .tiles import MAX_CLUSTER_ZOOM, MAX_ZOOM, TileCache
+
 emergency_bells_bp = Blueprint('emergency_bells', __name__)
 
-# 데이터 파일 경로
-DATA_FILE = os.path.join(os.path.dirname(__file__), '../../emergency_bells.json')
+# /nearest 로 한 번에 조회할 수 있는 최대 개수
+MAX_NEAREST_K = 100
 
-def load_emergency_bells():
-    """안전벨 데이터 로드"""
-    try:
-        with open(DATA_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        return []
-    except Exception as e:
-        print(f"데이터 로드 에러: {e}")
-        return []
+# /bbox 기본/최대 반환 개수
+DEFAULT_BBOX_LIMIT = 500
+MAX_BBOX_LIMIT = 2000
+
+# 지도 확대 레벨(카카오맵 level, 클수록 넓은 영역)별 기본 반환 개수
+BBOX_LEVEL_LIMITS = {1: 2000, 2: 2000, 3: 1000, 4: 1000, 5: 500, 6: 300, 7: 200}
+BBOX_WIDE_LEVEL_LIMIT = 100
+
+# /export 스트리밍 시 한 번에 dict로 만드는 행 수
+EXPORT_CHUNK_SIZE = 1000
+
+# 인코딩된 타일 LRU 캐시 (키에 데이터 버전 포함)
+TILE_CACHE_SIZE = int(os.environ.get('EMERGENCY_BELLS_TILE_CACHE_SIZE', 4096))
+tile_cache = TileCache(TILE_CACHE_SIZE)
+
+# /bbox 마커용 기본 필드 (detail=true 이면 전체 필드)
+MARKER_FIELDS = ('번호', '설치목적', '설치장소유형', 'WGS84위도', 'WGS84경도')
 
 @emergency_bells_bp.route('/', methods=['GET'])
 def get_all_emergency_bells():
     """모든 안전벨 조회"""
     try:
-        bells = load_emergency_bells()
-        return jsonify({
+        snapshot = bell_store.get()
+        dataset = snapshot.dataset
+        # 데이터 버전마다 한 번 직렬화/압축한 본문을 ETag와 함께 전송
+        encoded = snapshot.responses.get('all', lambda: {
             'success': True,
-            'count': len(bells),
-            'data': bells
+            'count': len(dataset),
+            'data': dataset.rows(range(len(dataset)))
         })
+        return send_encoded(encoded)
     except Exception as e:
         return jsonify({
             'success': False,
@@ -49,29 +65,20 @@ def get_nearby_emergency_bells():
                 'error': '위도(lat)와 경도(lng)가 필요합니다.'
             }), 400
         
-        bells = load_emergency_bells()
-        nearby_bells = []
-        
-        for bell in bells:
-            try:
-                bell_lat = float(bell.get('WGS84위도', 0))
-                bell_lng = float(bell.get('WGS84경도', 0))
-                
-                if bell_lat == 0 or bell_lng == 0:
-                    continue
-                
-                # 거리 계산 (간단한 유클리드 거리)
-                distance = ((lat - bell_lat) ** 2 + (lng - bell_lng) ** 2) ** 0.5
-                
-                if distance <= radius / 111:  # 대략적인 km 변환
-                    bell['distance'] = round(distance * 111, 2)
-                    nearby_bells.append(bell)
-                    
-            except (ValueError, TypeError):
-                continue
-        
-        # 거리순 정렬
-        nearby_bells.sort(key=lambda x: x.get('distance', float('inf')))
+        # 반경 상한은 없음 (후보 셀은 데이터 범위로 잘림), nan/음수만 거름
+        if not radius > 0:
+            return jsonify({
+                'success': False,
+                'error': '반경(radius)은 0보다 커야 합니다.'
+            }), 400
+        
+        snapshot = bell_store.get()
+        
+        # 격자 인덱스로 후보 셀만 조회하고 하버사인 거리로 판정 (거리순 정렬됨)
+        distances, indices = snapshot.index.within_radius(lat, lng, radius)
+        nearby_bells = snapshot.dataset.rows(indices)
+        for bell, distance in zip(nearby_bells, distances.round(2).tolist()):
+            bell['distance'] = distance
         
         return jsonify({
             'success': True,
@@ -87,23 +94,111 @@ def get_nearby_emergency_bells():
             'error': str(e)
         }), 500
 
-@emergency_bells_bp.route('/filter', methods=['GET'])
-def get_filtered_emergency_bells():
-    """설치목적별 안전벨 필터링"""
+@emergency_bells_bp.route('/nearest', methods=['GET'])
+def get_nearest_emergency_bells():
+    """특정 위치에서 가장 가까운 안전벨 k개 조회"""
     try:
+        lat = request.args.get('lat', type=float)
+        lng = request.args.get('lng', type=float)
+        k = request.args.get('k', 1, type=int)
         purpose = request.args.get('purpose', 'all')
-        bells = load_emergency_bells()
+        max_radius = request.args.get('max_radius', type=float)  # km, 선택
+        
+        if not lat or not lng:
+            return jsonify({
+                'success': False,
+                'error': '위도(lat)와 경도(lng)가 필요합니다.'
+            }), 400
+        
+        if k < 1 or k > MAX_NEAREST_K:
+            return jsonify({
+                'success': False,
+                'error': f'k는 1 이상 {MAX_NEAREST_K} 이하여야 합니다.'
+            }), 400
         
+        snapshot = bell_store.get()
+        
+        # 설치목적 필터는 탐색 중에 적용 (k개를 채울 때까지 계속 탐색)
+        mask = None
         if purpose != 'all':
-            filtered_bells = [bell for bell in bells if bell.get('설치목적') == purpose]
+            mask = snapshot.dataset.mask('설치목적', purpose)
+        
+        distances, indices = snapshot.index.nearest(lat, lng, k, mask, max_radius)
+        nearest_bells = snapshot.dataset.rows(indices)
+        for bell, distance in zip(nearest_bells, distances.round(3).tolist()):
+            bell['distance'] = distance
+        
+        return jsonify({
+            'success': True,
+            'count': len(nearest_bells),
+            'k': k,
+            'filter': purpose,
+            'center': {'lat': lat, 'lng': lng},
+            'data': nearest_bells
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@emergency_bells_bp.route('/bbox', methods=['GET'])
+def get_bbox_emergency_bells():
+    """지도 화면(사각 영역) 안의 안전벨 조회"""
+    try:
+        min_lat = request.args.get('min_lat', type=float)
+        min_lng = request.args.get('min_lng', type=float)
+        max_lat = request.args.get('max_lat', type=float)
+        max_lng = request.args.get('max_lng', type=float)
+        level = request.args.get('level', type=int)
+        purpose = request.args.get('purpose', 'all')
+        detail = request.args.get('detail', 'false').lower() in ('1', 'true', 'yes')
+        
+        if None in (min_lat, min_lng, max_lat, max_lng):
+            return jsonify({
+                'success': False,
+                'error': 'min_lat, min_lng, max_lat, max_lng가 필요합니다.'
+            }), 400
+        
+        if not (-90 <= min_lat <= max_lat <= 90 and -180 <= min_lng <= max_lng <= 180):
+            return jsonify({
+                'success': False,
+                'error': '영역이 올바르지 않습니다. (위도 -90~90, 경도 -180~180, 최소값 <= 최대값)'
+            }), 400
+        
+        if level is not None:
+            default_limit = BBOX_LEVEL_LIMITS.get(level, BBOX_WIDE_LEVEL_LIMIT)
         else:
-            filtered_bells = bells
+            default_limit = DEFAULT_BBOX_LIMIT
+        limit = request.args.get('limit', default_limit, type=int)
+        limit = max(1, min(limit, MAX_BBOX_LIMIT))
+        
+        snapshot = bell_store.get()
+        dataset = snapshot.dataset
+        
+        mask = None
+        if purpose != 'all':
+            mask = dataset.mask('설치목적', purpose)
+        
+        # 인덱스가 데이터 범위로 잘라서 조회하므로 넓은 영역도 데이터 크기 이상 순회하지 않음
+        indices = snapshot.index.within_bbox(min_lat, min_lng, max_lat, max_lng, mask)
+        total_count = len(indices)
+        truncated = total_count > limit
+        if truncated:
+            # 셀 순서로 정렬되어 있으므로 등간격으로 골라 화면 전체에 고르게 분포시킴
+            indices = indices[np.linspace(0, total_count - 1, limit).astype(np.int64)]
+        
+        bells = dataset.rows(indices, None if detail else MARKER_FIELDS)
         
         return jsonify({
             'success': True,
-            'count': len(filtered_bells),
+            'count': len(bells),
+            'total_count': total_count,
+            'truncated': truncated,
+            'limit': limit,
             'filter': purpose,
-            'data': filtered_bells
+            'data': bells
         })
         
     except Exception as e:
@@ -112,36 +207,182 @@ def get_filtered_emergency_bells():
             'error': str(e)
         }), 500
 
+@emergency_bells_bp.route('/tiles/<int:z>/<int:x>/<int:y>', methods=['GET'])
+def get_emergency_bell_tile(z, x, y):
+    """XYZ 타일 단위 안전벨 조회 (낮은 줌은 클러스터, 높은 줌은 개별 안전벨)
+
+    개별 안전벨 타일의 count 는 타일 안 전체 안전벨 수이며, MAX_TILE_BELLS 를 넘어
+    일부만 반환한 경우 truncated 가 true 가 된다.
+    """
+    try:
+        if z > MAX_ZOOM or x >= 2 ** z or y >= 2 ** z:
+            return jsonify({
+                'success': False,
+                'error': '잘못된 타일 좌표입니다.'
+            }), 400
+        
+        snapshot = bell_store.get()
+        
+        def build():
+            if z <= MAX_CLUSTER_ZOOM:
+                tile_type = 'clusters'
+                data = snapshot.pyramid.clusters(z, x, y)
+                count = len(data)
+            else:
+                tile_type = 'bells'
+                data, count = snapshot.pyramid.bells(z, x, y, MARKER_FIELDS)
+            return encode_payload({
+                'success': True,
+                'z': z,
+                'x': x,
+                'y': y,
+                'type': tile_type,
+                'count': count,
+                'truncated': count > len(data),
+                'data': data
+            }, snapshot.version)
+        
+        encoded = tile_cache.get((snapshot.version, z, x, y), build)
+        return send_encoded(encoded)
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@emergency_bells_bp.route('/filter', methods=['GET'])
+def get_filtered_emergency_bells():
+    """설치목적별 안전벨 필터링"""
+    try:
+        purpose = request.args.get('purpose', 'all')
+        snapshot = bell_store.get()
+        dataset = snapshot.dataset
+        
+        if purpose != 'all':
+            indices = np.nonzero(dataset.mask('설치목적', purpose))[0]
+        else:
+            indices = range(len(dataset))
+        
+        def build():
+            filtered_bells = dataset.rows(indices)
+            return {
+                'success': True,
+                'count': len(filtered_bells),
+                'filter': purpose,
+                'data': filtered_bells
+            }
+        
+        # 존재하는 설치목적만 캐시 (임의 값으로 캐시가 커지지 않도록)
+        if purpose == 'all' or dataset.category_code('설치목적', purpose) is not None:
+            return send_encoded(snapshot.responses.get(('filter', purpose), build))
+        return jsonify(build())
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@emergency_bells_bp.route('/export', methods=['GET'])
+def export_emergency_bells():
+    """안전벨 전체 데이터 스트리밍 내보내기 (NDJSON 또는 JSON 배열)"""
+    try:
+        export_format = request.args.get('format', 'ndjson')
+        purpose = request.args.get('purpose', 'all')
+        
+        if export_format not in ('ndjson', 'json'):
+            return jsonify({
+                'success': False,
+                'error': 'format은 ndjson 또는 json 이어야 합니다.'
+            }), 400
+        
+        # 스트리밍 도중 리로드되어도 같은 버전을 끝까지 내보내도록 스냅샷을 고정
+        snapshot = bell_store.get()
+        dataset = snapshot.dataset
+        
+        if purpose != 'all':
+            indices = np.nonzero(dataset.mask('설치목적', purpose))[0]
+        else:
+            indices = np.arange(len(dataset))
+        
+        def generate():
+            # 청크 단위로만 dict를 만들어 데이터 크기와 무관하게 메모리 사용량을 일정하게 유지
+            if export_format == 'json':
+                yield '['
+            for start in range(0, len(indices), EXPORT_CHUNK_SIZE):
+                rows = dataset.rows(indices[start:start + EXPORT_CHUNK_SIZE])
+                lines = [json.dumps(row, ensure_ascii=False) for row in rows]
+                if export_format == 'json':
+                    yield (',' if start else '') + ','.join(lines)
+                else:
+                    yield '\n'.join(lines) + '\n'
+            if export_format == 'json':
+                yield ']'
+        
+        mimetype = 'application/x-ndjson' if export_format == 'ndjson' else 'application/json'
+        response = Response(stream_with_context(generate()), mimetype=mimetype)
+        response.headers['X-Dataset-Version'] = snapshot.version or ''
+        response.headers['X-Total-Count'] = str(len(indices))
+        response.headers['Content-Disposition'] = f'attachment; filename=emergency_bells.{export_format}'
+        return response
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @emergency_bells_bp.route('/stats', methods=['GET'])
 def get_emergency_bells_stats():
     """안전벨 통계 정보"""
     try:
-        bells = load_emergency_bells()
-        
-        # 구별 통계
-        district_stats = {}
-        purpose_stats = {}
-        location_stats = {}
-        
-        for bell in bells:
-            # 구별 통계
-            district = bell.get('관리기관명', '기타')
-            district_stats[district] = district_stats.get(district, 0) + 1
-            
-            # 설치목적별 통계
-            purpose = bell.get('설치목적', '기타')
-            purpose_stats[purpose] = purpose_stats.get(purpose, 0) + 1
-            
-            # 설치장소별 통계
-            location = bell.get('설치장소유형', '기타')
-            location_stats[location] = location_stats.get(location, 0) + 1
+        # 데이터 버전마다 미리 계산된 통계 사용
+        stats = bell_store.get().stats
+        
+        return jsonify({
+            'success': True,
+            'total_count': stats.total_count,
+            'district_stats': stats.district_stats,
+            'purpose_stats': stats.purpose_stats,
+            'location_stats': stats.location_stats,
+            'district_purpose_stats': stats.district_purpose_stats,
+            'district_location_stats': stats.district_location_stats
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@emergency_bells_bp.route('/stats/bbox', methods=['GET'])
+def get_emergency_bells_bbox_stats():
+    """사각 영역 안의 안전벨 수 (설치목적별)"""
+    try:
+        min_lat = request.args.get('min_lat', type=float)
+        min_lng = request.args.get('min_lng', type=float)
+        max_lat = request.args.get('max_lat', type=float)
+        max_lng = request.args.get('max_lng', type=float)
+        
+        if None in (min_lat, min_lng, max_lat, max_lng):
+            return jsonify({
+                'success': False,
+                'error': 'min_lat, min_lng, max_lat, max_lng가 필요합니다.'
+            }), 400
+        
+        total, purpose_stats = bell_store.get().stats.bbox_counts(min_lat, min_lng, max_lat, max_lng)
         
         return jsonify({
             'success': True,
-            'total_count': len(bells),
-            'district_stats': district_stats,
-            'purpose_stats': purpose_stats,
-            'location_stats': location_stats
+            'bbox': {
+                'min_lat': min_lat,
+                'min_lng': min_lng,
+                'max_lat': max_lat,
+                'max_lng': max_lng
+            },
+            'total_count': total,
+            'purpose_stats': purpose_stats
         })
         
     except Exception as e:
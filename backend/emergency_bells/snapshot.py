@@ -0,0 +1,218 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+from datetime import datetime
+
+import numpy as np
+
+from .dataset import CATEGORICAL_COLUMNS, BellDataset
+from .spatial import GridIndex
+
+# 스냅샷 파일 형식
+#   MAGIC(8) | 형식 버전(uint32) | 헤더 길이(uint32) | JSON 헤더 | (정렬) 배열 데이터...
+# 배열은 ALIGNMENT 바이트 경계에 그대로 기록되어 mmap 후 np.frombuffer로 복사 없이 읽는다.
+MAGIC = b'EBELLSNP'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+_PREAMBLE = struct.Struct('<8sII')
+
+
+class SnapshotError(Exception):
+    """스냅샷 파일 형식 오류"""
+
+
+class StringTable:
+    """UTF-8 blob + 오프셋 배열로 저장된 문자열 테이블 (조회 시 디코딩)
+
+    None 값은 빈 문자열로 기록하고 그 위치(none_index)만 따로 두었다가 None으로 복원한다.
+    """
+
+    def __init__(self, blob, offsets, none_index=-1):
+        self.blob = blob
+        self.offsets = offsets
+        self.none_index = none_index
+
+    @classmethod
+    def from_strings(cls, strings):
+        none_index = -1
+        encoded = []
+        for i, s in enumerate(strings):
+            if s is None:
+                none_index = i
+                s = ''
+            encoded.append(str(s).encode('utf-8'))
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        blob = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        return cls(blob, offsets, none_index)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if i == self.none_index:
+            return None
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return self.blob[start:end].tobytes().decode('utf-8')
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    @property
+    def nbytes(self):
+        return self.blob.nbytes + self.offsets.nbytes
+
+
+def is_snapshot(path):
+    """파일이 안전벨 스냅샷인지 확인"""
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def dataset_version(dataset):
+    """데이터 내용 기반 버전 문자열"""
+    digest = hashlib.sha1()
+    digest.update(json.dumps(dataset.columns, ensure_ascii=False).encode('utf-8'))
+    for array in (dataset.lat, dataset.lng, dataset.string_codes, *dataset.codes.values()):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    for value in dataset.string_table:
+        # None 과 문자열 'None' 이 같은 버전이 되지 않도록 구분
+        digest.update(b'\1' if value is None else str(value).encode('utf-8'))
+        digest.update(b'\0')
+    for name in CATEGORICAL_COLUMNS:
+        digest.update(json.dumps(dataset.categories[name], ensure_ascii=False).encode('utf-8'))
+    return digest.hexdigest()[:12]
+
+
+def write_snapshot(path, dataset, index=None, source=None):
+    """데이터셋과 공간 인덱스를 스냅샷 파일로 기록 (임시 파일 작성 후 교체)"""
+    if index is None:
+        index = GridIndex(dataset.lat, dataset.lng)
+
+    strings = dataset.string_table
+    if not isinstance(strings, StringTable):
+        strings = StringTable.from_strings(strings)
+
+    cell_keys = sorted(index.cells)
+    cells = np.array(
+        [(row, col, *index.cells[(row, col)]) for row, col in cell_keys],
+        dtype=np.int64
+    ).reshape(-1, 4)
+
+    arrays = {
+        'lat': dataset.lat,
+        'lng': dataset.lng,
+        'string_codes': dataset.string_codes,
+        'string_offsets': strings.offsets,
+        'string_blob': strings.blob,
+        'index_ids': index.ids.astype(np.int64),
+        'index_cells': cells,
+    }
+    for i, name in enumerate(CATEGORICAL_COLUMNS):
+        arrays[f'codes_{i}'] = dataset.codes[name]
+
+    header = {
+        'version': dataset_version(dataset),
+        'created_at': datetime.now().isoformat(),
+        'source': source,
+        'count': len(dataset),
+        'columns': dataset.columns,
+        'string_columns': dataset.string_columns,
+        'string_none': int(strings.none_index),
+        'categorical_columns': list(CATEGORICAL_COLUMNS),
+        'categories': [dataset.categories[name] for name in CATEGORICAL_COLUMNS],
+        'cell_size': index.cell_size,
+        'arrays': {},
+    }
+
+    # 헤더 길이를 알아야 오프셋을 정할 수 있으므로 오프셋은 데이터 영역 기준 상대값으로 기록
+    offset = 0
+    for name, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        arrays[name] = array
+        header['arrays'][name] = {
+            'dtype': array.dtype.str,
+            'shape': list(array.shape),
+            'offset': offset,
+        }
+        offset = _align(offset + array.nbytes)
+
+    header_bytes = json.dumps(header, ensure_ascii=False).encode('utf-8')
+    data_start = _align(_PREAMBLE.size + len(header_bytes))
+
+    tmp_path = f'{path}.tmp{os.getpid()}'
+    with open(tmp_path, 'wb') as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b'\0' * (data_start - f.tell()))
+        for name, array in arrays.items():
+            position = data_start + header['arrays'][name]['offset']
+            f.write(b'\0' * (position - f.tell()))
+            f.write(array.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    # 기존 파일을 mmap 중인 워커는 이전 inode를 계속 보므로 교체가 안전함
+    os.replace(tmp_path, path)
+    return header
+
+
+def read_header(path):
+    """스냅샷 헤더만 읽기"""
+    with open(path, 'rb') as f:
+        magic, format_version, header_length = _PREAMBLE.unpack(f.read(_PREAMBLE.size))
+        _check_preamble(magic, format_version)
+        return json.loads(f.read(header_length).decode('utf-8'))
+
+
+def read_snapshot(path):
+    """스냅샷 파일을 mmap 하여 (데이터셋, 공간 인덱스, 헤더) 반환
+
+    배열은 모두 mmap 버퍼를 직접 가리키므로 같은 파일을 여는 워커들은
+    페이지 캐시의 한 사본을 공유한다.
+    """
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, format_version, header_length = _PREAMBLE.unpack_from(buffer, 0)
+    _check_preamble(magic, format_version)
+    header = json.loads(bytes(buffer[_PREAMBLE.size:_PREAMBLE.size + header_length]).decode('utf-8'))
+    data_start = _align(_PREAMBLE.size + header_length)
+
+    arrays = {}
+    for name, spec in header['arrays'].items():
+        dtype = np.dtype(spec['dtype'])
+        count = int(np.prod(spec['shape'])) if spec['shape'] else 1
+        array = np.frombuffer(buffer, dtype=dtype, count=count, offset=data_start + spec['offset'])
+        arrays[name] = array.reshape(spec['shape'])
+
+    names = header['categorical_columns']
+    dataset = BellDataset(
+        header['columns'],
+        arrays['lat'],
+        arrays['lng'],
+        dict(zip(names, header['categories'])),
+        {name: arrays[f'codes_{i}'] for i, name in enumerate(names)},
+        StringTable(arrays['string_blob'], arrays['string_offsets'], header.get('string_none', -1)),
+        header['string_columns'],
+        arrays['string_codes'],
+    )
+    index = GridIndex.from_prebuilt(
+        arrays['lat'], arrays['lng'], arrays['index_ids'], arrays['index_cells'], header['cell_size']
+    )
+    return dataset, index, header
+
+
+def _check_preamble(magic, format_version):
+    if magic != MAGIC:
+        raise SnapshotError('안전벨 스냅샷 파일이 아닙니다.')
+    if format_version != FORMAT_VERSION:
+        raise SnapshotError(f'지원하지 않는 스냅샷 형식 버전입니다: {format_version}')
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
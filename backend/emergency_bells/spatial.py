@@ -0,0 +1,229 @@
+import math
+
+import numpy as np
+
+from common.geo import EARTH_RADIUS_KM, KM_PER_DEG_LAT, degree_span, haversine_km
+
+# 격자 셀 크기 (도) - 서울 위도에서 약 1.1km x 0.9km
+CELL_SIZE_DEG = 0.01
+
+_EMPTY_IDS = np.empty(0, dtype=np.int64)
+
+
+class GridIndex:
+    """고정 크기 위경도 격자 기반 공간 인덱스
+
+    레코드 번호를 (행, 열) 셀 순서로 정렬해 두고 셀마다 [시작, 끝) 구간만
+    보관한다. 반경 검색 시에는 반경을 덮는 셀의 구간만 모아 하버사인 거리를
+    한 번에 계산한다.
+    """
+
+    def __init__(self, lats, lngs, cell_size=CELL_SIZE_DEG):
+        self.cell_size = cell_size
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lngs = np.asarray(lngs, dtype=np.float64)
+
+        ids = np.nonzero(np.isfinite(self.lats) & np.isfinite(self.lngs))[0]
+        rows = np.floor(self.lats[ids] / cell_size).astype(np.int64)
+        cols = np.floor(self.lngs[ids] / cell_size).astype(np.int64)
+        order = np.lexsort((cols, rows))
+        ids = ids[order]
+        rows = rows[order]
+        cols = cols[order]
+
+        # 셀 경계 위치 계산 -> (행, 열, 시작, 끝)
+        if len(ids):
+            change = np.nonzero((np.diff(rows) != 0) | (np.diff(cols) != 0))[0] + 1
+            starts = np.concatenate(([0], change))
+            ends = np.concatenate((change, [len(ids)]))
+            cells = np.column_stack((rows[starts], cols[starts], starts, ends))
+        else:
+            cells = np.empty((0, 4), dtype=np.int64)
+        self._set_cells(ids, cells)
+
+    @classmethod
+    def from_prebuilt(cls, lats, lngs, ids, cells, cell_size=CELL_SIZE_DEG):
+        """미리 계산된 정렬 순서와 셀 구간(스냅샷 등)으로 인덱스 생성"""
+        index = cls.__new__(cls)
+        index.cell_size = cell_size
+        index.lats = lats
+        index.lngs = lngs
+        index._set_cells(ids, cells)
+        return index
+
+    def _set_cells(self, ids, cells):
+        self.ids = ids
+        self._cell_array = np.asarray(cells, dtype=np.int64).reshape(-1, 4)
+        self.cells = {(row, col): (start, end) for row, col, start, end in cells.tolist()}
+        if self.cells:
+            self.bounds = (
+                int(cells[:, 0].min()), int(cells[:, 1].min()),
+                int(cells[:, 0].max()), int(cells[:, 1].max())
+            )
+        else:
+            self.bounds = None
+
+    def cell_of(self, lat, lng):
+        return (math.floor(lat / self.cell_size), math.floor(lng / self.cell_size))
+
+    def gather(self, keys):
+        """지정한 셀들에 속한 레코드 번호 배열"""
+        slices = [self.ids[start:end] for start, end in (self.cells.get(key, (0, 0)) for key in keys) if end > start]
+        if not slices:
+            return _EMPTY_IDS
+        return np.concatenate(slices) if len(slices) > 1 else slices[0]
+
+    def candidates(self, min_lat, min_lng, max_lat, max_lng):
+        """사각 영역과 겹치는 셀의 레코드 번호 배열
+
+        영역은 데이터가 있는 셀 범위로 잘라서 순회하므로 비용이 요청 영역 넓이가 아니라
+        데이터 크기에 비례한다. 잘라낸 영역의 셀 수가 실제 셀 수보다 많으면
+        셀 하나씩 찾는 대신 셀 배열 전체에 범위 조건을 한 번에 적용한다.
+        """
+        if self.bounds is None or not (min_lat <= max_lat and min_lng <= max_lng):
+            return _EMPTY_IDS
+        min_row, min_col, max_row, max_col = self.bounds
+        row0, col0 = self.cell_of(max(min_lat, -90.0), max(min_lng, -180.0))
+        row1, col1 = self.cell_of(min(max_lat, 90.0), min(max_lng, 180.0))
+        row0, col0 = max(row0, min_row), max(col0, min_col)
+        row1, col1 = min(row1, max_row), min(col1, max_col)
+        if row0 > row1 or col0 > col1:
+            return _EMPTY_IDS
+
+        if (row1 - row0 + 1) * (col1 - col0 + 1) <= len(self.cells):
+            return self.gather((row, col) for row in range(row0, row1 + 1) for col in range(col0, col1 + 1))
+
+        cells = self._cell_array
+        hit = (cells[:, 0] >= row0) & (cells[:, 0] <= row1) & (cells[:, 1] >= col0) & (cells[:, 1] <= col1)
+        if hit.all():
+            return self.ids
+        slices = [self.ids[start:end] for start, end in cells[hit, 2:].tolist()]
+        if not slices:
+            return _EMPTY_IDS
+        return np.concatenate(slices)
+
+    def within_bbox(self, min_lat, min_lng, max_lat, max_lng, mask=None):
+        """사각 영역 안의 레코드 번호 배열 (셀 순서)"""
+        ids = self.candidates(min_lat, min_lng, max_lat, max_lng)
+        if mask is not None:
+            ids = ids[mask[ids]]
+        lats = self.lats[ids]
+        lngs = self.lngs[ids]
+        return ids[(lats >= min_lat) & (lats <= max_lat) & (lngs >= min_lng) & (lngs <= max_lng)]
+
+    def within_radius(self, lat, lng, radius_km, mask=None):
+        """반경 내 레코드를 거리순 (거리 km 배열, 레코드 번호 배열)로 반환"""
+        dlat, dlng = degree_span(lat, radius_km)
+        ids = self.candidates(lat - dlat, lng - dlng, lat + dlat, lng + dlng)
+        if mask is not None:
+            ids = ids[mask[ids]]
+        distances = haversine_km(lat, lng, self.lats[ids], self.lngs[ids])
+        keep = distances <= radius_km
+        ids = ids[keep]
+        distances = distances[keep]
+        order = np.lexsort((ids, distances))
+        return distances[order], ids[order]
+
+    def _ring_keys(self, row, col, r):
+        """(row, col)을 중심으로 한 r번째 링의 셀 키"""
+        if r == 0:
+            return [(row, col)]
+        keys = []
+        for c in range(col - r, col + r + 1):
+            keys.append((row - r, c))
+            keys.append((row + r, c))
+        for rr in range(row - r + 1, row + r):
+            keys.append((rr, col - r))
+            keys.append((rr, col + r))
+        return keys
+
+    def _outside_bound_km(self, lat, lng, row, col, r):
+        """링 0..r 바깥에 있는 점까지의 최소 가능 거리 (km)"""
+        size = self.cell_size
+        south = lat - (row - r) * size
+        north = (row + r + 1) * size - lat
+        west = lng - (col - r) * size
+        east = (col + r + 1) * size - lng
+        lat_gap = min(south, north)
+        # hav(d) >= cos^2(max|lat|) * hav(dlng) 이므로 경도 방향 하한도 보수적으로 계산
+        max_lat = min(max(abs((row - r) * size), abs((row + r + 1) * size)), 90.0)
+        lng_gap = min(west, east)
+        lng_bound = 2 * EARTH_RADIUS_KM * math.asin(
+            min(1.0, math.cos(math.radians(max_lat)) * math.sin(math.radians(min(lng_gap, 180.0)) / 2))
+        )
+        return min(lat_gap * KM_PER_DEG_LAT, lng_bound)
+
+    def nearest(self, lat, lng, k=1, mask=None, max_radius_km=None):
+        """가까운 순으로 최대 k개 레코드를 (거리 km 배열, 레코드 번호 배열)로 반환
+
+        중심 셀에서 링 단위로 넓혀 가며 탐색하고, 아직 보지 않은 셀까지의
+        최소 거리가 현재 k번째 거리보다 멀어지면 즉시 종료한다.
+        mask(불리언 배열)가 주어지면 탐색 중에 조건을 만족하는 레코드만 후보로 삼는다.
+        질의 지점이 데이터 범위 밖이거나 링 탐색이 전체 셀 수보다 길어지면
+        전체 레코드와의 거리를 한 번에 계산한다.
+        """
+        best_d = np.empty(0, dtype=np.float64)
+        best_i = _EMPTY_IDS
+        if k <= 0 or self.bounds is None:
+            return best_d, best_i
+
+        row, col = self.cell_of(lat, lng)
+        min_row, min_col, max_row, max_col = self.bounds
+
+        # 최대 반경이 데이터 범위에 닿지 않으면 탐색하지 않음
+        if max_radius_km is not None:
+            dlat, dlng = degree_span(lat, max_radius_km)
+            size = self.cell_size
+            if (lat + dlat < min_row * size or lat - dlat > (max_row + 1) * size
+                    or lng + dlng < min_col * size or lng - dlng > (max_col + 1) * size):
+                return best_d, best_i
+
+        if not (min_row <= row <= max_row and min_col <= col <= max_col):
+            return self._nearest_scan(lat, lng, k, mask, max_radius_km)
+
+        max_ring = max(row - min_row, max_row - row, col - min_col, max_col - col, 0)
+        visited = 0
+        for r in range(max_ring + 1):
+            keys = self._ring_keys(row, col, r)
+            visited += len(keys)
+            if visited > 4 * len(self.cells):
+                return self._nearest_scan(lat, lng, k, mask, max_radius_km)
+            ids = self.gather(keys)
+            if mask is not None and len(ids):
+                ids = ids[mask[ids]]
+            if len(ids):
+                distances = haversine_km(lat, lng, self.lats[ids], self.lngs[ids])
+                if max_radius_km is not None:
+                    keep = distances <= max_radius_km
+                    ids = ids[keep]
+                    distances = distances[keep]
+                best_d = np.concatenate((best_d, distances))
+                best_i = np.concatenate((best_i, ids))
+                if len(best_d) > k:
+                    top = np.argpartition(best_d, k - 1)[:k]
+                    best_d = best_d[top]
+                    best_i = best_i[top]
+
+            bound = self._outside_bound_km(lat, lng, row, col, r)
+            if len(best_d) == k and bound >= best_d.max():
+                break
+            if max_radius_km is not None and bound > max_radius_km:
+                break
+
+        order = np.lexsort((best_i, best_d))
+        return best_d[order], best_i[order]
+
+    def _nearest_scan(self, lat, lng, k, mask, max_radius_km):
+        """전체 레코드 대상 k-최근접 (거리 km 배열, 레코드 번호 배열)"""
+        ids = self.ids if mask is None else self.ids[mask[self.ids]]
+        distances = haversine_km(lat, lng, self.lats[ids], self.lngs[ids])
+        if max_radius_km is not None:
+            keep = distances <= max_radius_km
+            ids = ids[keep]
+            distances = distances[keep]
+        if len(distances) > k:
+            top = np.argpartition(distances, k - 1)[:k]
+            ids = ids[top]
+            distances = distances[top]
+        order = np.lexsort((ids, distances))
+        return distances[order], ids[order]
@@ -0,0 +1,124 @@
+import numpy as np
+
+
+# 통계 기본 컬럼
+DISTRICT = '관리기관명'
+PURPOSE = '설치목적'
+LOCATION = '설치장소유형'
+
+
+class BellStats:
+    """데이터셋 버전마다 한 번 계산해 두는 안전벨 통계
+
+    - 컬럼별 개수, 구 × 설치목적 / 구 × 설치장소 교차표
+    - 격자 셀 × 설치목적 개수의 누적합(summed-area table)으로 사각 영역 개수 조회
+    """
+
+    def __init__(self, dataset, index):
+        self.dataset = dataset
+        self.index = index
+        self.total_count = len(dataset)
+        self.district_stats = dataset.value_counts(DISTRICT)
+        self.purpose_stats = dataset.value_counts(PURPOSE)
+        self.location_stats = dataset.value_counts(LOCATION)
+        self.district_purpose_stats = self.crosstab(DISTRICT, PURPOSE)
+        self.district_location_stats = self.crosstab(DISTRICT, LOCATION)
+        self._build_cell_prefix_sums()
+
+    def crosstab(self, row_column, col_column, default='기타'):
+        """두 범주 컬럼의 교차 개수 {행 값: {열 값: 개수}}"""
+        dataset = self.dataset
+        row_values = dataset.categories[row_column] + [default]
+        col_values = dataset.categories[col_column] + [default]
+        # 값이 없는 행(MISSING/ABSENT)은 마지막 코드(default)로 모음
+        row_codes = np.where(dataset.codes[row_column] < 0, len(row_values) - 1, dataset.codes[row_column])
+        col_codes = np.where(dataset.codes[col_column] < 0, len(col_values) - 1, dataset.codes[col_column])
+        counts = np.bincount(
+            row_codes.astype(np.int64) * len(col_values) + col_codes,
+            minlength=len(row_values) * len(col_values)
+        ).reshape(len(row_values), len(col_values))
+
+        # default 값이 기존 범주와 같은 이름일 수 있으므로 더해서 합침
+        table = {}
+        for i, j in zip(*np.nonzero(counts)):
+            row = table.setdefault(row_values[i], {})
+            row[col_values[j]] = row.get(col_values[j], 0) + int(counts[i, j])
+        return table
+
+    def _build_cell_prefix_sums(self):
+        index = self.index
+        purposes = self.dataset.categories[PURPOSE]
+        self.purpose_values = purposes + ['기타']
+        if index.bounds is None:
+            self.prefix = None
+            return
+
+        min_row, min_col, max_row, max_col = index.bounds
+        self.origin = (min_row, min_col)
+        shape = (len(self.purpose_values), max_row - min_row + 1, max_col - min_col + 1)
+
+        ids = index.ids
+        rows = np.floor(index.lats[ids] / index.cell_size).astype(np.int64) - min_row
+        cols = np.floor(index.lngs[ids] / index.cell_size).astype(np.int64) - min_col
+        codes = self.dataset.codes[PURPOSE][ids]
+        codes = np.where(codes < 0, len(purposes), codes)
+
+        counts = np.zeros(shape, dtype=np.int64)
+        np.add.at(counts, (codes, rows, cols), 1)
+        # prefix[p, r, c] = counts[p, :r, :c] 합
+        self.prefix = np.zeros((shape[0], shape[1] + 1, shape[2] + 1), dtype=np.int64)
+        self.prefix[:, 1:, 1:] = counts.cumsum(axis=1).cumsum(axis=2)
+
+    def _block_sum(self, row0, col0, row1, col1):
+        """셀 블록 [row0..row1] x [col0..col1]의 설치목적별 개수"""
+        min_row, min_col = self.origin
+        _, height, width = self.prefix.shape
+        r0 = min(max(row0 - min_row, 0), height - 1)
+        r1 = min(max(row1 - min_row + 1, 0), height - 1)
+        c0 = min(max(col0 - min_col, 0), width - 1)
+        c1 = min(max(col1 - min_col + 1, 0), width - 1)
+        if r1 <= r0 or c1 <= c0:
+            return np.zeros(self.prefix.shape[0], dtype=np.int64)
+        p = self.prefix
+        return p[:, r1, c1] - p[:, r0, c1] - p[:, r1, c0] + p[:, r0, c0]
+
+    def bbox_counts(self, min_lat, min_lng, max_lat, max_lng):
+        """사각 영역 안의 안전벨 수 (전체, 설치목적별)
+
+        영역에 완전히 포함된 셀은 누적합으로, 경계에 걸친 셀만 실제 좌표로 확인한다.
+        """
+        counts = np.zeros(len(self.purpose_values), dtype=np.int64)
+        if self.prefix is not None and min_lat <= max_lat and min_lng <= max_lng:
+            index = self.index
+            row0, col0 = index.cell_of(min_lat, min_lng)
+            row1, col1 = index.cell_of(max_lat, max_lng)
+            # 데이터 범위를 벗어난 부분은 잘라서 경계 셀 순회를 제한
+            min_row, min_col, max_row, max_col = index.bounds
+            row0, col0 = max(row0, min_row - 1), max(col0, min_col - 1)
+            row1, col1 = min(row1, max_row + 1), min(col1, max_col + 1)
+
+            # 내부 셀
+            counts += self._block_sum(row0 + 1, col0 + 1, row1 - 1, col1 - 1)
+
+            # 경계 셀
+            edge = set()
+            for col in range(col0, col1 + 1):
+                edge.add((row0, col))
+                edge.add((row1, col))
+            for row in range(row0, row1 + 1):
+                edge.add((row, col0))
+                edge.add((row, col1))
+            ids = index.gather(edge)
+            if len(ids):
+                lats = index.lats[ids]
+                lngs = index.lngs[ids]
+                inside = (lats >= min_lat) & (lats <= max_lat) & (lngs >= min_lng) & (lngs <= max_lng)
+                codes = self.dataset.codes[PURPOSE][ids[inside]]
+                codes = np.where(codes < 0, len(self.purpose_values) - 1, codes)
+                counts += np.bincount(codes, minlength=len(self.purpose_values))
+
+        purpose_counts = {}
+        for value, count in zip(self.purpose_values, counts.tolist()):
+            if count:
+                purpose_counts[value] = purpose_counts.get(value, 0) + count
+        return int(counts.sum()), purpose_counts
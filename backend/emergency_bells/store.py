@@ -0,0 +1,241 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from .dataset import BellDataset
+from .encoded import EncodedResponses
+from .snapshot import is_snapshot, read_header, read_snapshot
+from .spatial import GridIndex
+from .stats import BellStats
+from .tiles import ClusterPyramid
+
+# 데이터 파일 경로
+DATA_FILE = os.path.join(os.path.dirname(__file__), '../../emergency_bells.json')
+
+# convert_data.py 가 생성하는 바이너리 스냅샷 (있으면 JSON 대신 mmap으로 사용)
+SNAPSHOT_FILE = os.environ.get(
+    'EMERGENCY_BELLS_SNAPSHOT',
+    os.path.join(os.path.dirname(__file__), '../../emergency_bells.snapshot')
+)
+
+# 변경 감지 주기 (초)
+CHECK_INTERVAL = float(os.environ.get('EMERGENCY_BELLS_CHECK_INTERVAL', 5.0))
+
+
+class BellSnapshot:
+    """한 번 로드된 안전벨 데이터 (읽기 전용으로 취급)"""
+
+    def __init__(self, dataset, version, mtime, size, loaded_at, load_time_ms=0.0, index=None, source=None):
+        self.dataset = dataset
+        self.version = version
+        self.mtime = mtime
+        self.size = size
+        self.loaded_at = loaded_at
+        self.load_time_ms = load_time_ms
+        self.source = source
+        # 교체 전에 인덱스까지 완성해 두어 조회 시 추가 작업이 없도록 함
+        self.index = index if index is not None else GridIndex(dataset.lat, dataset.lng)
+        # 통계는 데이터 버전마다 한 번만 계산
+        self.stats = BellStats(dataset, self.index)
+        # 전체/필터 응답은 버전마다 한 번만 직렬화
+        self.responses = EncodedResponses(version)
+        self._pyramid = None
+        self._lock = threading.Lock()
+
+    @property
+    def count(self):
+        return len(self.dataset)
+
+    @property
+    def pyramid(self):
+        """클러스터 피라미드 (타일 첫 요청 시 한 번 계산)"""
+        if self._pyramid is None:
+            with self._lock:
+                if self._pyramid is None:
+                    self._pyramid = ClusterPyramid(self.dataset, self.index)
+        return self._pyramid
+
+
+def file_digest(path):
+    """파일 내용 해시 계산"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]
+
+
+def default_source():
+    """스냅샷과 JSON 파일 중 더 최근에 수정된 쪽의 경로 (같으면 스냅샷)
+
+    스냅샷을 다시 만들지 않고 JSON만 갱신한 경우 오래된 스냅샷을 계속 쓰지 않도록 함
+    """
+    try:
+        snapshot_mtime = os.stat(SNAPSHOT_FILE).st_mtime
+    except FileNotFoundError:
+        return DATA_FILE
+    try:
+        data_mtime = os.stat(DATA_FILE).st_mtime
+    except FileNotFoundError:
+        return SNAPSHOT_FILE
+    return SNAPSHOT_FILE if snapshot_mtime >= data_mtime else DATA_FILE
+
+
+def source_version(path):
+    """원본 파일의 데이터 버전 (스냅샷은 헤더 값, JSON은 내용 해시)"""
+    if is_snapshot(path):
+        return read_header(path)['version']
+    return file_digest(path)
+
+
+def load_snapshot(path):
+    """안전벨 데이터 파일(JSON 또는 바이너리 스냅샷)을 읽어 스냅샷 생성"""
+    started = time.perf_counter()
+    try:
+        stat = os.stat(path)
+        if is_snapshot(path):
+            # mmap 으로 열기 때문에 파싱 없이 바로 사용 가능
+            dataset, index, header = read_snapshot(path)
+            version = header['version']
+        else:
+            index = None
+            version = file_digest(path)
+            with open(path, 'r', encoding='utf-8') as f:
+                dataset = BellDataset.from_records(json.load(f))
+    except FileNotFoundError:
+        return BellSnapshot(BellDataset.from_records([]), None, None, None, datetime.now(), source=path)
+
+    snapshot = BellSnapshot(
+        dataset, version, stat.st_mtime, stat.st_size, datetime.now(), index=index, source=path
+    )
+    snapshot.load_time_ms = round((time.perf_counter() - started) * 1000, 2)
+    return snapshot
+
+
+class BellStore:
+    """프로세스(워커) 단위로 공유되는 안전벨 데이터 저장소
+
+    최초 조회 시 한 번만 로드하고, 백그라운드 스레드가 원본 파일의
+    변경(mtime/크기 → 해시)을 감지하면 새 스냅샷을 만든 뒤 참조만 교체한다.
+    요청 처리 쪽은 항상 완성된 스냅샷만 보게 되며 리로드를 기다리지 않는다.
+    """
+
+    def __init__(self, path=None, check_interval=CHECK_INTERVAL):
+        self._path = path
+        self.check_interval = check_interval
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._watcher = None
+        self._watcher_pid = None
+        self._stop = threading.Event()
+        self.reload_count = 0
+        self.last_error = None
+
+    @property
+    def path(self):
+        """현재 사용할 원본 파일 경로 (지정하지 않으면 스냅샷/JSON 중 최신 파일)"""
+        return self._path or default_source()
+
+    def get(self):
+        """현재 스냅샷 반환 (최초 호출 시에만 로드)"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                if self._snapshot is None:
+                    self._snapshot = self._load()
+                snapshot = self._snapshot
+        self._ensure_watcher()
+        return snapshot
+
+    def _load(self):
+        try:
+            snapshot = load_snapshot(self.path)
+            self.last_error = None
+            return snapshot
+        except Exception as e:
+            print(f"데이터 로드 에러: {e}")
+            self.last_error = str(e)
+            return BellSnapshot(BellDataset.from_records([]), None, None, None, datetime.now(), source=self.path)
+
+    def _has_changed(self, snapshot):
+        path = self.path
+        if path != snapshot.source:
+            return True
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return snapshot.version is not None
+        if stat.st_mtime == snapshot.mtime and stat.st_size == snapshot.size:
+            return False
+        # mtime만 바뀐 경우(touch 등)는 버전으로 다시 확인
+        return source_version(path) != snapshot.version
+
+    def reload_if_changed(self):
+        """원본 파일이 바뀌었으면 새 스냅샷으로 교체"""
+        current = self._snapshot
+        if current is None:
+            self.get()
+            return True
+        try:
+            if not self._has_changed(current):
+                return False
+        except OSError as e:
+            self.last_error = str(e)
+            return False
+
+        snapshot = self._load()
+        if self.last_error is not None:
+            # 로드 실패 시 기존 데이터를 유지
+            return False
+        self._snapshot = snapshot
+        self.reload_count += 1
+        print(f"🔄 안전벨 데이터 리로드: {snapshot.count}건 (version {snapshot.version})")
+        return True
+
+    def _watch(self):
+        while not self._stop.wait(self.check_interval):
+            try:
+                self.reload_if_changed()
+            except Exception as e:
+                self.last_error = str(e)
+
+    def _ensure_watcher(self):
+        # gunicorn 등으로 fork된 워커에서는 스레드가 복제되지 않으므로 pid 기준으로 다시 시작
+        if self.check_interval <= 0 or self._watcher_pid == os.getpid():
+            return
+        with self._lock:
+            if self._watcher_pid == os.getpid():
+                return
+            self._stop = threading.Event()
+            self._watcher = threading.Thread(target=self._watch, name='bell-store-watcher', daemon=True)
+            self._watcher.start()
+            self._watcher_pid = os.getpid()
+
+    def stop(self):
+        """변경 감지 스레드 중지"""
+        self._stop.set()
+        self._watcher_pid = None
+
+    def info(self):
+        """헬스 체크용 저장소 상태"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return {'loaded': False}
+        return {
+            'loaded': True,
+            'version': snapshot.version,
+            'source': os.path.basename(snapshot.source) if snapshot.source else None,
+            'record_count': snapshot.count,
+            'memory_bytes': snapshot.dataset.nbytes(),
+            'loaded_at': snapshot.loaded_at.isoformat(),
+            'load_time_ms': snapshot.load_time_ms,
+            'reload_count': self.reload_count,
+            'last_error': self.last_error
+        }
+
+
+# 워커 전역 저장소
+bell_store = BellStore()
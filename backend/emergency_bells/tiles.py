@@ -0,0 +1,161 @@
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+# 타일 한 변당 클러스터 칸 수 (256px 타일 기준 32px 간격)
+CLUSTER_GRID = 8
+
+# 이 레벨까지는 클러스터, 더 확대하면 개별 안전벨 반환
+MAX_CLUSTER_ZOOM = 14
+MAX_ZOOM = 22
+
+# 개별 안전벨 타일의 최대 반환 개수
+MAX_TILE_BELLS = 2000
+
+# 메르카토르 투영 위도 한계
+MAX_MERCATOR_LAT = 85.05112878
+
+
+def lnglat_to_unit(lat, lng):
+    """위경도를 웹 메르카토르 정규 좌표 (0~1) 로 변환"""
+    lat = np.clip(lat, -MAX_MERCATOR_LAT, MAX_MERCATOR_LAT)
+    x = (np.asarray(lng) + 180.0) / 360.0
+    sin_lat = np.sin(np.radians(lat))
+    y = 0.5 - np.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+    return x, y
+
+
+def tile_bounds(z, x, y):
+    """XYZ 타일의 (min_lat, min_lng, max_lat, max_lng)"""
+    n = 2 ** z
+
+    def lat_of(ty):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * ty / n))))
+
+    return lat_of(y + 1), x / n * 360.0 - 180.0, lat_of(y), (x + 1) / n * 360.0 - 180.0
+
+
+class ClusterLevel:
+    """한 줌 레벨의 클러스터 (타일 순으로 정렬, 타일별 [시작, 끝) 구간)"""
+
+    def __init__(self, z, unit_x, unit_y, lats, lngs, purpose_codes, n_purposes):
+        n = (2 ** z) * CLUSTER_GRID
+        cx = np.minimum((unit_x * n).astype(np.int64), n - 1)
+        cy = np.minimum((unit_y * n).astype(np.int64), n - 1)
+        keys, inverse, counts = np.unique(cx * n + cy, return_inverse=True, return_counts=True)
+
+        lat_sum = np.bincount(inverse, weights=lats, minlength=len(keys))
+        lng_sum = np.bincount(inverse, weights=lngs, minlength=len(keys))
+        purposes = np.bincount(
+            inverse * n_purposes + purpose_codes, minlength=len(keys) * n_purposes
+        ).reshape(len(keys), n_purposes)
+
+        tile_keys = (keys // n // CLUSTER_GRID) * (2 ** z) + (keys % n) // CLUSTER_GRID
+        order = np.argsort(tile_keys, kind='stable')
+        self.tile_keys = tile_keys[order]
+        self.counts = counts[order]
+        self.lats = (lat_sum / counts)[order]
+        self.lngs = (lng_sum / counts)[order]
+        self.purposes = purposes[order]
+        self.tiles_per_side = 2 ** z
+
+    def clusters(self, x, y):
+        key = x * self.tiles_per_side + y
+        start = np.searchsorted(self.tile_keys, key, side='left')
+        end = np.searchsorted(self.tile_keys, key, side='right')
+        return slice(start, end)
+
+
+class ClusterPyramid:
+    """데이터셋 버전마다 한 번 계산하는 줌 레벨별 클러스터 피라미드"""
+
+    def __init__(self, dataset, index):
+        self.dataset = dataset
+        self.index = index
+        ids = index.ids
+        lats = index.lats[ids]
+        lngs = index.lngs[ids]
+        unit_x, unit_y = lnglat_to_unit(lats, lngs)
+
+        purposes = dataset.categories['설치목적']
+        self.purpose_values = purposes + ['기타']
+        codes = dataset.codes['설치목적'][ids]
+        codes = np.where(codes < 0, len(purposes), codes).astype(np.int64)
+
+        self.levels = [
+            ClusterLevel(z, unit_x, unit_y, lats, lngs, codes, len(self.purpose_values))
+            for z in range(MAX_CLUSTER_ZOOM + 1)
+        ]
+
+    def clusters(self, z, x, y):
+        """클러스터 타일 내용"""
+        level = self.levels[z]
+        part = level.clusters(x, y)
+        result = []
+        for count, lat, lng, purposes in zip(
+            level.counts[part].tolist(), level.lats[part].tolist(),
+            level.lngs[part].tolist(), level.purposes[part].tolist()
+        ):
+            purpose_stats = {}
+            for value, purpose_count in zip(self.purpose_values, purposes):
+                if purpose_count:
+                    purpose_stats[value] = purpose_stats.get(value, 0) + purpose_count
+            result.append({
+                'count': count,
+                'lat': round(lat, 6),
+                'lng': round(lng, 6),
+                'purpose_stats': purpose_stats
+            })
+        return result
+
+    def bells(self, z, x, y, fields=None):
+        """개별 안전벨 타일 내용 (최대 MAX_TILE_BELLS건의 행, 타일 안 전체 개수)"""
+        min_lat, min_lng, max_lat, max_lng = tile_bounds(z, x, y)
+        indices = self.index.within_bbox(min_lat, min_lng, max_lat, max_lng)
+        # 인접 타일에 중복되지 않도록 남쪽/동쪽 경계는 제외 (클러스터 타일과 같은 반개구간)
+        lats = self.index.lats[indices]
+        lngs = self.index.lngs[indices]
+        indices = indices[(lats > min_lat) & (lngs < max_lng)]
+        return self.dataset.rows(indices[:MAX_TILE_BELLS], fields), len(indices)
+
+
+class TileCache:
+    """크기 제한이 있는 LRU 타일 캐시"""
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, build):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = build()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def info(self):
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
@@ -0,0 +1,500 @@
+import math
+import time
+from collections import Counter, deque
+from datetime import date
+
+import numpy as np
+
+from common.geo import KM_PER_DEG_LAT
+from .summary import rebuild_zone_rollups
+
+# 미터 격자 (고정 기준 위도로 경도를 환산해 셀 번호가 실행마다 바뀌지 않게 함)
+REFERENCE_LAT = 37.5
+CELL_SIZE_KM = 0.1
+KM_PER_DEG_LNG = KM_PER_DEG_LAT * math.cos(math.radians(REFERENCE_LAT))
+
+# 가우시안 커널 대역폭 (km), 3σ 에서 자름
+BANDWIDTH_KM = 0.2
+KERNEL_CELLS = math.ceil(3 * BANDWIDTH_KM / CELL_SIZE_KM)
+
+# 최근성 가중치: 반감기 (일)
+# 가중치를 기준일(DECAY_EPOCH)로부터 앞으로 증가하는 값(2^(경과일/반감기))으로 저장하면
+# 셀 합계를 증분으로 더할 수 있고, 조회 시점의 감쇠는 전체에 곱하는 상수 하나가 된다.
+HALF_LIFE_DAYS = 90.0
+DECAY_EPOCH = date(2020, 1, 1)
+
+# 가중치를 계산할 때 사건일의 상한 (오늘 + 이 일수) - 잘못 들어온 먼 미래 날짜가
+# 2^(경과일/반감기) 를 무한대로 만들어 셀 합계와 백분위수를 망가뜨리지 않도록 자름
+FUTURE_TOLERANCE_DAYS = 1
+
+# 심각도가 없는 사건의 가중치
+DEFAULT_SEVERITY = 3
+
+# 핫존 판정 밀도 (감쇠 적용, km² 당 가중 사건 수)
+# 전체 모드에서는 사건이 있는 셀 밀도의 HOT_PERCENTILE 백분위수로 다시 정하고(최소 DENSITY_THRESHOLD),
+# 증분 모드는 마지막으로 정한 값을 그대로 사용한다.
+DENSITY_THRESHOLD = 30.0
+HOT_PERCENTILE = 99.0
+
+# 위험도 단계별 임계 밀도 배수 (1~5단계)
+RISK_MULTIPLIERS = (1, 2, 4, 8, 16)
+
+# 핫존으로 만들 최소 사건 수
+MIN_CLUSTER_INCIDENTS = 3
+MIN_RADIUS_KM = 0.1
+
+# 밀도 재계산 단위 (셀 TILE_CELLS x TILE_CELLS)
+TILE_CELLS = 64
+
+# 새 사건을 읽어 격자에 더하는 단위
+BIN_CHUNK_SIZE = 50000
+
+DERIVE_SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS incident_cells (
+        row INTEGER NOT NULL,
+        col INTEGER NOT NULL,
+        weight REAL NOT NULL DEFAULT 0,
+        incident_count INTEGER NOT NULL DEFAULT 0,
+        density REAL NOT NULL DEFAULT 0,
+        dirty INTEGER NOT NULL DEFAULT 0,
+        zone_id INTEGER,
+        PRIMARY KEY (row, col)
+    ) WITHOUT ROWID
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_incident_cells_dirty ON incident_cells (dirty) WHERE dirty = 1',
+    'CREATE INDEX IF NOT EXISTS idx_incident_cells_zone ON incident_cells (zone_id) WHERE zone_id IS NOT NULL',
+    # 셀별 사건 번호 (파생 핫존에 셀 안의 사건을 배정할 때 사용)
+    '''
+    CREATE TABLE IF NOT EXISTS incident_cell_members (
+        row INTEGER NOT NULL,
+        col INTEGER NOT NULL,
+        incident_id INTEGER NOT NULL,
+        PRIMARY KEY (row, col, incident_id)
+    ) WITHOUT ROWID
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS hotzone_derive_state (
+        name TEXT PRIMARY KEY,
+        value TEXT
+    )
+    ''',
+]
+
+UPSERT_CELL_WEIGHT = '''
+    INSERT INTO incident_cells (row, col, weight, incident_count, dirty)
+    VALUES (?, ?, ?, ?, 1)
+    ON CONFLICT (row, col) DO UPDATE SET
+        weight = weight + excluded.weight,
+        incident_count = incident_count + excluded.incident_count,
+        dirty = 1
+'''
+
+UPSERT_CELL_DENSITY = '''
+    INSERT INTO incident_cells (row, col, density)
+    VALUES (?, ?, ?)
+    ON CONFLICT (row, col) DO UPDATE SET density = excluded.density
+'''
+
+# 셀 안의 핫존 미배정 사건을 파생 핫존에 배정 (손으로 등록한 핫존에 속한 사건은 그대로 둠)
+ASSIGN_CELL_INCIDENTS = '''
+    UPDATE incidents SET hotzone_id = ?
+    WHERE hotzone_id IS NULL
+      AND id IN (SELECT incident_id FROM incident_cell_members WHERE row = ? AND col = ?)
+'''
+
+# 파생 핫존 설명 (배정 후 실제 사건 수로 채움)
+UPDATE_DERIVED_DESCRIPTION = '''
+    UPDATE hotzones
+    SET description = '사건 밀도 기반 자동 생성 (사건 ' || incident_count || '건, 최고 밀도 ' || ? || '/km²)'
+    WHERE id = ?
+'''
+
+
+def init_derive_schema(cursor):
+    """격자 집계/상태 테이블 생성, hotzones.derived 컬럼 추가"""
+    for statement in DERIVE_SCHEMA:
+        cursor.execute(statement)
+    cursor.execute('PRAGMA table_info(hotzones)')
+    if 'derived' not in {column[1] for column in cursor.fetchall()}:
+        cursor.execute('ALTER TABLE hotzones ADD COLUMN derived INTEGER NOT NULL DEFAULT 0')
+
+
+def cell_of(lats, lngs):
+    """위경도 배열 -> (행, 열) 미터 격자 번호 배열"""
+    rows = np.floor(np.asarray(lats) * KM_PER_DEG_LAT / CELL_SIZE_KM).astype(np.int64)
+    cols = np.floor(np.asarray(lngs) * KM_PER_DEG_LNG / CELL_SIZE_KM).astype(np.int64)
+    return rows, cols
+
+
+def decay_factor(as_of):
+    """기준일 가중치를 as_of 시점 가중치로 바꾸는 배수"""
+    return 2.0 ** (-(as_of - DECAY_EPOCH).days / HALF_LIFE_DAYS)
+
+
+def incident_weights(dates, severities):
+    """사건일/심각도 -> 기준일 기준 가중치 (날짜를 읽을 수 없는 사건은 0, 미래 날짜는 상한으로 자름)"""
+    days = np.array([value[:10] if isinstance(value, str) else 'NaT' for value in dates], dtype='U10')
+    try:
+        parsed = days.astype('datetime64[D]')
+    except ValueError:
+        parsed = np.array([_parse_day(value) for value in days], dtype='datetime64[D]')
+    latest = np.datetime64(date.today(), 'D') + FUTURE_TOLERANCE_DAYS
+    parsed = np.where(parsed > latest, latest, parsed)
+    elapsed = (parsed - np.datetime64(DECAY_EPOCH, 'D')).astype(np.float64)
+    severity = np.array([DEFAULT_SEVERITY if value is None else value for value in severities], dtype=np.float64)
+    weights = severity * np.exp2(elapsed / HALF_LIFE_DAYS)
+    return np.where(np.isnat(parsed), 0.0, weights)
+
+
+def _parse_day(value):
+    try:
+        return np.datetime64(value, 'D')
+    except ValueError:
+        return np.datetime64('NaT')
+
+
+def _get_state(cursor, name, default=None):
+    cursor.execute('SELECT value FROM hotzone_derive_state WHERE name = ?', (name,))
+    row = cursor.fetchone()
+    return default if row is None else row[0]
+
+
+def _set_state(cursor, name, value):
+    cursor.execute('''
+        INSERT INTO hotzone_derive_state (name, value) VALUES (?, ?)
+        ON CONFLICT (name) DO UPDATE SET value = excluded.value
+    ''', (name, str(value)))
+
+
+def bin_new_incidents(db, chunk_size=BIN_CHUNK_SIZE):
+    """마지막 실행 이후 추가된 사건을 격자 셀 가중치에 더함 (셀은 dirty 로 표시)
+
+    청크마다 셀 갱신, 셀별 사건 번호 기록, 마지막 사건 번호 저장을 한 트랜잭션으로
+    처리하므로 중간에 중단되어도 다음 실행이 이어서 진행한다.
+    """
+    binned = 0
+    while True:
+        with db.transaction() as conn:
+            cursor = conn.cursor()
+            last_id = int(_get_state(cursor, 'last_incident_id', 0))
+            cursor.execute('''
+                SELECT id, latitude, longitude, incident_date, severity
+                FROM incidents
+                WHERE id > ?
+                ORDER BY id
+                LIMIT ?
+            ''', (last_id, chunk_size))
+            incidents = cursor.fetchall()
+            if not incidents:
+                return binned
+
+            located = [row for row in incidents if row[1] is not None and row[2] is not None]
+            if located:
+                rows, cols = cell_of([row[1] for row in located], [row[2] for row in located])
+                weights = incident_weights([row[3] for row in located], [row[4] for row in located])
+                keys, inverse = np.unique(np.column_stack((rows, cols)), axis=0, return_inverse=True)
+                inverse = inverse.ravel()
+                cell_weights = np.bincount(inverse, weights=weights, minlength=len(keys))
+                cell_counts = np.bincount(inverse, minlength=len(keys))
+                cursor.executemany(UPSERT_CELL_WEIGHT, zip(
+                    keys[:, 0].tolist(), keys[:, 1].tolist(), cell_weights.tolist(), cell_counts.tolist()
+                ))
+                cursor.executemany(
+                    'INSERT OR IGNORE INTO incident_cell_members (row, col, incident_id) VALUES (?, ?, ?)',
+                    zip(rows.tolist(), cols.tolist(), [row[0] for row in located])
+                )
+            _set_state(cursor, 'last_incident_id', incidents[-1][0])
+            binned += len(located)
+
+
+def _tiles_around(rows, cols, margin):
+    """셀 (행, 열)에서 margin 셀 이내에 걸치는 타일 집합"""
+    tiles = set()
+    for dr in (-margin, 0, margin):
+        for dc in (-margin, 0, margin):
+            tile_rows = np.floor_divide(rows + dr, TILE_CELLS)
+            tile_cols = np.floor_divide(cols + dc, TILE_CELLS)
+            tiles.update(zip(tile_rows.tolist(), tile_cols.tolist()))
+    return tiles
+
+
+def _gaussian_kernel():
+    offsets = np.arange(-KERNEL_CELLS, KERNEL_CELLS + 1) * CELL_SIZE_KM
+    return np.exp(-offsets ** 2 / (2 * BANDWIDTH_KM ** 2))
+
+
+def _convolve(grid, kernel, axis):
+    """가중치 격자를 한 축으로 1차원 커널과 합성곱 (유효 영역만 반환)"""
+    size = grid.shape[axis] - 2 * KERNEL_CELLS
+    result = np.zeros(grid.shape[:axis] + (size,) + grid.shape[axis + 1:])
+    for k, value in enumerate(kernel):
+        result += value * np.take(grid, np.arange(k, k + size), axis=axis)
+    return result
+
+
+def tile_density(cursor, tile_row, tile_col):
+    """타일의 셀별 커널 밀도 (기준일 가중치 기준, km² 당)
+
+    타일 주변 KERNEL_CELLS 만큼의 가중치를 밀집 배열로 읽어 분리 가능한
+    가우시안 커널을 행/열 방향으로 한 번씩 적용한다.
+    """
+    row0 = tile_row * TILE_CELLS - KERNEL_CELLS
+    col0 = tile_col * TILE_CELLS - KERNEL_CELLS
+    size = TILE_CELLS + 2 * KERNEL_CELLS
+    cursor.execute('''
+        SELECT row, col, weight FROM incident_cells
+        WHERE row BETWEEN ? AND ? AND col BETWEEN ? AND ? AND weight > 0
+    ''', (row0, row0 + size - 1, col0, col0 + size - 1))
+    cells = np.array(cursor.fetchall(), dtype=np.float64).reshape(-1, 3)
+    grid = np.zeros((size, size))
+    grid[cells[:, 0].astype(np.int64) - row0, cells[:, 1].astype(np.int64) - col0] = cells[:, 2]
+
+    kernel = _gaussian_kernel()
+    density = _convolve(_convolve(grid, kernel, 0), kernel, 1)
+    return density / (2 * math.pi * BANDWIDTH_KM ** 2)
+
+
+def update_densities(cursor, tiles):
+    """타일별 밀도 재계산 후 저장 (밀도가 0 이 된 빈 셀은 삭제)"""
+    for tile_row, tile_col in tiles:
+        density = tile_density(cursor, tile_row, tile_col)
+        row0, col0 = tile_row * TILE_CELLS, tile_col * TILE_CELLS
+        bounds = (row0, row0 + TILE_CELLS - 1, col0, col0 + TILE_CELLS - 1)
+        cursor.execute('''
+            UPDATE incident_cells SET density = 0, dirty = 0
+            WHERE row BETWEEN ? AND ? AND col BETWEEN ? AND ?
+        ''', bounds)
+        rows, cols = np.nonzero(density > 0)
+        cursor.executemany(UPSERT_CELL_DENSITY, zip(
+            (rows + row0).tolist(), (cols + col0).tolist(), density[rows, cols].tolist()
+        ))
+        cursor.execute('''
+            DELETE FROM incident_cells
+            WHERE row BETWEEN ? AND ? AND col BETWEEN ? AND ?
+              AND weight = 0 AND density = 0 AND zone_id IS NULL
+        ''', bounds)
+
+
+class HotCells:
+    """밀도가 임계값 이상인 셀을 타일 단위로 읽어 두는 캐시"""
+
+    def __init__(self, cursor, min_density):
+        self.cursor = cursor
+        self.min_density = min_density
+        self.tiles = {}
+
+    def tile(self, tile_row, tile_col):
+        cells = self.tiles.get((tile_row, tile_col))
+        if cells is None:
+            row0, col0 = tile_row * TILE_CELLS, tile_col * TILE_CELLS
+            self.cursor.execute('''
+                SELECT row, col, density, incident_count, zone_id FROM incident_cells
+                WHERE row BETWEEN ? AND ? AND col BETWEEN ? AND ? AND density >= ?
+            ''', (row0, row0 + TILE_CELLS - 1, col0, col0 + TILE_CELLS - 1, self.min_density))
+            cells = {(row[0], row[1]): row[2:] for row in self.cursor.fetchall()}
+            self.tiles[(tile_row, tile_col)] = cells
+        return cells
+
+    def get(self, cell):
+        return self.tile(cell[0] // TILE_CELLS, cell[1] // TILE_CELLS).get(cell)
+
+    def cluster(self, seed, seen):
+        """seed 와 8방향으로 이어진 고밀도 셀 묶음 {셀: (밀도, 사건 수, 기존 핫존)}"""
+        cells = {}
+        queue = deque([seed])
+        seen.add(seed)
+        while queue:
+            cell = queue.popleft()
+            cells[cell] = self.get(cell)
+            for dr in (-1, 0, 1):
+                for dc in (-1, 0, 1):
+                    neighbor = (cell[0] + dr, cell[1] + dc)
+                    if neighbor not in seen and self.get(neighbor) is not None:
+                        seen.add(neighbor)
+                        queue.append(neighbor)
+        return cells
+
+
+def describe_cluster(cells, decay, threshold):
+    """셀 묶음 -> 중심, 반경, 위험도, 사건 수"""
+    keys = np.array(list(cells), dtype=np.int64)
+    values = np.array([value[:2] for value in cells.values()], dtype=np.float64)
+    densities = values[:, 0] * decay
+    x = (keys[:, 1] + 0.5) * CELL_SIZE_KM
+    y = (keys[:, 0] + 0.5) * CELL_SIZE_KM
+    cx = float(np.average(x, weights=densities))
+    cy = float(np.average(y, weights=densities))
+    half_diagonal = CELL_SIZE_KM * math.sqrt(2) / 2
+    radius = max(float(np.hypot(x - cx, y - cy).max()) + half_diagonal, MIN_RADIUS_KM)
+    peak = float(densities.max())
+    risk_level = sum(1 for multiplier in RISK_MULTIPLIERS if peak >= threshold * multiplier)
+    return {
+        'latitude': cy / KM_PER_DEG_LAT,
+        'longitude': cx / KM_PER_DEG_LNG,
+        'radius': round(radius, 3),
+        'risk_level': max(risk_level, 1),
+        'incident_count': int(values[:, 1].sum()),
+        'peak_density': peak
+    }
+
+
+def extract_hotzones(cursor, tiles, as_of, threshold):
+    """재계산한 타일에 걸친 고밀도 셀 묶음을 찾아 파생 핫존으로 반영
+
+    묶음마다 기존 파생 핫존 중 셀이 가장 많이 겹치는 것을 갱신하고, 어떤 묶음도
+    이어받지 않은 기존 파생 핫존은 삭제한다. 같은 트랜잭션에서 파생 핫존의 사건을
+    떼어낸 뒤 묶음 셀 안의 핫존 미배정 사건을 다시 배정하고 핫존별 집계를 다시 계산한다.
+    손으로 등록한 핫존과 그 사건은 건드리지 않는다.
+    """
+    decay = decay_factor(as_of)
+    hot = HotCells(cursor, threshold / decay)
+
+    # 재계산 범위에 셀이 있던 기존 파생 핫존, 고밀도 셀 시작점
+    previous = set()
+    seeds = []
+    for tile_row, tile_col in tiles:
+        row0, col0 = tile_row * TILE_CELLS, tile_col * TILE_CELLS
+        cursor.execute('''
+            SELECT DISTINCT zone_id FROM incident_cells
+            WHERE row BETWEEN ? AND ? AND col BETWEEN ? AND ? AND zone_id IS NOT NULL
+        ''', (row0, row0 + TILE_CELLS - 1, col0, col0 + TILE_CELLS - 1))
+        previous.update(row[0] for row in cursor.fetchall())
+        seeds.extend(hot.tile(tile_row, tile_col))
+
+    # 기존 파생 핫존의 나머지 셀도 시작점으로 (재계산 범위 밖으로 이어진 묶음 유지)
+    zones = sorted(previous)
+    for start in range(0, len(zones), 500):
+        chunk = zones[start:start + 500]
+        cursor.execute(
+            f"SELECT row, col FROM incident_cells WHERE zone_id IN ({','.join('?' * len(chunk))})",
+            chunk
+        )
+        seeds.extend(cell for cell in map(tuple, cursor.fetchall()) if hot.get(cell) is not None)
+
+    seen = set()
+    clusters = []
+    for seed in seeds:
+        if seed in seen:
+            continue
+        cells = hot.cluster(seed, seen)
+        previous.update(value[2] for value in cells.values() if value[2] is not None)
+        if sum(value[1] for value in cells.values()) >= MIN_CLUSTER_INCIDENTS:
+            clusters.append(cells)
+
+    # 셀이 많은 묶음부터 기존 핫존 번호를 이어받음
+    clusters.sort(key=len, reverse=True)
+    claimed = set()
+    summary = {'created': 0, 'updated': 0, 'deleted': 0}
+    assignments = []
+    peaks = []
+    for cells in clusters:
+        zone = describe_cluster(cells, decay, threshold)
+        overlap = Counter(value[2] for value in cells.values() if value[2] is not None and value[2] not in claimed)
+        zone_id = overlap.most_common(1)[0][0] if overlap else None
+        if zone_id is not None:
+            cursor.execute('''
+                UPDATE hotzones
+                SET risk_level = ?, latitude = ?, longitude = ?, radius = ?,
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE id = ? AND derived = 1
+            ''', (zone['risk_level'], zone['latitude'], zone['longitude'], zone['radius'], zone_id))
+            if cursor.rowcount:
+                summary['updated'] += 1
+            else:
+                zone_id = None
+        if zone_id is None:
+            cursor.execute('''
+                INSERT INTO hotzones (area_name, risk_level, latitude, longitude, radius, derived)
+                VALUES (?, ?, ?, ?, ?, 1)
+            ''', (
+                f"자동 핫존 ({zone['latitude']:.4f}, {zone['longitude']:.4f})",
+                zone['risk_level'], zone['latitude'], zone['longitude'], zone['radius']
+            ))
+            zone_id = cursor.lastrowid
+            summary['created'] += 1
+        claimed.add(zone_id)
+        assignments.extend((zone_id, row, col) for row, col in cells)
+        peaks.append((f"{zone['peak_density']:.1f}", zone_id))
+
+    # 관련 파생 핫존에서 사건과 셀을 떼어내고, 이어받지 못한 파생 핫존 삭제
+    stale = sorted(previous - claimed)
+    touched_zones = sorted(previous | claimed)
+    for start in range(0, len(touched_zones), 500):
+        chunk = touched_zones[start:start + 500]
+        placeholders = ','.join('?' * len(chunk))
+        cursor.execute(f'UPDATE incidents SET hotzone_id = NULL WHERE hotzone_id IN ({placeholders})', chunk)
+        cursor.execute(f'UPDATE incident_cells SET zone_id = NULL WHERE zone_id IN ({placeholders})', chunk)
+    for start in range(0, len(stale), 500):
+        chunk = stale[start:start + 500]
+        cursor.execute(f"DELETE FROM hotzones WHERE derived = 1 AND id IN ({','.join('?' * len(chunk))})", chunk)
+        summary['deleted'] += cursor.rowcount
+
+    # 셀-핫존 연결과 셀 안 사건 배정을 새 묶음대로 다시 설정한 뒤 집계 재계산
+    cursor.executemany('UPDATE incident_cells SET zone_id = ? WHERE row = ? AND col = ?', assignments)
+    cursor.executemany(ASSIGN_CELL_INCIDENTS, assignments)
+    rebuild_zone_rollups(cursor, touched_zones)
+    cursor.executemany(UPDATE_DERIVED_DESCRIPTION, peaks)
+    return summary
+
+
+def percentile_threshold(cursor, decay):
+    """사건이 있는 셀 밀도의 HOT_PERCENTILE 백분위수 (최소 DENSITY_THRESHOLD)"""
+    cursor.execute('SELECT density FROM incident_cells WHERE weight > 0')
+    densities = np.array([row[0] for row in cursor.fetchall()], dtype=np.float64)
+    densities = densities[np.isfinite(densities)]
+    if not len(densities):
+        return DENSITY_THRESHOLD
+    return max(DENSITY_THRESHOLD, float(np.percentile(densities, HOT_PERCENTILE)) * decay)
+
+
+def derive_hotzones(db, full=False, as_of=None, threshold=None):
+    """사건 밀도로 파생 핫존 갱신
+
+    증분 모드는 새 사건이 더해진(dirty) 셀 주변 타일만 밀도를 다시 계산한다.
+    threshold 를 주면 판정 밀도를 고정하고, 없으면 HOT_PERCENTILE 규칙을 따른다.
+    최근성 감쇠는 시간이 지나면 모든 셀에 적용되어야 하므로, 전체 모드(full)를
+    주기적으로 실행해 손대지 않은 지역의 핫존도 갱신한다. 셀별 사건 번호가 없는
+    데이터베이스(처음 실행하거나 이전 버전에서 만든 경우)는 전체 모드로 실행한다.
+    """
+    started = time.perf_counter()
+    as_of = as_of or date.today()
+
+    with db.transaction() as conn:
+        cursor = conn.cursor()
+        if _get_state(cursor, 'cell_members') is None:
+            full = True
+        if full:
+            cursor.execute('UPDATE incident_cells SET weight = 0, incident_count = 0, dirty = 1')
+            cursor.execute('DELETE FROM incident_cell_members')
+            _set_state(cursor, 'last_incident_id', 0)
+            _set_state(cursor, 'cell_members', 1)
+
+    binned = bin_new_incidents(db)
+
+    with db.transaction() as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT row, col FROM incident_cells WHERE dirty = 1')
+        dirty = np.array(cursor.fetchall(), dtype=np.int64).reshape(-1, 2)
+        tiles = sorted(_tiles_around(dirty[:, 0], dirty[:, 1], KERNEL_CELLS))
+        update_densities(cursor, tiles)
+        if threshold is None:
+            if full:
+                threshold = percentile_threshold(cursor, decay_factor(as_of))
+            else:
+                threshold = float(_get_state(cursor, 'density_threshold', DENSITY_THRESHOLD))
+        summary = extract_hotzones(cursor, tiles, as_of, threshold)
+        _set_state(cursor, 'density_threshold', threshold)
+        _set_state(cursor, 'last_run_at', as_of.isoformat())
+        if full:
+            _set_state(cursor, 'last_full_run_at', as_of.isoformat())
+
+    summary.update({
+        'mode': 'full' if full else 'incremental',
+        'binned_incidents': binned,
+        'dirty_cells': len(dirty),
+        'tiles': len(tiles),
+        'density_threshold': round(threshold, 3),
+        'elapsed_ms': round((time.perf_counter() - started) * 1000, 2)
+    })
+    return summary
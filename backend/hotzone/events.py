@@ -0,0 +1,71 @@
+# 핫존 변경 기록 (트리거로 기록, 실시간 스트림의 EventFeed 가 읽어 이벤트로 발행)
+# 핫존은 API 외에 derive_hotzones.py 등 다른 프로세스에서도 바뀌므로
+# 쓰는 쪽에서 직접 발행하지 않고 기록 테이블을 프로세스마다 한 스레드가 읽는다
+HOTZONE_EVENTS_TABLE = '''
+    CREATE TABLE IF NOT EXISTS hotzone_events (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        hotzone_id INTEGER NOT NULL,
+        action TEXT NOT NULL,
+        area_name TEXT,
+        risk_level INTEGER,
+        previous_risk_level INTEGER,
+        latitude REAL,
+        longitude REAL,
+        radius REAL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+
+_RECORD_EVENT = '''
+    INSERT INTO hotzone_events (hotzone_id, action, area_name, risk_level, previous_risk_level, latitude, longitude, radius)
+    VALUES ({row}.id, '{action}', {row}.area_name, {risk}, {previous}, {row}.latitude, {row}.longitude, {row}.radius);
+'''
+
+HOTZONE_EVENT_TRIGGERS = [
+    f'''
+    CREATE TRIGGER IF NOT EXISTS hotzones_event_insert AFTER INSERT ON hotzones
+    BEGIN
+        {_RECORD_EVENT.format(row='NEW', action='created', risk='NEW.risk_level', previous='NULL')}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS hotzones_event_risk AFTER UPDATE OF risk_level ON hotzones
+    WHEN OLD.risk_level IS NOT NEW.risk_level
+    BEGIN
+        {_RECORD_EVENT.format(row='NEW', action='risk_changed', risk='NEW.risk_level', previous='OLD.risk_level')}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS hotzones_event_delete AFTER DELETE ON hotzones
+    BEGIN
+        {_RECORD_EVENT.format(row='OLD', action='deleted', risk='NULL', previous='OLD.risk_level')}
+    END
+    ''',
+]
+
+
+def init_hotzone_events(cursor):
+    """핫존 변경 기록 테이블/트리거 생성"""
+    cursor.execute(HOTZONE_EVENTS_TABLE)
+    for statement in HOTZONE_EVENT_TRIGGERS:
+        cursor.execute(statement)
+
+
+def event_payload(row):
+    """변경 기록 행 -> 이벤트 데이터"""
+    return {
+        'action': row['action'],
+        'hotzone_id': row['hotzone_id'],
+        'area_name': row['area_name'],
+        'risk_level': row['risk_level'],
+        'previous_risk_level': row['previous_risk_level'],
+        'latitude': row['latitude'],
+        'longitude': row['longitude'],
+        'radius': row['radius'],
+        'changed_at': row['created_at']
+    }
+
+
+def hotzone_event(row):
+    """변경 기록 행 -> (종류, 데이터, 카테고리, 위도, 경도)"""
+    return 'hotzone', event_payload(row), None, row['latitude'], row['longitude']
@@ -0,0 +1,239 @@
+import csv
+import io
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from common.geo import haversine_km
+from .risk import covering_pairs, load_zones
+from .summary import apply_incident_rollups
+
+# 한 트랜잭션에 넣는 사건 수
+BATCH_SIZE = 5000
+
+# 응답에 담는 최대 오류 수 (나머지는 개수만 집계)
+MAX_REPORTED_ERRORS = 100
+
+# 심각도 범위
+SEVERITY_RANGE = (1, 5)
+
+# 시간대가 포함된 일시는 한국 시간으로 변환해 저장
+KST = timezone(timedelta(hours=9))
+
+# 현재 시각 이후로 허용하는 여유 (시계 차이, 시간대 표기 오류 등)
+FUTURE_TOLERANCE = timedelta(days=1)
+
+INSERT_INCIDENT = '''
+    INSERT INTO incidents (hotzone_id, incident_type, description, incident_date, latitude, longitude, severity)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+'''
+
+
+class IncidentError(ValueError):
+    """검증에 실패한 사건 행"""
+
+
+def migrate_incidents(cursor):
+    """기존 데이터베이스의 사건 테이블/핫존 카운터 보정
+
+    - 잘못된 심각도 CHECK(severity >= 1 AND severity >= 5)로 만들어진 테이블은 1~5 범위로 재생성
+    - hotzones.incident_count 컬럼이 없으면 추가하고 기존 사건으로 채움
+    """
+    cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'incidents'")
+    row = cursor.fetchone()
+    if row is not None and 'severity >= 5' in row[0]:
+        cursor.execute('ALTER TABLE incidents RENAME TO incidents_old')
+        cursor.execute(row[0].replace('severity >= 5', 'severity <= 5'))
+        cursor.execute('INSERT INTO incidents SELECT * FROM incidents_old')
+        cursor.execute('DROP TABLE incidents_old')
+
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_incidents_hotzone ON incidents (hotzone_id, incident_date)')
+
+    cursor.execute('PRAGMA table_info(hotzones)')
+    if 'incident_count' not in {column[1] for column in cursor.fetchall()}:
+        cursor.execute('ALTER TABLE hotzones ADD COLUMN incident_count INTEGER NOT NULL DEFAULT 0')
+        cursor.execute('''
+            UPDATE hotzones SET
+                incident_count = (SELECT COUNT(*) FROM incidents WHERE hotzone_id = hotzones.id),
+                last_incident_date = COALESCE(
+                    (SELECT MAX(substr(incident_date, 1, 10)) FROM incidents WHERE hotzone_id = hotzones.id),
+                    last_incident_date
+                )
+        ''')
+
+
+def read_ndjson(stream):
+    """NDJSON 텍스트 스트림 -> (줄 번호, 레코드)"""
+    for line_no, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield line_no, record
+
+
+def read_csv(stream):
+    """헤더가 있는 CSV 텍스트 스트림 -> (줄 번호, 레코드)"""
+    reader = csv.DictReader(stream)
+    for record in reader:
+        yield reader.line_num, record
+
+
+def open_text(stream):
+    """바이너리 스트림을 UTF-8(BOM 허용) 텍스트 스트림으로"""
+    return io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+
+def _optional(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def parse_incident_date(value):
+    """날짜/일시 문자열을 'YYYY-MM-DD' 또는 'YYYY-MM-DD HH:MM:SS' 로 정규화"""
+    value = _optional(value)
+    if not isinstance(value, str):
+        raise IncidentError('incident_date 가 필요합니다.')
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise IncidentError(f'incident_date 형식이 올바르지 않습니다: {value}')
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(KST).replace(tzinfo=None)
+    # 먼 미래 날짜는 최근 사건일/최근성 가중치를 왜곡하므로 형식 오류와 같이 거부
+    if parsed > datetime.now(KST).replace(tzinfo=None) + FUTURE_TOLERANCE:
+        raise IncidentError(f'incident_date 가 미래입니다: {value}')
+    if len(value) == 10:
+        return parsed.strftime('%Y-%m-%d')
+    return parsed.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def validate_incident(record):
+    """레코드를 검증하여 incidents INSERT 값 튜플로 변환"""
+    if not isinstance(record, dict):
+        raise IncidentError('JSON 객체가 아닙니다.')
+
+    incident_type = _optional(record.get('incident_type'))
+    if not isinstance(incident_type, str):
+        raise IncidentError('incident_type 이 필요합니다.')
+
+    incident_date = parse_incident_date(record.get('incident_date'))
+
+    try:
+        latitude = _optional(record.get('latitude'))
+        longitude = _optional(record.get('longitude'))
+        latitude = None if latitude is None else float(latitude)
+        longitude = None if longitude is None else float(longitude)
+    except (TypeError, ValueError):
+        raise IncidentError('위도/경도는 숫자여야 합니다.')
+    if (latitude is None) != (longitude is None):
+        raise IncidentError('위도와 경도는 함께 입력해야 합니다.')
+    if latitude is not None and not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+        raise IncidentError('위도/경도 범위가 올바르지 않습니다.')
+
+    severity = _optional(record.get('severity'))
+    if severity is not None:
+        try:
+            severity = int(severity)
+        except (TypeError, ValueError):
+            raise IncidentError('severity 는 정수여야 합니다.')
+        if not SEVERITY_RANGE[0] <= severity <= SEVERITY_RANGE[1]:
+            raise IncidentError(f'severity 는 {SEVERITY_RANGE[0]}~{SEVERITY_RANGE[1]} 사이여야 합니다.')
+
+    hotzone_id = _optional(record.get('hotzone_id'))
+    if hotzone_id is not None:
+        try:
+            hotzone_id = int(hotzone_id)
+        except (TypeError, ValueError):
+            raise IncidentError('hotzone_id 는 정수여야 합니다.')
+
+    description = _optional(record.get('description'))
+    return (hotzone_id, incident_type, description, incident_date, latitude, longitude, severity)
+
+
+def assign_zones(cursor, rows):
+    """hotzone_id 가 없는 좌표 있는 사건을 덮는 핫존에 배정 (위험도 높은 순, 가까운 순)"""
+    targets = [i for i, row in enumerate(rows) if row[0] is None and row[4] is not None]
+    if not targets:
+        return 0
+    lats = np.array([rows[i][4] for i in targets], dtype=np.float64)
+    lngs = np.array([rows[i][5] for i in targets], dtype=np.float64)
+    zones = load_zones(cursor, lats.min(), lngs.min(), lats.max(), lngs.max())
+    point_idx, zone_idx = covering_pairs(lats, lngs, zones)
+    if not len(point_idx):
+        return 0
+
+    distances = haversine_km(lats[point_idx], lngs[point_idx], zones['lat'][zone_idx], zones['lng'][zone_idx])
+    order = np.lexsort((distances, -zones['risk'][zone_idx], point_idx))
+    point_idx, zone_idx = point_idx[order], zone_idx[order]
+    first = np.unique(point_idx, return_index=True)[1]
+    for p, zone_id in zip(point_idx[first].tolist(), zones['id'][zone_idx[first]].tolist()):
+        i = targets[p]
+        rows[i] = (zone_id,) + rows[i][1:]
+    return len(first)
+
+
+def _write_batch(db, rows, summary):
+    with db.transaction() as conn:
+        cursor = conn.cursor()
+
+        # 지정된 hotzone_id 는 존재하는 핫존만 허용
+        explicit = {row[0] for row in rows if row[0] is not None}
+        if explicit:
+            cursor.execute(
+                f"SELECT id FROM hotzones WHERE id IN ({','.join('?' * len(explicit))})",
+                list(explicit)
+            )
+            known = {row[0] for row in cursor.fetchall()}
+            if len(known) < len(explicit):
+                summary['unknown_hotzone'] += sum(1 for row in rows if row[0] is not None and row[0] not in known)
+                rows = [row if row[0] is None or row[0] in known else (None,) + row[1:] for row in rows]
+
+        summary['assigned'] += assign_zones(cursor, rows)
+        cursor.executemany(INSERT_INCIDENT, rows)
+        zones_updated = apply_incident_rollups(cursor, rows)
+
+    summary['inserted'] += len(rows)
+    summary['zones_updated'] += zones_updated
+
+
+def ingest_incidents(db, records, batch_size=BATCH_SIZE):
+    """(줄 번호, 레코드) 목록을 검증하여 batch_size 단위 트랜잭션으로 저장
+
+    각 배치는 한 번의 executemany INSERT 와 요약 테이블/핫존 카운터 갱신으로 처리되며,
+    검증에 실패한 행은 건너뛰고 오류 목록에 기록한다.
+    """
+    started = time.perf_counter()
+    summary = {
+        'received': 0, 'inserted': 0, 'rejected': 0, 'assigned': 0,
+        'zones_updated': 0, 'unknown_hotzone': 0, 'errors': []
+    }
+    batch = []
+    for line_no, record in records:
+        summary['received'] += 1
+        try:
+            batch.append(validate_incident(record))
+        except IncidentError as e:
+            summary['rejected'] += 1
+            if len(summary['errors']) < MAX_REPORTED_ERRORS:
+                summary['errors'].append({'line': line_no, 'error': str(e)})
+            continue
+        if len(batch) >= batch_size:
+            _write_batch(db, batch, summary)
+            batch = []
+    if batch:
+        _write_batch(db, batch, summary)
+
+    elapsed = time.perf_counter() - started
+    summary['elapsed_ms'] = round(elapsed * 1000, 2)
+    summary['rows_per_sec'] = round(summary['received'] / elapsed) if elapsed > 0 else None
+    return summary
@@ -0,0 +1,105 @@
+import numpy as np
+
+from common.geo import KM_PER_DEG_LAT, haversine_km
+
+# 점-핫존 조인에 사용하는 격자 셀 크기 (도)
+JOIN_CELL_DEG = 0.01
+
+# 격자로 펼칠 핫존 하나의 최대 셀 수 (넘는 넓은 핫존은 모든 점과 직접 거리 계산)
+MAX_ZONE_CELLS = 4096
+
+
+def load_zones(cursor, min_lat, min_lng, max_lat, max_lng):
+    """사각 영역과 원이 겹칠 수 있는 핫존을 R*Tree 로 조회하여 배열로 반환"""
+    cursor.execute('''
+        SELECT h.id, h.latitude, h.longitude, COALESCE(h.radius, 0) AS radius, h.risk_level
+        FROM hotzones_rtree r
+        JOIN hotzones h ON h.id = r.id
+        WHERE r.max_lat >= ? AND r.min_lat <= ?
+          AND r.max_lng >= ? AND r.min_lng <= ?
+    ''', (min_lat, max_lat, min_lng, max_lng))
+    rows = cursor.fetchall()
+    zones = np.array([tuple(row) for row in rows], dtype=np.float64).reshape(-1, 5)
+    return {
+        'id': zones[:, 0].astype(np.int64),
+        'lat': zones[:, 1],
+        'lng': zones[:, 2],
+        'radius': zones[:, 3],
+        'risk': zones[:, 4].astype(np.int64),
+    }
+
+
+def covering_pairs(lats, lngs, zones, cell_size=JOIN_CELL_DEG):
+    """각 점을 덮는 핫존 (점 번호 배열, 핫존 번호 배열)
+
+    핫존 원의 사각형이 걸치는 격자 셀마다 (셀, 핫존) 쌍을 만들고, 점의 셀로
+    정렬 조인한 뒤 후보 쌍에 대해서만 하버사인 거리를 계산한다. 셀이 MAX_ZONE_CELLS 를
+    넘는 넓은 핫존은 셀로 펼치지 않고 모든 점과의 거리를 바로 계산한다.
+    """
+    empty = np.empty(0, dtype=np.int64)
+    if len(lats) == 0 or len(zones['id']) == 0:
+        return empty, empty
+
+    # 핫존 -> 셀 쌍 생성 (핫존마다 감싸는 셀 사각형을 펼침)
+    dlat = zones['radius'] / KM_PER_DEG_LAT
+    cos_lat = np.maximum(np.cos(np.radians(np.minimum(np.abs(zones['lat']) + dlat, 89.9))), 1e-6)
+    dlng = zones['radius'] / (KM_PER_DEG_LAT * cos_lat)
+    row0 = np.floor((zones['lat'] - dlat) / cell_size).astype(np.int64)
+    row1 = np.floor((zones['lat'] + dlat) / cell_size).astype(np.int64)
+    col0 = np.floor((zones['lng'] - dlng) / cell_size).astype(np.int64)
+    col1 = np.floor((zones['lng'] + dlng) / cell_size).astype(np.int64)
+    widths = col1 - col0 + 1
+    sizes = (row1 - row0 + 1) * widths
+    wide = np.nonzero(sizes > MAX_ZONE_CELLS)[0]
+    wide_points, wide_zones = _direct_pairs(lats, lngs, zones, wide)
+    sizes[wide] = 0
+    pair_zones = np.repeat(np.arange(len(sizes)), sizes)
+    within = np.arange(int(sizes.sum())) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    pair_keys = _cell_key(row0[pair_zones] + within // widths[pair_zones], col0[pair_zones] + within % widths[pair_zones])
+    order = np.argsort(pair_keys, kind='stable')
+    pair_keys = pair_keys[order]
+    pair_zones = pair_zones[order]
+
+    # 점 -> 셀, 셀별 후보 구간
+    point_keys = _cell_key(np.floor(lats / cell_size).astype(np.int64), np.floor(lngs / cell_size).astype(np.int64))
+    starts = np.searchsorted(pair_keys, point_keys, side='left')
+    ends = np.searchsorted(pair_keys, point_keys, side='right')
+    counts = ends - starts
+    total = int(counts.sum())
+    if total == 0:
+        return wide_points, wide_zones
+
+    # 구간들을 펼쳐 (점, 핫존) 후보 쌍 생성
+    point_idx = np.repeat(np.arange(len(lats)), counts)
+    offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    zone_idx = pair_zones[np.repeat(starts, counts) + offsets]
+
+    distances = haversine_km(lats[point_idx], lngs[point_idx], zones['lat'][zone_idx], zones['lng'][zone_idx])
+    inside = distances <= zones['radius'][zone_idx]
+    return np.concatenate((point_idx[inside], wide_points)), np.concatenate((zone_idx[inside], wide_zones))
+
+
+def _direct_pairs(lats, lngs, zones, zone_idx):
+    """지정한 핫존들과 모든 점의 하버사인 거리로 (점 번호 배열, 핫존 번호 배열)"""
+    point_idx = np.tile(np.arange(len(lats)), len(zone_idx))
+    zone_idx = np.repeat(zone_idx, len(lats))
+    distances = haversine_km(lats[point_idx], lngs[point_idx], zones['lat'][zone_idx], zones['lng'][zone_idx])
+    inside = distances <= zones['radius'][zone_idx]
+    return point_idx[inside], zone_idx[inside]
+
+
+def score_points(lats, lngs, zones):
+    """점마다 덮는 핫존의 최대 위험도, 위험도 합, 개수"""
+    point_idx, zone_idx = covering_pairs(lats, lngs, zones)
+    n = len(lats)
+    risks = zones['risk'][zone_idx]
+    max_risk = np.zeros(n, dtype=np.int64)
+    np.maximum.at(max_risk, point_idx, risks)
+    risk_sum = np.bincount(point_idx, weights=risks, minlength=n).astype(np.int64)
+    zone_count = np.bincount(point_idx, minlength=n)
+    return max_risk, risk_sum, zone_count, (point_idx, zone_idx)
+
+
+def _cell_key(rows, cols):
+    # 위경도 격자 (행, 열)을 하나의 정수 키로 (|열| <= 18000 이므로 충돌 없음)
+    return rows.astype(np.int64) * 100000 + cols.astype(np.int64)
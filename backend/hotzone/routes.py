@@ -1,20 +1,50 @@
 from flask import Blueprint, jsonify, request
-import json
 import os
-from datetime import datetime
-import sqlite3
+from datetime import date, datetime, timedelta
+import time
+
+import numpy as np
+
+from common.cache import response_cache
+from common.db import Database
+from common.events import event_hub
+from .derive import init_derive_schema
+from .events import init_hotzone_events
+from .ingest import ingest_incidents, migrate_incidents, open_text, read_csv, read_ndjson
+from .risk import load_zones, score_points
+from .spatial import find_zones_near, init_rtree
+from .summary import init_summary_schema
 
 hotzone_bp = Blueprint('hotzone', __name__)
 
 # 데이터베이스 파일 경로
 DB_FILE = os.path.join(os.path.dirname(__file__), '../../database/hotzone.db')
+db = Database(DB_FILE)
+
+# /risk 한 번에 계산할 수 있는 최대 지점 수
+MAX_RISK_POINTS = 50000
+
+# 핫존 최대 반경 (km) - 도시 안의 지역 단위 핫존을 전제로 함
+MAX_RADIUS_KM = 50
+
+# 핫존 상세의 사건 페이지 크기
+DEFAULT_INCIDENTS_PER_PAGE = 20
+MAX_INCIDENTS_PER_PAGE = 100
+
+# /stats 일별 통계 기본/최대 기간 (일)
+DEFAULT_STATS_DAYS = 30
+MAX_STATS_DAYS = 366
+
+# /<id>/timeseries 기본/최대 기간 (일)
+DEFAULT_TIMESERIES_DAYS = 30
+MAX_TIMESERIES_DAYS = 731
 
 def init_database():
     """핫존 데이터베이스 초기화"""
     try:
         os.makedirs(os.path.dirname(DB_FILE), exist_ok=True)
         
-        conn = sqlite3.connect(DB_FILE)
+        conn = get_db_connection()
         cursor = conn.cursor()
         
         # 핫존 영역 테이블
@@ -29,6 +59,7 @@ def init_database():
                 radius REAL DEFAULT 0.5,
                 crime_type TEXT,
                 last_incident_date DATE,
+                incident_count INTEGER NOT NULL DEFAULT 0,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
@@ -44,14 +75,28 @@ def init_database():
                 incident_date DATE NOT NULL,
                 latitude REAL,
                 longitude REAL,
-                severity INTEGER CHECK (severity >= 1 AND severity >= 5),
+                severity INTEGER CHECK (severity >= 1 AND severity <= 5),
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 FOREIGN KEY (hotzone_id) REFERENCES hotzones (id)
             )
         ''')
         
+        # 기존 데이터베이스 보정 (사건 심각도 CHECK, 핫존 사건 카운터)
+        migrate_incidents(cursor)
+        
+        # 사건 밀도 격자 / 파생 핫존 상태 테이블
+        init_derive_schema(cursor)
+        
+        # 통계 요약 테이블 (위험도별 핫존 수, 유형/핫존/일/시간대별 사건 수)
+        init_summary_schema(cursor)
+        
+        # 핫존 공간 인덱스 (R*Tree, 트리거로 hotzones 와 동기화)
+        init_rtree(cursor)
+        
+        # 핫존 변경 기록 (실시간 스트림용, 트리거로 기록)
+        init_hotzone_events(cursor)
+        
         conn.commit()
-        conn.close()
         
         print("✅ 핫존 데이터베이스 초기화 완료")
         
@@ -64,13 +109,12 @@ def init_database():
 def add_sample_data():
     """샘플 핫존 데이터 추가"""
     try:
-        conn = sqlite3.connect(DB_FILE)
+        conn = get_db_connection()
         cursor = conn.cursor()
         
         # 기존 데이터 확인
         cursor.execute('SELECT COUNT(*) FROM hotzones')
         if cursor.fetchone()[0] > 0:
-            conn.close()
             return
         
         # 서울시 주요 지역 샘플 데이터
@@ -88,7 +132,6 @@ def add_sample_data():
         ''', sample_hotzones)
         
         conn.commit()
-        conn.close()
         
         print("✅ 샘플 핫존 데이터 추가 완료")
         
@@ -96,12 +139,30 @@ def add_sample_data():
         print(f"❌ 샘플 데이터 추가 실패: {e}")
 
 def get_db_connection():
-    """데이터베이스 연결"""
-    conn = sqlite3.connect(DB_FILE)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """데이터베이스 연결 (스레드별 연결 재사용)"""
+    return db.connection()
+
+def parse_points(points):
+    """[[lat, lng], ...] 또는 [{'lat':, 'lng':}, ...] 를 (N, 2) 배열로 변환"""
+    if isinstance(points[0], dict):
+        points = [(point['lat'], point['lng']) for point in points]
+    coords = np.asarray(points, dtype=np.float64)
+    if coords.ndim != 2 or coords.shape[1] != 2 or not np.isfinite(coords).all():
+        raise ValueError('invalid points')
+    return coords
+
+def parse_incident_cursor(value):
+    """'incident_date,id' 형식의 커서를 (incident_date, id) 로 변환"""
+    incident_date, row_id = value.rsplit(',', 1)
+    return incident_date, int(row_id)
+
+@hotzone_bp.teardown_request
+def release_db_connection(exc):
+    """요청 종료 시 남은 트랜잭션 정리 (연결은 닫지 않고 재사용)"""
+    db.release()
 
 @hotzone_bp.route('/', methods=['GET'])
+@response_cache.cached('hotzones')
 def get_hotzones():
     """모든 핫존 영역 조회"""
     try:
@@ -116,7 +177,6 @@ def get_hotzones():
             cursor.execute('SELECT * FROM hotzones ORDER BY risk_level DESC')
         
         hotzones = cursor.fetchall()
-        conn.close()
         
         # 딕셔너리로 변환
         hotzones_list = []
@@ -131,6 +191,7 @@ def get_hotzones():
                 'radius': zone['radius'],
                 'crime_type': zone['crime_type'],
                 'last_incident_date': zone['last_incident_date'],
+                'incident_count': zone['incident_count'],
                 'created_at': zone['created_at']
             })
         
@@ -163,39 +224,26 @@ def get_nearby_hotzones():
         conn = get_db_connection()
         cursor = conn.cursor()
         
-        cursor.execute('SELECT * FROM hotzones')
-        all_hotzones = cursor.fetchall()
-        conn.close()
-        
+        # R*Tree 로 후보를 좁힌 뒤 하버사인 거리로 판정 (핫존 반경까지 고려)
         nearby_hotzones = []
+        for zone, distance in find_zones_near(cursor, lat, lng, radius):
+            zone_radius = zone['radius'] or 0
+            nearby_hotzones.append({
+                'id': zone['id'],
+                'area_name': zone['area_name'],
+                'description': zone['description'],
+                'risk_level': zone['risk_level'],
+                'latitude': zone['latitude'],
+                'longitude': zone['longitude'],
+                'radius': zone['radius'],
+                'crime_type': zone['crime_type'],
+                'distance_km': round(distance, 2),
+                'edge_distance_km': round(max(0.0, distance - zone_radius), 2),
+                'inside': distance <= zone_radius
+            })
         
-        for zone in all_hotzones:
-            try:
-                zone_lat = float(zone['latitude'])
-                zone_lng = float(zone['longitude'])
-                
-                # 거리 계산 (간단한 유클리드 거리)
-                distance = ((lat - zone_lat) ** 2 + (lng - zone_lng) ** 2) ** 0.5
-                
-                if distance <= radius / 111:  # 대략적인 km 변환
-                    zone_dict = {
-                        'id': zone['id'],
-                        'area_name': zone['area_name'],
-                        'description': zone['description'],
-                        'risk_level': zone['risk_level'],
-                        'latitude': zone_lat,
-                        'longitude': zone_lng,
-                        'radius': zone['radius'],
-                        'crime_type': zone['crime_type'],
-                        'distance_km': round(distance * 111, 2)
-                    }
-                    nearby_hotzones.append(zone_dict)
-                    
-            except (ValueError, TypeError):
-                continue
-        
-        # 위험도 순으로 정렬
-        nearby_hotzones.sort(key=lambda x: x['risk_level'], reverse=True)
+        # 위험도 순, 같은 위험도는 가까운 순으로 정렬
+        nearby_hotzones.sort(key=lambda x: (-x['risk_level'], x['edge_distance_km']))
         
         return jsonify({
             'success': True,
@@ -211,6 +259,74 @@ def get_nearby_hotzones():
             'error': str(e)
         }), 500
 
+@hotzone_bp.route('/risk', methods=['POST'])
+def score_risk():
+    """여러 지점의 핫존 위험도 일괄 계산"""
+    try:
+        started = time.perf_counter()
+        data = request.get_json()
+        points = data.get('points') if isinstance(data, dict) else None
+        
+        if not points or not isinstance(points, list):
+            return jsonify({
+                'success': False,
+                'error': '지점 목록(points)이 필요합니다.'
+            }), 400
+        
+        if len(points) > MAX_RISK_POINTS:
+            return jsonify({
+                'success': False,
+                'error': f'한 번에 최대 {MAX_RISK_POINTS}개 지점까지 계산할 수 있습니다.'
+            }), 400
+        
+        try:
+            coords = parse_points(points)
+        except (KeyError, TypeError, ValueError):
+            return jsonify({
+                'success': False,
+                'error': '지점은 [위도, 경도] 또는 {"lat": 위도, "lng": 경도} 형식이어야 합니다.'
+            }), 400
+        
+        lats, lngs = coords[:, 0], coords[:, 1]
+        include_zones = bool(data.get('include_zones'))
+        
+        # 지점 전체를 덮는 사각형으로 후보 핫존만 가져와 점 × 핫존 격자 조인
+        conn = get_db_connection()
+        zones = load_zones(conn.cursor(), lats.min(), lngs.min(), lats.max(), lngs.max())
+        max_risk, risk_sum, zone_count, (point_idx, zone_idx) = score_points(lats, lngs, zones)
+        
+        zone_ids = None
+        if include_zones:
+            zone_ids = [[] for _ in range(len(points))]
+            for p, z in zip(point_idx.tolist(), zones['id'][zone_idx].tolist()):
+                zone_ids[p].append(z)
+        
+        results = []
+        for i, (max_level, total, count) in enumerate(zip(max_risk.tolist(), risk_sum.tolist(), zone_count.tolist())):
+            result = {
+                'max_risk_level': max_level,
+                'risk_sum': total,
+                'zone_count': count
+            }
+            if zone_ids is not None:
+                result['zone_ids'] = zone_ids[i]
+            results.append(result)
+        
+        elapsed = time.perf_counter() - started
+        return jsonify({
+            'success': True,
+            'count': len(results),
+            'candidate_zones': len(zones['id']),
+            'elapsed_ms': round(elapsed * 1000, 2),
+            'data': results
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @hotzone_bp.route('/', methods=['POST'])
 def create_hotzone():
     """새 핫존 영역 추가"""
@@ -223,6 +339,16 @@ def create_hotzone():
                 'error': '지역명과 위험도가 필요합니다.'
             }), 400
         
+        try:
+            radius = float(data.get('radius', 0.5))
+        except (TypeError, ValueError):
+            radius = None
+        if radius is None or not 0 < radius <= MAX_RADIUS_KM:
+            return jsonify({
+                'success': False,
+                'error': f'radius 는 0 초과 {MAX_RADIUS_KM} 이하(km)여야 합니다.'
+            }), 400
+        
         conn = get_db_connection()
         cursor = conn.cursor()
         
@@ -235,13 +361,16 @@ def create_hotzone():
             data['risk_level'],
             data.get('latitude'),
             data.get('longitude'),
-            data.get('radius', 0.5),
+            radius,
             data.get('crime_type')
         ))
         
         hotzone_id = cursor.lastrowid
         conn.commit()
-        conn.close()
+        response_cache.invalidate('hotzones')
+        
+        # 실시간 스트림 기록은 트리거가 남김 - 이 워커의 스트림이 바로 읽도록 깨움
+        event_hub.notify()
         
         return jsonify({
             'success': True,
@@ -255,6 +384,40 @@ def create_hotzone():
             'error': str(e)
         }), 500
 
+@hotzone_bp.route('/incidents/import', methods=['POST'])
+def import_incidents():
+    """사건 데이터 일괄 등록 (NDJSON 또는 CSV 본문)"""
+    try:
+        data_format = request.args.get('format')
+        if data_format is None:
+            data_format = 'csv' if 'csv' in (request.mimetype or '') else 'ndjson'
+        
+        if data_format not in ('ndjson', 'csv'):
+            return jsonify({
+                'success': False,
+                'error': 'format 은 ndjson 또는 csv 여야 합니다.'
+            }), 400
+        
+        # 본문 전체를 메모리에 올리지 않고 스트림에서 한 줄씩 읽어 배치 단위로 저장
+        stream = open_text(request.stream)
+        records = read_csv(stream) if data_format == 'csv' else read_ndjson(stream)
+        summary = ingest_incidents(db, records)
+        # 배정된 핫존의 incident_count/last_incident_date 가 바뀜
+        if summary['inserted']:
+            response_cache.invalidate('hotzones')
+        
+        return jsonify({
+            'success': True,
+            'message': f"{summary['inserted']}건의 사건이 등록되었습니다.",
+            **summary
+        }), 201 if summary['inserted'] else 200
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @hotzone_bp.route('/<int:hotzone_id>', methods=['GET'])
 def get_hotzone(hotzone_id):
     """특정 핫존 영역 조회"""
@@ -267,17 +430,48 @@ def get_hotzone(hotzone_id):
         hotzone = cursor.fetchone()
         
         if not hotzone:
-            conn.close()
             return jsonify({
                 'success': False,
                 'error': '핫존 영역을 찾을 수 없습니다.'
             }), 404
         
-        # 관련 사건 조회
-        cursor.execute('SELECT * FROM incidents WHERE hotzone_id = ? ORDER BY incident_date DESC', (hotzone_id,))
+        # 관련 사건 조회 (커서 (incident_date, id) 이전 사건)
+        # (hotzone_id, incident_date) 인덱스를 역순으로 읽으므로 뒤 페이지도 앞 사건을 건너뛰지 않음
+        per_page = min(max(request.args.get('per_page', DEFAULT_INCIDENTS_PER_PAGE, type=int), 1), MAX_INCIDENTS_PER_PAGE)
+        after = request.args.get('after')
+        
+        try:
+            after = parse_incident_cursor(after) if after else None
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': 'after 는 "incident_date,id" 형식이어야 합니다.'
+            }), 400
+        
+        conditions = ['hotzone_id = ?']
+        params = [hotzone_id]
+        if after is not None:
+            conditions.append('(incident_date, id) < (?, ?)')
+            params.extend(after)
+        cursor.execute(f'''
+            SELECT * FROM incidents
+            WHERE {' AND '.join(conditions)}
+            ORDER BY incident_date DESC, id DESC
+            LIMIT ?
+        ''', params + [per_page + 1])
         incidents = cursor.fetchall()
+        has_more = len(incidents) > per_page
+        incidents = incidents[:per_page]
+        next_cursor = f"{incidents[-1]['incident_date']},{incidents[-1]['id']}" if has_more else None
         
-        conn.close()
+        # 유형별 사건 수 (요약 테이블)
+        cursor.execute('''
+            SELECT incident_type, incident_count FROM zone_incident_counts
+            WHERE hotzone_id = ? AND incident_count > 0
+            ORDER BY incident_count DESC
+        ''', (hotzone_id,))
+        incident_type_stats = dict(cursor.fetchall())
+        total_count = hotzone['incident_count']
         
         # 사건 딕셔너리로 변환
         incidents_list = []
@@ -304,8 +498,16 @@ def get_hotzone(hotzone_id):
                 'radius': hotzone['radius'],
                 'crime_type': hotzone['crime_type'],
                 'last_incident_date': hotzone['last_incident_date'],
+                'incident_count': hotzone['incident_count'],
                 'created_at': hotzone['created_at'],
-                'incidents': incidents_list
+                'incident_type_stats': incident_type_stats,
+                'incidents': incidents_list,
+                'incident_pagination': {
+                    'per_page': per_page,
+                    'total_count': total_count,
+                    'has_more': has_more,
+                    'next_cursor': next_cursor
+                }
             }
         })
         
@@ -315,6 +517,104 @@ def get_hotzone(hotzone_id):
             'error': str(e)
         }), 500
 
+@hotzone_bp.route('/<int:hotzone_id>/timeseries', methods=['GET'])
+def get_hotzone_timeseries(hotzone_id):
+    """핫존 사건 시계열 (일/시각 단위, 시간대별, 요일별)"""
+    try:
+        granularity = request.args.get('granularity', 'day')
+        incident_type = request.args.get('incident_type')
+        days = request.args.get('days', DEFAULT_TIMESERIES_DAYS, type=int)
+        
+        if granularity not in ('day', 'hour'):
+            return jsonify({
+                'success': False,
+                'error': 'granularity 는 day 또는 hour 여야 합니다.'
+            }), 400
+        
+        # 기간: start~end (포함), 없으면 오늘까지 최근 days 일
+        try:
+            end = date.fromisoformat(request.args['end']) if request.args.get('end') else date.today()
+            start = date.fromisoformat(request.args['start']) if request.args.get('start') else end - timedelta(days=days - 1)
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': '날짜는 YYYY-MM-DD 형식이어야 합니다.'
+            }), 400
+        
+        if start > end or (end - start).days + 1 > MAX_TIMESERIES_DAYS:
+            return jsonify({
+                'success': False,
+                'error': f'기간은 1~{MAX_TIMESERIES_DAYS}일이어야 합니다.'
+            }), 400
+        
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        
+        cursor.execute('SELECT id FROM hotzones WHERE id = ?', (hotzone_id,))
+        if not cursor.fetchone():
+            return jsonify({
+                'success': False,
+                'error': '핫존 영역을 찾을 수 없습니다.'
+            }), 404
+        
+        # 롤업 테이블에서 기간 안의 버킷만 읽음 (사건 수가 아닌 버킷 수에 비례)
+        type_filter = ' AND incident_type = ?' if incident_type else ''
+        type_args = (incident_type,) if incident_type else ()
+        end_next = (end + timedelta(days=1)).isoformat()
+        
+        cursor.execute(f'''
+            SELECT day, incident_type, incident_count FROM zone_incident_daily
+            WHERE hotzone_id = ? AND day >= ? AND day < ?{type_filter}
+        ''', (hotzone_id, start.isoformat(), end_next) + type_args)
+        daily = cursor.fetchall()
+        
+        cursor.execute(f'''
+            SELECT bucket, incident_type, incident_count FROM zone_incident_hourly
+            WHERE hotzone_id = ? AND bucket >= ? AND bucket < ?{type_filter}
+        ''', (hotzone_id, start.isoformat(), end_next) + type_args)
+        hourly = cursor.fetchall()
+        
+        series = {}
+        type_stats = {}
+        for day, row_type, count in daily:
+            type_stats[row_type] = type_stats.get(row_type, 0) + count
+            if granularity == 'day':
+                series[day] = series.get(day, 0) + count
+        
+        # 시간대(0~23) / 요일(0=월요일) / 요일 × 시간대 (시각이 있는 사건만)
+        hour_of_day = [0] * 24
+        weekday = [0] * 7
+        weekday_hour = [[0] * 24 for _ in range(7)]
+        for bucket, row_type, count in hourly:
+            hour = int(bucket[11:13])
+            day_of_week = date.fromisoformat(bucket[:10]).weekday()
+            hour_of_day[hour] += count
+            weekday[day_of_week] += count
+            weekday_hour[day_of_week][hour] += count
+            if granularity == 'hour':
+                series[bucket] = series.get(bucket, 0) + count
+        
+        return jsonify({
+            'success': True,
+            'hotzone_id': hotzone_id,
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'granularity': granularity,
+            'incident_type': incident_type,
+            'total_count': sum(type_stats.values()),
+            'incident_type_stats': type_stats,
+            'series': dict(sorted(series.items())),
+            'hour_of_day': hour_of_day,
+            'weekday': weekday,
+            'weekday_hour': weekday_hour
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @hotzone_bp.route('/stats', methods=['GET'])
 def get_hotzone_stats():
     """핫존 통계 정보"""
@@ -322,25 +622,51 @@ def get_hotzone_stats():
         conn = get_db_connection()
         cursor = conn.cursor()
         
+        days = min(max(request.args.get('days', DEFAULT_STATS_DAYS, type=int), 1), MAX_STATS_DAYS)
+        
+        # 모두 요약 테이블에서 조회 (사건 수와 무관하게 일정한 비용)
         # 위험도별 통계
-        cursor.execute('SELECT risk_level, COUNT(*) FROM hotzones GROUP BY risk_level ORDER BY risk_level DESC')
+        cursor.execute('''
+            SELECT risk_level, zone_count FROM hotzone_risk_counts
+            WHERE zone_count > 0
+            ORDER BY risk_level DESC
+        ''')
         risk_stats = dict(cursor.fetchall())
         
         # 전체 핫존 수
-        cursor.execute('SELECT COUNT(*) FROM hotzones')
-        total_hotzones = cursor.fetchone()[0]
+        total_hotzones = sum(risk_stats.values())
         
-        # 전체 사건 수
-        cursor.execute('SELECT COUNT(*) FROM incidents')
-        total_incidents = cursor.fetchone()[0]
+        # 유형별 / 전체 사건 수
+        cursor.execute('''
+            SELECT incident_type, incident_count FROM incident_type_counts
+            WHERE incident_count > 0
+            ORDER BY incident_count DESC
+        ''')
+        incident_type_stats = dict(cursor.fetchall())
+        total_incidents = sum(incident_type_stats.values())
+        
+        # 시간대별 사건 수 (시각이 있는 사건만)
+        cursor.execute('SELECT hour, incident_count FROM incident_hourly_counts WHERE incident_count > 0 ORDER BY hour')
+        hourly_stats = dict(cursor.fetchall())
         
-        conn.close()
+        # 최근 days 일간 일별 사건 수
+        since = (datetime.now() - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+        cursor.execute('''
+            SELECT day, incident_count FROM incident_daily_counts
+            WHERE day >= ? AND incident_count > 0
+            ORDER BY day
+        ''', (since,))
+        daily_stats = dict(cursor.fetchall())
         
         return jsonify({
             'success': True,
             'total_hotzones': total_hotzones,
             'total_incidents': total_incidents,
-            'risk_level_stats': risk_stats
+            'risk_level_stats': risk_stats,
+            'incident_type_stats': incident_type_stats,
+            'hourly_stats': hourly_stats,
+            'daily_stats': daily_stats,
+            'daily_stats_days': days
         })
         
     except Exception as e:
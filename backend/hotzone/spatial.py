@@ -0,0 +1,80 @@
+import numpy as np
+
+from common.geo import KM_PER_DEG_LAT, degree_span, haversine_km
+
+# 핫존 원(중심 ± 반경)을 감싸는 사각형을 R*Tree 로 관리
+# 경도 폭은 위도에 따라 1/cos(lat) 만큼 넓어짐
+_BBOX_VALUES = f'''
+    {{row}}.id,
+    {{row}}.latitude - COALESCE({{row}}.radius, 0) / {KM_PER_DEG_LAT!r},
+    {{row}}.latitude + COALESCE({{row}}.radius, 0) / {KM_PER_DEG_LAT!r},
+    {{row}}.longitude - COALESCE({{row}}.radius, 0) / ({KM_PER_DEG_LAT!r} * cos(radians({{row}}.latitude))),
+    {{row}}.longitude + COALESCE({{row}}.radius, 0) / ({KM_PER_DEG_LAT!r} * cos(radians({{row}}.latitude)))
+'''
+
+RTREE_SCHEMA = [
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS hotzones_rtree
+    USING rtree(id, min_lat, max_lat, min_lng, max_lng)
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS hotzones_rtree_insert AFTER INSERT ON hotzones
+    WHEN NEW.latitude IS NOT NULL AND NEW.longitude IS NOT NULL
+    BEGIN
+        INSERT OR REPLACE INTO hotzones_rtree VALUES ({_BBOX_VALUES.format(row='NEW')});
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS hotzones_rtree_update AFTER UPDATE OF latitude, longitude, radius ON hotzones
+    BEGIN
+        DELETE FROM hotzones_rtree WHERE id = OLD.id;
+        INSERT INTO hotzones_rtree
+        SELECT {_BBOX_VALUES.format(row='NEW')}
+        WHERE NEW.latitude IS NOT NULL AND NEW.longitude IS NOT NULL;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS hotzones_rtree_delete AFTER DELETE ON hotzones
+    BEGIN
+        DELETE FROM hotzones_rtree WHERE id = OLD.id;
+    END
+    ''',
+]
+
+
+def init_rtree(cursor):
+    """R*Tree 테이블/트리거 생성 및 누락된 핫존 채우기"""
+    for statement in RTREE_SCHEMA:
+        cursor.execute(statement)
+    cursor.execute(f'''
+        INSERT INTO hotzones_rtree
+        SELECT {_BBOX_VALUES.format(row='h')}
+        FROM hotzones h
+        WHERE h.latitude IS NOT NULL AND h.longitude IS NOT NULL
+          AND h.id NOT IN (SELECT id FROM hotzones_rtree)
+    ''')
+
+
+def find_zones_near(cursor, lat, lng, radius_km):
+    """원이 (lat, lng) 반경 radius_km 안에 들어오거나 겹치는 핫존 조회
+
+    R*Tree 로 사각형이 겹치는 후보만 가져온 뒤, 중심 거리 - 핫존 반경 <= radius_km
+    인지 하버사인 거리로 판정한다. (핫존 행, 중심 거리 km) 목록을 반환.
+    """
+    dlat, dlng = degree_span(lat, radius_km)
+    cursor.execute('''
+        SELECT h.* FROM hotzones_rtree r
+        JOIN hotzones h ON h.id = r.id
+        WHERE r.max_lat >= ? AND r.min_lat <= ?
+          AND r.max_lng >= ? AND r.min_lng <= ?
+    ''', (lat - dlat, lat + dlat, lng - dlng, lng + dlng))
+    zones = cursor.fetchall()
+    if not zones:
+        return []
+
+    zone_lats = np.array([zone['latitude'] for zone in zones], dtype=np.float64)
+    zone_lngs = np.array([zone['longitude'] for zone in zones], dtype=np.float64)
+    zone_radii = np.array([zone['radius'] or 0 for zone in zones], dtype=np.float64)
+    distances = haversine_km(lat, lng, zone_lats, zone_lngs)
+    keep = distances - zone_radii <= radius_km
+    return [(zone, float(distance)) for zone, distance, ok in zip(zones, distances, keep) if ok]
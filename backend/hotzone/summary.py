@@ -0,0 +1,271 @@
+from collections import Counter
+
+# 요약 테이블
+# - 핫존 쪽(위험도별 개수)은 핫존을 쓰는 곳이 여러 군데라 트리거로 유지
+# - 사건 쪽(유형별, 핫존×유형별, 일별, 시간대별, 핫존×유형의 일/시각 단위 시계열)은
+#   사건을 쓰는 곳이 일괄 등록뿐이므로 배치마다 모아서 한 번에 더함 (행마다 트리거를 돌리지 않음)
+SUMMARY_TABLES = {
+    'hotzone_risk_counts': '''
+        CREATE TABLE hotzone_risk_counts (
+            risk_level INTEGER PRIMARY KEY,
+            zone_count INTEGER NOT NULL DEFAULT 0
+        )
+    ''',
+    'incident_type_counts': '''
+        CREATE TABLE incident_type_counts (
+            incident_type TEXT PRIMARY KEY,
+            incident_count INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    ''',
+    'zone_incident_counts': '''
+        CREATE TABLE zone_incident_counts (
+            hotzone_id INTEGER NOT NULL,
+            incident_type TEXT NOT NULL,
+            incident_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (hotzone_id, incident_type)
+        ) WITHOUT ROWID
+    ''',
+    'incident_daily_counts': '''
+        CREATE TABLE incident_daily_counts (
+            day TEXT PRIMARY KEY,
+            incident_count INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    ''',
+    'incident_hourly_counts': '''
+        CREATE TABLE incident_hourly_counts (
+            hour INTEGER PRIMARY KEY,
+            incident_count INTEGER NOT NULL DEFAULT 0
+        )
+    ''',
+    # 핫존 × 유형 × 날짜('YYYY-MM-DD') 사건 수
+    'zone_incident_daily': '''
+        CREATE TABLE zone_incident_daily (
+            hotzone_id INTEGER NOT NULL,
+            day TEXT NOT NULL,
+            incident_type TEXT NOT NULL,
+            incident_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (hotzone_id, day, incident_type)
+        ) WITHOUT ROWID
+    ''',
+    # 핫존 × 유형 × 시각('YYYY-MM-DD HH') 사건 수 (시각이 있는 사건만)
+    'zone_incident_hourly': '''
+        CREATE TABLE zone_incident_hourly (
+            hotzone_id INTEGER NOT NULL,
+            bucket TEXT NOT NULL,
+            incident_type TEXT NOT NULL,
+            incident_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (hotzone_id, bucket, incident_type)
+        ) WITHOUT ROWID
+    ''',
+}
+
+_RISK_COUNT_ADD = '''
+    INSERT INTO hotzone_risk_counts (risk_level, zone_count) VALUES ({row}.risk_level, 1)
+    ON CONFLICT (risk_level) DO UPDATE SET zone_count = zone_count + 1;
+'''
+_RISK_COUNT_REMOVE = '''
+    UPDATE hotzone_risk_counts SET zone_count = zone_count - 1 WHERE risk_level = {row}.risk_level;
+'''
+
+SUMMARY_TRIGGERS = [
+    f'''
+    CREATE TRIGGER IF NOT EXISTS hotzones_summary_insert AFTER INSERT ON hotzones
+    BEGIN
+        {_RISK_COUNT_ADD.format(row='NEW')}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS hotzones_summary_update AFTER UPDATE OF risk_level ON hotzones
+    WHEN OLD.risk_level IS NOT NEW.risk_level
+    BEGIN
+        {_RISK_COUNT_REMOVE.format(row='OLD')}
+        {_RISK_COUNT_ADD.format(row='NEW')}
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS hotzones_summary_delete AFTER DELETE ON hotzones
+    BEGIN
+        {_RISK_COUNT_REMOVE.format(row='OLD')}
+    END
+    ''',
+]
+
+UPSERT_TYPE_COUNT = '''
+    INSERT INTO incident_type_counts (incident_type, incident_count) VALUES (?, ?)
+    ON CONFLICT (incident_type) DO UPDATE SET incident_count = incident_count + excluded.incident_count
+'''
+
+UPSERT_ZONE_COUNT = '''
+    INSERT INTO zone_incident_counts (hotzone_id, incident_type, incident_count) VALUES (?, ?, ?)
+    ON CONFLICT (hotzone_id, incident_type) DO UPDATE SET incident_count = incident_count + excluded.incident_count
+'''
+
+UPSERT_DAILY_COUNT = '''
+    INSERT INTO incident_daily_counts (day, incident_count) VALUES (?, ?)
+    ON CONFLICT (day) DO UPDATE SET incident_count = incident_count + excluded.incident_count
+'''
+
+UPSERT_ZONE_DAILY = '''
+    INSERT INTO zone_incident_daily (hotzone_id, day, incident_type, incident_count) VALUES (?, ?, ?, ?)
+    ON CONFLICT (hotzone_id, day, incident_type) DO UPDATE SET incident_count = incident_count + excluded.incident_count
+'''
+
+UPSERT_ZONE_HOURLY = '''
+    INSERT INTO zone_incident_hourly (hotzone_id, bucket, incident_type, incident_count) VALUES (?, ?, ?, ?)
+    ON CONFLICT (hotzone_id, bucket, incident_type) DO UPDATE SET incident_count = incident_count + excluded.incident_count
+'''
+
+UPSERT_HOURLY_COUNT = '''
+    INSERT INTO incident_hourly_counts (hour, incident_count) VALUES (?, ?)
+    ON CONFLICT (hour) DO UPDATE SET incident_count = incident_count + excluded.incident_count
+'''
+
+# 핫존별 사건 수 / 최근 사건일 증분 갱신
+UPDATE_ZONE_COUNTERS = '''
+    UPDATE hotzones
+    SET incident_count = incident_count + ?,
+        last_incident_date = CASE
+            WHEN last_incident_date IS NULL OR last_incident_date < ? THEN ?
+            ELSE last_incident_date
+        END
+    WHERE id = ?
+'''
+
+
+def init_summary_schema(cursor):
+    """요약 테이블/트리거 생성 (처음 만들 때는 원본 테이블로 채움)"""
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    existing = {row[0] for row in cursor.fetchall()}
+    missing = [name for name in SUMMARY_TABLES if name not in existing]
+    for name in missing:
+        cursor.execute(SUMMARY_TABLES[name])
+    for statement in SUMMARY_TRIGGERS:
+        cursor.execute(statement)
+    if missing:
+        rebuild_summaries(cursor)
+
+
+def rebuild_summaries(cursor):
+    """요약 테이블과 핫존 사건 카운터를 원본 테이블에서 다시 계산"""
+    for name in SUMMARY_TABLES:
+        cursor.execute(f'DELETE FROM {name}')
+    cursor.execute('''
+        INSERT INTO hotzone_risk_counts (risk_level, zone_count)
+        SELECT risk_level, COUNT(*) FROM hotzones GROUP BY risk_level
+    ''')
+    cursor.execute('''
+        INSERT INTO incident_type_counts (incident_type, incident_count)
+        SELECT incident_type, COUNT(*) FROM incidents GROUP BY incident_type
+    ''')
+    cursor.execute('''
+        INSERT INTO zone_incident_counts (hotzone_id, incident_type, incident_count)
+        SELECT hotzone_id, incident_type, COUNT(*) FROM incidents
+        WHERE hotzone_id IS NOT NULL
+        GROUP BY hotzone_id, incident_type
+    ''')
+    cursor.execute('''
+        INSERT INTO incident_daily_counts (day, incident_count)
+        SELECT substr(incident_date, 1, 10), COUNT(*) FROM incidents GROUP BY 1
+    ''')
+    cursor.execute('''
+        INSERT INTO incident_hourly_counts (hour, incident_count)
+        SELECT CAST(substr(incident_date, 12, 2) AS INTEGER), COUNT(*) FROM incidents
+        WHERE length(incident_date) >= 13
+        GROUP BY 1
+    ''')
+    cursor.execute('''
+        INSERT INTO zone_incident_daily (hotzone_id, day, incident_type, incident_count)
+        SELECT hotzone_id, substr(incident_date, 1, 10), incident_type, COUNT(*) FROM incidents
+        WHERE hotzone_id IS NOT NULL
+        GROUP BY 1, 2, 3
+    ''')
+    cursor.execute('''
+        INSERT INTO zone_incident_hourly (hotzone_id, bucket, incident_type, incident_count)
+        SELECT hotzone_id, substr(incident_date, 1, 13), incident_type, COUNT(*) FROM incidents
+        WHERE hotzone_id IS NOT NULL AND length(incident_date) >= 13
+        GROUP BY 1, 2, 3
+    ''')
+    cursor.execute('''
+        UPDATE hotzones SET incident_count = COALESCE(
+            (SELECT SUM(incident_count) FROM zone_incident_counts WHERE hotzone_id = hotzones.id), 0
+        )
+    ''')
+
+
+def apply_incident_rollups(cursor, rows):
+    """새로 저장한 사건 행(incidents INSERT 값 튜플)을 요약 테이블에 더함
+
+    반환값은 사건 수가 바뀐 핫존 수.
+    """
+    types = Counter()
+    zones = Counter()
+    days = Counter()
+    hours = Counter()
+    zone_days = Counter()
+    zone_hours = Counter()
+    last_dates = {}
+    for hotzone_id, incident_type, _, incident_date, _, _, _ in rows:
+        types[incident_type] += 1
+        days[incident_date[:10]] += 1
+        if len(incident_date) > 10:
+            hours[int(incident_date[11:13])] += 1
+        if hotzone_id is not None:
+            zones[(hotzone_id, incident_type)] += 1
+            zone_days[(hotzone_id, incident_date[:10], incident_type)] += 1
+            if len(incident_date) > 10:
+                zone_hours[(hotzone_id, incident_date[:13], incident_type)] += 1
+            last_dates[hotzone_id] = max(last_dates.get(hotzone_id, ''), incident_date[:10])
+
+    cursor.executemany(UPSERT_TYPE_COUNT, types.items())
+    cursor.executemany(UPSERT_ZONE_COUNT, ((zone_id, incident_type, count) for (zone_id, incident_type), count in zones.items()))
+    cursor.executemany(UPSERT_DAILY_COUNT, days.items())
+    cursor.executemany(UPSERT_HOURLY_COUNT, hours.items())
+    cursor.executemany(UPSERT_ZONE_DAILY, (key + (count,) for key, count in zone_days.items()))
+    cursor.executemany(UPSERT_ZONE_HOURLY, (key + (count,) for key, count in zone_hours.items()))
+
+    zone_totals = Counter()
+    for (zone_id, _), count in zones.items():
+        zone_totals[zone_id] += count
+    cursor.executemany(UPDATE_ZONE_COUNTERS, [
+        (count, last_dates[zone_id], last_dates[zone_id], zone_id) for zone_id, count in zone_totals.items()
+    ])
+    return len(zone_totals)
+
+
+def forget_zones(cursor, zone_ids):
+    """삭제되는 핫존의 핫존별 사건 집계 제거"""
+    for table in ('zone_incident_counts', 'zone_incident_daily', 'zone_incident_hourly'):
+        cursor.executemany(f'DELETE FROM {table} WHERE hotzone_id = ?', ((zone_id,) for zone_id in zone_ids))
+
+
+def rebuild_zone_rollups(cursor, zone_ids):
+    """사건이 옮겨진 핫존의 핫존별 사건 집계와 사건 수/최근 사건일을 원본 사건에서 다시 계산"""
+    zone_ids = list(zone_ids)
+    forget_zones(cursor, zone_ids)
+    for start in range(0, len(zone_ids), 500):
+        chunk = zone_ids[start:start + 500]
+        placeholders = ','.join('?' * len(chunk))
+        cursor.execute(f'''
+            INSERT INTO zone_incident_counts (hotzone_id, incident_type, incident_count)
+            SELECT hotzone_id, incident_type, COUNT(*) FROM incidents
+            WHERE hotzone_id IN ({placeholders})
+            GROUP BY hotzone_id, incident_type
+        ''', chunk)
+        cursor.execute(f'''
+            INSERT INTO zone_incident_daily (hotzone_id, day, incident_type, incident_count)
+            SELECT hotzone_id, substr(incident_date, 1, 10), incident_type, COUNT(*) FROM incidents
+            WHERE hotzone_id IN ({placeholders})
+            GROUP BY 1, 2, 3
+        ''', chunk)
+        cursor.execute(f'''
+            INSERT INTO zone_incident_hourly (hotzone_id, bucket, incident_type, incident_count)
+            SELECT hotzone_id, substr(incident_date, 1, 13), incident_type, COUNT(*) FROM incidents
+            WHERE hotzone_id IN ({placeholders}) AND length(incident_date) >= 13
+            GROUP BY 1, 2, 3
+        ''', chunk)
+        cursor.execute(f'''
+            UPDATE hotzones SET
+                incident_count = (SELECT COUNT(*) FROM incidents WHERE hotzone_id = hotzones.id),
+                last_incident_date = (SELECT MAX(substr(incident_date, 1, 10)) FROM incidents WHERE hotzone_id = hotzones.id)
+            WHERE id IN ({placeholders})
+        ''', chunk)
@@ -5,9 +5,14 @@ from datetime import datetime
 import json
 
 # 각 기능별 모듈 import
-from emergency_bells.routes import emergency_bells_bp
-from community.routes import community_bp
-from hotzone.routes import hotzone_bp
+from emergency_bells.routes import emergency_bells_bp, tile_cache
+from community.routes import community_bp, db as community_db, writer as community_writer
+from hotzone.routes import hotzone_bp, db as hotzone_db
+from route_safety.routes import route_safety_bp
+from stream.routes import event_feed, stream_bp
+from common.cache import response_cache
+from common.events import event_hub
+from emergency_bells.store import bell_store
 
 app = Flask(__name__)
 CORS(app)  # 프론트엔드와 통신 허용
@@ -20,6 +25,8 @@ app.config['DATABASE'] = os.environ.get('DATABASE', 'safety_app.db')
 app.register_blueprint(emergency_bells_bp, url_prefix='/api/emergency-bells')
 app.register_blueprint(community_bp, url_prefix='/api/community')
 app.register_blueprint(hotzone_bp, url_prefix='/api/hotzone')
+app.register_blueprint(route_safety_bp, url_prefix='/api/route')
+app.register_blueprint(stream_bp, url_prefix='/api/stream')
 
 @app.route('/')
 def home():
@@ -30,7 +37,9 @@ def home():
         'endpoints': {
             'emergency_bells': '/api/emergency-bells',
             'community': '/api/community',
-            'hotzone': '/api/hotzone'
+            'hotzone': '/api/hotzone',
+            'route': '/api/route',
+            'stream': '/api/stream'
         },
         'timestamp': datetime.now().isoformat()
     })
@@ -40,6 +49,15 @@ def health_check():
     """서버 상태 확인"""
     return jsonify({
         'status': 'healthy',
+        'emergency_bells': bell_store.info(),
+        'emergency_bell_tiles': tile_cache.info(),
+        'databases': {
+            'community': community_db.info(),
+            'hotzone': hotzone_db.info()
+        },
+        'community_writer': community_writer.info() if community_writer else {'enabled': False},
+        'event_stream': {**event_hub.info(), **event_feed.info()},
+        'response_cache': response_cache.info(),
         'timestamp': datetime.now().isoformat()
     })
 
@@ -0,0 +1 @@
+# 경로 안전도 분석 모듈
@@ -0,0 +1,162 @@
+import math
+
+import numpy as np
+
+from common.geo import KM_PER_DEG_LAT, degree_span
+
+# 점 × 선분 행렬을 나눠 계산할 때 한 번에 만드는 최대 원소 수
+CHUNK_ELEMENTS = 1 << 20
+
+
+class RoutePath:
+    """경로(폴리라인)를 경로 중심 위도 기준 평면(km) 좌표로 변환해 둔 것
+
+    도시 규모(수십 km 이내)에서는 등장방형 투영 오차가 무시할 만하므로
+    점-선분 거리와 원-선분 교차를 평면 벡터 연산으로 한꺼번에 계산한다.
+    """
+
+    def __init__(self, lats, lngs):
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lngs = np.asarray(lngs, dtype=np.float64)
+        self.origin = (float(self.lats.mean()), float(self.lngs.mean()))
+        self.kx = KM_PER_DEG_LAT * np.cos(np.radians(self.origin[0]))
+        x, y = self.project(self.lats, self.lngs)
+
+        # 선분 i: (x[i], y[i]) -> (x[i+1], y[i+1])
+        self.ax, self.ay = x[:-1], y[:-1]
+        self.dx, self.dy = np.diff(x), np.diff(y)
+        self.lengths = np.hypot(self.dx, self.dy)
+        self.offsets = np.concatenate(([0.0], np.cumsum(self.lengths)))
+        self.length_km = float(self.offsets[-1])
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def project(self, lats, lngs):
+        return (
+            (np.asarray(lngs, dtype=np.float64) - self.origin[1]) * self.kx,
+            (np.asarray(lats, dtype=np.float64) - self.origin[0]) * KM_PER_DEG_LAT
+        )
+
+    def _segment_params(self, px, py):
+        """점(P) × 선분(S) 행렬로 선분 위 최근접 위치 t (0~1)와 거리 (km)"""
+        fx = px[:, None] - self.ax[None, :]
+        fy = py[:, None] - self.ay[None, :]
+        length_sq = self.lengths ** 2
+        with np.errstate(invalid='ignore', divide='ignore'):
+            t = (fx * self.dx + fy * self.dy) / length_sq
+        t = np.clip(np.nan_to_num(t), 0.0, 1.0)
+        return t, np.hypot(fx - t * self.dx, fy - t * self.dy)
+
+    def nearest_segments(self, lats, lngs):
+        """점마다 가장 가까운 선분 번호, 거리 (km), 경로 시작점부터의 거리 (km)"""
+        px, py = self.project(lats, lngs)
+        segments = np.empty(len(px), dtype=np.int64)
+        distances = np.empty(len(px))
+        along = np.empty(len(px))
+        chunk = max(1, CHUNK_ELEMENTS // max(len(self), 1))
+        for start in range(0, len(px), chunk):
+            stop = start + chunk
+            t, dist = self._segment_params(px[start:stop], py[start:stop])
+            best = dist.argmin(axis=1)
+            rows = np.arange(len(best))
+            segments[start:stop] = best
+            distances[start:stop] = dist[rows, best]
+            along[start:stop] = self.offsets[best] + t[rows, best] * self.lengths[best]
+        return segments, distances, along
+
+    def circle_overlaps(self, lats, lngs, radii_km):
+        """원(C) × 선분(S) 행렬로 선분이 원에 들어가는 위치 t (0~1)와 원 안을 지나는 길이 (km)
+
+        |A + t·d - C|² = r² 의 두 근을 [0, 1] 로 잘라 원 안 구간을 구한다.
+        """
+        cx, cy = self.project(lats, lngs)
+        radii = np.asarray(radii_km, dtype=np.float64)[:, None]
+        fx = self.ax[None, :] - cx[:, None]
+        fy = self.ay[None, :] - cy[:, None]
+        a = self.lengths ** 2
+        b = 2 * (fx * self.dx + fy * self.dy)
+        c = fx ** 2 + fy ** 2 - radii ** 2
+        disc = b ** 2 - 4 * a * c
+        root = np.sqrt(np.maximum(disc, 0.0))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            t0 = np.clip((-b - root) / (2 * a), 0.0, 1.0)
+            t1 = np.clip((-b + root) / (2 * a), 0.0, 1.0)
+        inside = np.where((disc > 0) & (a > 0), np.nan_to_num(t1 - t0), 0.0)
+        return np.nan_to_num(t0), inside * self.lengths
+
+    def point_at(self, along_km):
+        """경로 시작점부터 along_km 떨어진 위치 (lat, lng)"""
+        return (
+            float(np.interp(along_km, self.offsets, self.lats)),
+            float(np.interp(along_km, self.offsets, self.lngs))
+        )
+
+    def corridor_cells(self, buffer_km, cell_size, bounds=None):
+        """선분마다 buffer_km 만큼 넓힌 띠가 걸치는 격자 셀 집합
+
+        선분의 경계 사각형 전체가 아니라 행(위도 띠)마다 선분이 지나는 경도 구간만
+        넓혀서 모으므로 셀 수가 경로 길이에 비례한다. bounds(최소 행, 최소 열, 최대 행,
+        최대 열)가 주어지면 그 범위 밖의 셀은 만들지 않는다.
+        """
+        dlat, dlng = degree_span(float(np.abs(self.lats).max()), buffer_km)
+        if bounds is None:
+            bounds = (-math.inf, -math.inf, math.inf, math.inf)
+        min_row, min_col, max_row, max_col = bounds
+        cells = set()
+        for lat_a, lng_a, lat_b, lng_b in zip(self.lats[:-1].tolist(), self.lngs[:-1].tolist(),
+                                              self.lats[1:].tolist(), self.lngs[1:].tolist()):
+            row0 = max(math.floor((min(lat_a, lat_b) - dlat) / cell_size), min_row)
+            row1 = min(math.floor((max(lat_a, lat_b) + dlat) / cell_size), max_row)
+            for row in range(row0, row1 + 1):
+                # 이 행의 위도 띠(±dlat)에 들어오는 선분 구간 [t0, t1]
+                band_lo = row * cell_size - dlat
+                band_hi = (row + 1) * cell_size + dlat
+                if lat_a == lat_b:
+                    t0, t1 = 0.0, 1.0
+                else:
+                    t0, t1 = sorted(((band_lo - lat_a) / (lat_b - lat_a), (band_hi - lat_a) / (lat_b - lat_a)))
+                    t0, t1 = max(t0, 0.0), min(t1, 1.0)
+                    if t0 > t1:
+                        continue
+                lng0 = lng_a + t0 * (lng_b - lng_a)
+                lng1 = lng_a + t1 * (lng_b - lng_a)
+                col0 = max(math.floor((min(lng0, lng1) - dlng) / cell_size), min_col)
+                col1 = min(math.floor((max(lng0, lng1) + dlng) / cell_size), max_col)
+                cells.update((row, col) for col in range(col0, col1 + 1))
+        return cells
+
+
+def bells_along(path, index, buffer_km):
+    """경로에서 buffer_km 이내의 안전벨 (레코드 번호, 거리 km, 경로상 위치 km, 선분 번호), 경로상 위치순"""
+    if index.bounds is None:
+        ids = index.ids
+    else:
+        ids = index.gather(path.corridor_cells(buffer_km, index.cell_size, index.bounds))
+    segments, distances, along = path.nearest_segments(index.lats[ids], index.lngs[ids])
+    keep = distances <= buffer_km
+    ids, distances, along, segments = ids[keep], distances[keep], along[keep], segments[keep]
+    order = np.lexsort((ids, along))
+    return ids[order], distances[order], along[order], segments[order]
+
+
+def longest_gap(path, along):
+    """안전벨 사이(경로 시작/끝 포함) 가장 긴 구간 (시작 km, 끝 km)"""
+    stops = np.concatenate(([0.0], np.asarray(along, dtype=np.float64), [path.length_km]))
+    gaps = np.diff(stops)
+    i = int(gaps.argmax())
+    return float(stops[i]), float(stops[i + 1])
+
+
+def zones_crossed(path, zones):
+    """경로가 지나는 핫존 (핫존 번호, 선분 번호, 원 안 길이 km, 진입 위치 km)
+
+    zones 는 hotzone.risk.load_zones 결과. 중심이 경로에서 반경보다 먼 핫존을
+    먼저 걸러낸 뒤 남은 핫존에 대해서만 원 × 선분 교차를 계산한다.
+    """
+    _, distances, _ = path.nearest_segments(zones['lat'], zones['lng'])
+    near = np.nonzero(distances <= zones['radius'])[0]
+    t0, lengths = path.circle_overlaps(zones['lat'][near], zones['lng'][near], zones['radius'][near])
+    zone_idx, segment_idx = np.nonzero(lengths > 0)
+    entries = path.offsets[segment_idx] + t0[zone_idx, segment_idx] * path.lengths[segment_idx]
+    return near[zone_idx], segment_idx, lengths[zone_idx, segment_idx], entries
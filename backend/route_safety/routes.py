@@ -0,0 +1,180 @@
+from flask import Blueprint, jsonify, request
+import time
+
+import numpy as np
+
+from emergency_bells.store import bell_store
+from hotzone.risk import load_zones
+from hotzone.routes import db as hotzone_db, parse_points
+from .analysis import RoutePath, bells_along, longest_gap, zones_crossed
+
+route_safety_bp = Blueprint('route_safety', __name__)
+
+# 경로 최대 좌표 수
+MAX_ROUTE_POINTS = 2000
+
+# 경로 최대 길이 (km) - 평면 근사와 격자 탐색은 도시 규모 경로를 전제로 함
+MAX_ROUTE_LENGTH_KM = 100
+
+# 경로 주변 안전벨 검색 폭 (m)
+DEFAULT_BUFFER_M = 100
+MAX_BUFFER_M = 1000
+
+@route_safety_bp.teardown_request
+def release_db_connection(exc):
+    """요청 종료 시 남은 트랜잭션 정리 (연결은 닫지 않고 재사용)"""
+    hotzone_db.release()
+
+@route_safety_bp.route('/safety', methods=['POST'])
+def analyze_route_safety():
+    """도보 경로의 안전도 분석 (경로 주변 안전벨, 안전벨 공백 구간, 통과 핫존)"""
+    try:
+        started = time.perf_counter()
+        data = request.get_json()
+        points = data.get('points') if isinstance(data, dict) else None
+        
+        if not points or not isinstance(points, list) or len(points) < 2:
+            return jsonify({
+                'success': False,
+                'error': '두 개 이상의 좌표로 된 경로(points)가 필요합니다.'
+            }), 400
+        
+        if len(points) > MAX_ROUTE_POINTS:
+            return jsonify({
+                'success': False,
+                'error': f'경로 좌표는 최대 {MAX_ROUTE_POINTS}개까지 가능합니다.'
+            }), 400
+        
+        try:
+            coords = parse_points(points)
+            buffer_m = float(data.get('buffer_m', DEFAULT_BUFFER_M))
+        except (KeyError, TypeError, ValueError):
+            return jsonify({
+                'success': False,
+                'error': '경로 좌표는 [위도, 경도] 또는 {"lat": 위도, "lng": 경도} 형식이어야 합니다.'
+            }), 400
+        
+        if not 0 < buffer_m <= MAX_BUFFER_M:
+            return jsonify({
+                'success': False,
+                'error': f'buffer_m 은 0 초과 {MAX_BUFFER_M} 이하여야 합니다.'
+            }), 400
+        
+        if not ((np.abs(coords[:, 0]) <= 90).all() and (np.abs(coords[:, 1]) <= 180).all()):
+            return jsonify({
+                'success': False,
+                'error': '위도는 -90~90, 경도는 -180~180 범위여야 합니다.'
+            }), 400
+        
+        path = RoutePath(coords[:, 0], coords[:, 1])
+        if path.length_km > MAX_ROUTE_LENGTH_KM:
+            return jsonify({
+                'success': False,
+                'error': f'경로 길이는 최대 {MAX_ROUTE_LENGTH_KM}km까지 가능합니다.'
+            }), 400
+        
+        snapshot = bell_store.get()
+        
+        # 경로 주변 안전벨: 선분을 따라 넓힌 띠가 걸치는 격자 셀만 모아 점 × 선분 거리 계산
+        bell_ids, distances, along, bell_segments = bells_along(path, snapshot.index, buffer_m / 1000)
+        bells = snapshot.dataset.rows(bell_ids)
+        for bell, distance, position in zip(bells, (distances * 1000).round(1).tolist(), (along * 1000).round(1).tolist()):
+            bell['distance_m'] = distance
+            bell['along_m'] = position
+        
+        gap_start, gap_end = longest_gap(path, along)
+        start_lat, start_lng = path.point_at(gap_start)
+        end_lat, end_lng = path.point_at(gap_end)
+        
+        # 통과 핫존: 경로 사각형과 겹치는 핫존을 R*Tree 로 가져와 원 × 선분 교차 계산
+        conn = hotzone_db.connection()
+        cursor = conn.cursor()
+        zones = load_zones(cursor, coords[:, 0].min(), coords[:, 1].min(), coords[:, 0].max(), coords[:, 1].max())
+        zone_idx, zone_segments, inside_km, entries = zones_crossed(path, zones)
+        
+        crossed = {}
+        for z, length, entry in zip(zone_idx.tolist(), inside_km.tolist(), entries.tolist()):
+            zone = crossed.setdefault(z, {'length_km': 0.0, 'entry_km': entry})
+            zone['length_km'] += length
+            zone['entry_km'] = min(zone['entry_km'], entry)
+        
+        zone_info = {}
+        if crossed:
+            ids = [int(zones['id'][z]) for z in crossed]
+            cursor.execute(f'''
+                SELECT id, area_name, risk_level, crime_type
+                FROM hotzones
+                WHERE id IN ({','.join('?' * len(ids))})
+            ''', ids)
+            zone_info = {row['id']: row for row in cursor.fetchall()}
+        
+        hotzones = []
+        for z, zone in sorted(crossed.items(), key=lambda item: item[1]['entry_km']):
+            row = zone_info.get(int(zones['id'][z]))
+            if row is None:
+                continue
+            hotzones.append({
+                'id': row['id'],
+                'area_name': row['area_name'],
+                'risk_level': row['risk_level'],
+                'crime_type': row['crime_type'],
+                'entry_m': round(zone['entry_km'] * 1000, 1),
+                'length_m': round(zone['length_km'] * 1000, 1)
+            })
+        
+        # 선분별 위험도 (통과 핫존 최대 위험도, 핫존 안 길이 합 - 겹친 핫존은 각각 더함, 주변 안전벨 수)
+        segment_count = len(path)
+        max_risk = np.zeros(segment_count, dtype=np.int64)
+        np.maximum.at(max_risk, zone_segments, zones['risk'][zone_idx])
+        risk_length = np.bincount(zone_segments, weights=inside_km, minlength=segment_count)
+        bell_counts = np.bincount(bell_segments, minlength=segment_count)
+        segment_zones = [[] for _ in range(segment_count)]
+        for s, zone_id in zip(zone_segments.tolist(), zones['id'][zone_idx].tolist()):
+            segment_zones[s].append(zone_id)
+        
+        segments = []
+        for s in range(segment_count):
+            segments.append({
+                'index': s,
+                'start_m': round(float(path.offsets[s]) * 1000, 1),
+                'length_m': round(float(path.lengths[s]) * 1000, 1),
+                'max_risk_level': int(max_risk[s]),
+                'hotzone_exposure_m': round(float(risk_length[s]) * 1000, 1),
+                'hotzone_ids': segment_zones[s],
+                'bell_count': int(bell_counts[s])
+            })
+        
+        elapsed = time.perf_counter() - started
+        return jsonify({
+            'success': True,
+            'route': {
+                'length_m': round(path.length_km * 1000, 1),
+                'point_count': len(coords),
+                'buffer_m': buffer_m
+            },
+            'bells': {
+                'count': len(bells),
+                'data': bells
+            },
+            'longest_gap': {
+                'start_m': round(gap_start * 1000, 1),
+                'end_m': round(gap_end * 1000, 1),
+                'length_m': round((gap_end - gap_start) * 1000, 1),
+                'start': {'lat': start_lat, 'lng': start_lng},
+                'end': {'lat': end_lat, 'lng': end_lng}
+            },
+            'hotzones': {
+                'count': len(hotzones),
+                'max_risk_level': int(max_risk.max()),
+                'exposure_m': round(float(inside_km.sum()) * 1000, 1),
+                'data': hotzones
+            },
+            'segments': segments,
+            'elapsed_ms': round(elapsed * 1000, 2)
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
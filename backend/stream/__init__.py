@@ -0,0 +1 @@
+# 실시간 이벤트 스트림 모듈
@@ -0,0 +1,109 @@
+from flask import Blueprint, Response, jsonify, request
+
+from common.events import EventFeed, EventLog, event_hub
+from community.events import community_event
+from community.routes import db as community_db
+from hotzone.events import hotzone_event
+from hotzone.routes import db as hotzone_db
+
+stream_bp = Blueprint('stream', __name__)
+
+# 스트림 이벤트 종류
+EVENT_KINDS = ('post', 'comment', 'hotzone')
+
+# 이벤트가 없을 때 연결 유지용 주석을 보내는 간격 (초)
+HEARTBEAT_SECONDS = 15
+
+# 연결이 끊겼을 때 클라이언트 재연결 대기 시간 (ms)
+RETRY_MS = 3000
+
+# 게시물/댓글, 핫존 변경 기록 -> 허브 발행 (첫 구독 때 시작, 프로세스당 데이터베이스별 연결 하나)
+# 이벤트 id 는 '게시물/댓글 기록 seq-핫존 기록 seq'
+event_feed = EventFeed(event_hub, [
+    EventLog(community_db, 'community_events', community_event),
+    EventLog(hotzone_db, 'hotzone_events', hotzone_event),
+])
+
+@stream_bp.teardown_request
+def release_db_connection(exc):
+    """요청 종료 시 남은 트랜잭션 정리 (연결은 닫지 않고 재사용)"""
+    community_db.release()
+    hotzone_db.release()
+
+def parse_list(value):
+    """쉼표로 구분된 값 -> 집합 (없으면 None)"""
+    if not value:
+        return None
+    items = {item.strip() for item in value.split(',') if item.strip()}
+    return items or None
+
+def parse_bbox(value):
+    """'최소 위도,최소 경도,최대 위도,최대 경도' -> 튜플"""
+    min_lat, min_lng, max_lat, max_lng = (float(item) for item in value.split(','))
+    if min_lat > max_lat or min_lng > max_lng:
+        raise ValueError('bbox 범위가 올바르지 않습니다.')
+    return min_lat, min_lng, max_lat, max_lng
+
+@stream_bp.route('', methods=['GET'])
+def stream_events():
+    """실시간 이벤트 스트림 (Server-Sent Events)
+
+    새 게시물(post), 댓글(comment), 핫존 추가/위험도 변경/삭제(hotzone) 이벤트를 보낸다.
+    types, category, bbox 로 거를 수 있고, 재연결 시 Last-Event-ID 이후의 이벤트를
+    기록 테이블에서 다시 읽어 먼저 보낸다 (워커가 바뀌거나 서버가 재시작되어도 이어짐).
+    """
+    try:
+        kinds = parse_list(request.args.get('types'))
+        if kinds is not None and not kinds <= set(EVENT_KINDS):
+            return jsonify({
+                'success': False,
+                'error': f"types 는 {', '.join(EVENT_KINDS)} 중에서 선택해야 합니다."
+            }), 400
+        
+        categories = parse_list(request.args.get('category'))
+        
+        try:
+            bbox = parse_bbox(request.args['bbox']) if request.args.get('bbox') else None
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': 'bbox 는 "최소 위도,최소 경도,최대 위도,최대 경도" 형식이어야 합니다.'
+            }), 400
+        
+        last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id') or None
+        try:
+            if last_event_id is not None:
+                event_feed.parse_id(last_event_id)
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': 'Last-Event-ID 는 스트림이 보낸 이벤트 id(예: "120-35")여야 합니다.'
+            }), 400
+        
+        subscription = event_feed.subscribe(kinds, categories, bbox, last_event_id)
+        
+        # 구독자는 데이터베이스 연결 없이 허브 대기열만 기다림
+        def generate():
+            try:
+                yield f'retry: {RETRY_MS}\n\n'
+                while True:
+                    events = subscription.wait(HEARTBEAT_SECONDS)
+                    if events is None:
+                        return
+                    if events:
+                        yield ''.join(event.message for event in events)
+                    else:
+                        yield ': keepalive\n\n'
+            finally:
+                event_hub.unsubscribe(subscription)
+        
+        return Response(generate(), mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
@@ -0,0 +1,99 @@
+"""커뮤니티 쓰기 처리량 측정 (요청마다 커밋 vs 묶음 처리)
+
+사용법:
+    python bench_community_writes.py [--threads 32] [--seconds 5]
+                                     [--synchronous NORMAL|FULL] [--max-batch 256] [--max-delay-ms 0]
+
+임시 데이터베이스에서 요청 처리 스레드처럼 여러 스레드가 댓글을 계속 추가하며,
+두 방식의 초당 커밋된 쓰기 수와 응답 지연(p50/p99)을 출력한다.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, 'backend'))
+
+from common.db import DEFAULT_PRAGMAS, Database  # noqa: E402
+from common.writer import BatchWriter  # noqa: E402
+from community.routes import init_schema, insert_comment, insert_post  # noqa: E402
+
+
+def run(write, threads, seconds):
+    """threads 개 스레드가 seconds 초 동안 write(i) 를 반복 -> (쓰기 수, 지연 목록)"""
+    stop = time.monotonic() + seconds
+    latencies = [[] for _ in range(threads)]
+
+    def worker(n):
+        i = 0
+        while time.monotonic() < stop:
+            started = time.perf_counter()
+            write(n * 1_000_000 + i)
+            latencies[n].append(time.perf_counter() - started)
+            i += 1
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    merged = sorted(value for values in latencies for value in values)
+    return len(merged), merged
+
+
+def report(label, count, latencies, seconds):
+    p50 = latencies[len(latencies) // 2] * 1000 if latencies else 0
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0
+    print(f'{label:>8}: {count / seconds:10,.0f}건/초  (p50 {p50:.2f}ms, p99 {p99:.2f}ms)')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='커뮤니티 쓰기 처리량 측정')
+    parser.add_argument('--threads', type=int, default=32, help='동시 쓰기 스레드 수')
+    parser.add_argument('--seconds', type=float, default=5.0, help='방식별 측정 시간 (초)')
+    parser.add_argument('--synchronous', default='NORMAL', choices=('OFF', 'NORMAL', 'FULL'), help='PRAGMA synchronous')
+    parser.add_argument('--max-batch', type=int, default=256, help='묶음 처리 최대 배치 크기')
+    parser.add_argument('--max-delay-ms', type=float, default=0.0, help='묶음 처리 최대 대기 시간 (ms)')
+    args = parser.parse_args(argv)
+
+    pragmas = tuple(
+        (name, args.synchronous if name == 'synchronous' else value) for name, value in DEFAULT_PRAGMAS
+    )
+    print(f'스레드 {args.threads}개, 방식별 {args.seconds:g}초, synchronous={args.synchronous}')
+
+    with tempfile.TemporaryDirectory() as directory:
+        for label in ('direct', 'batched'):
+            db = Database(os.path.join(directory, f'{label}.db'), pragmas=pragmas)
+            with db.transaction() as conn:
+                init_schema(conn.cursor())
+                post_id = insert_post(conn.cursor(), ('벤치마크', '쓰기 처리량 측정', 'bench', None, None, None, '일반'))
+
+            if label == 'direct':
+                def write(i):
+                    with db.transaction() as conn:
+                        insert_comment(conn.cursor(), post_id, f'댓글 {i}', 'bench')
+                count, latencies = run(write, args.threads, args.seconds)
+                report(label, count, latencies, args.seconds)
+            else:
+                writer = BatchWriter(db, max_batch=args.max_batch, max_delay=args.max_delay_ms / 1000)
+                count, latencies = run(
+                    lambda i: writer.execute(insert_comment, post_id, f'댓글 {i}', 'bench'),
+                    args.threads, args.seconds
+                )
+                writer.close()
+                report(label, count, latencies, args.seconds)
+                info = writer.info()
+                print(f"          배치 {info['batches']}회, 평균 {info['avg_batch_size']}건, 최대 {info['largest_batch']}건")
+
+            conn = db.connection()
+            stored = conn.execute('SELECT comment_count FROM posts WHERE id = ?', (post_id,)).fetchone()[0]
+            assert stored == count, (stored, count)
+            db.close_all()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
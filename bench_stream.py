@@ -0,0 +1,144 @@
+"""실시간 이벤트 스트림(/api/stream) 부하 테스트
+
+사용법:
+    python bench_stream.py [--subscribers 2000] [--events 20] [--interval 0.2]
+
+서버(스레드 모드)를 이 프로세스 안에서 띄우고 유휴 SSE 구독 연결을 subscribers 개 연 뒤,
+게시물 대신 이벤트 기록(community_events)에 행을 직접 써서 모든 구독자에게 도착하기까지의
+시간과 연결 수에 따른 메모리/스레드/데이터베이스 연결 수를 출력한다 (쓴 기록은 끝나면 지움).
+"""
+import argparse
+import logging
+import os
+import selectors
+import socket
+import sys
+import threading
+import time
+from urllib.parse import quote
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, 'backend'))
+
+from werkzeug.serving import make_server  # noqa: E402
+
+from common.events import Event, event_hub  # noqa: E402
+from community.routes import db as community_db  # noqa: E402
+from hotzone.routes import db as hotzone_db  # noqa: E402
+from main import app  # noqa: E402
+
+
+def rss_mb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def db_connections():
+    return len(community_db._connections) + len(hotzone_db._connections)
+
+
+def open_subscribers(port, count, query):
+    """SSE 구독 연결 count 개 -> 소켓 목록"""
+    sockets = []
+    request = f'GET /api/stream{query} HTTP/1.1\r\nHost: localhost\r\nAccept: text/event-stream\r\n\r\n'.encode()
+    for i in range(count):
+        sock = socket.create_connection(('127.0.0.1', port))
+        sock.sendall(request)
+        sockets.append(sock)
+        # 수신 대기열이 넘치지 않도록 조금씩 연결
+        if i % 100 == 99:
+            time.sleep(0.05)
+    return sockets
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='실시간 이벤트 스트림 부하 테스트')
+    parser.add_argument('--subscribers', type=int, default=2000, help='유휴 구독 연결 수')
+    parser.add_argument('--events', type=int, default=20, help='발행할 이벤트 수')
+    parser.add_argument('--interval', type=float, default=0.2, help='이벤트 발행 간격 (초)')
+    args = parser.parse_args(argv)
+
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    server.request_queue_size = 1024
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_port
+
+    base_rss, base_threads, base_connections = rss_mb(), threading.active_count(), db_connections()
+    started = time.perf_counter()
+    # 절반은 전체 구독, 절반은 카테고리 필터 구독 ('안전' 이벤트만 받음)
+    half = args.subscribers // 2
+    sockets = open_subscribers(port, half, '') + open_subscribers(port, args.subscribers - half, '?category=' + quote('안전'))
+    while event_hub.info()['subscribers'] < args.subscribers:
+        time.sleep(0.05)
+    connect_time = time.perf_counter() - started
+
+    # 연결 직후 받은 retry/헤더는 버림
+    selector = selectors.DefaultSelector()
+    for sock in sockets:
+        sock.setblocking(False)
+        selector.register(sock, selectors.EVENT_READ)
+    time.sleep(0.2)
+    for key, _ in selector.select(timeout=0):
+        try:
+            key.fileobj.recv(65536)
+        except BlockingIOError:
+            pass
+
+    print(f'구독 {args.subscribers}개 연결: {connect_time:.2f}초')
+    print(f'  메모리 +{rss_mb() - base_rss:.1f}MB, 스레드 +{threading.active_count() - base_threads}개, '
+          f'DB 연결 +{db_connections() - base_connections}개')
+
+    latencies = []
+    expected_total = 0
+    received_total = 0
+    for i in range(args.events):
+        category = '안전' if i % 2 == 0 else '일반'
+        expected = args.subscribers if category == '안전' else half
+        published_at = time.perf_counter()
+        with community_db.transaction() as conn:
+            conn.execute('''
+                INSERT INTO community_events (kind, record_id, post_id, title, author, category)
+                VALUES ('post', 0, 0, ?, 'bench_stream', ?)
+            ''', (f'부하 테스트 {i}', category))
+        event_hub.notify()
+        marker = f'"title":"부하 테스트 {i}"'.encode()
+        received = 0
+        deadline = published_at + 10
+        while received < expected and time.perf_counter() < deadline:
+            for key, _ in selector.select(timeout=0.5):
+                try:
+                    chunk = key.fileobj.recv(65536)
+                except BlockingIOError:
+                    continue
+                received += chunk.count(marker)
+        latencies.append(time.perf_counter() - published_at)
+        expected_total += expected
+        received_total += received
+        time.sleep(args.interval)
+
+    latencies.sort()
+    print(f'이벤트 {args.events}개 발행: 전달 {received_total}/{expected_total}')
+    print(f'  전체 구독자 도착까지 p50 {latencies[len(latencies) // 2] * 1000:.1f}ms, '
+          f'최대 {latencies[-1] * 1000:.1f}ms')
+
+    for sock in sockets:
+        selector.unregister(sock)
+        sock.close()
+    deadline = time.time() + 30
+    while event_hub.info()['subscribers'] and time.time() < deadline:
+        # 끊긴 연결은 다음 쓰기(이벤트/keepalive)에서 정리됨
+        event_hub.publish(Event('0-0', 'post', {'cleanup': True}))
+        time.sleep(0.2)
+    print(f"연결 종료 후 구독자 {event_hub.info()['subscribers']}개")
+    with community_db.transaction() as conn:
+        conn.execute("DELETE FROM community_events WHERE author = 'bench_stream'")
+    server.shutdown()
+    return 0 if received_total == expected_total else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
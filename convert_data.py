@@ -0,0 +1,119 @@
+"""안전비상벨정보.xlsx → emergency_bells.snapshot (+ emergency_bells.json) 변환
+
+사용법:
+    python convert_data.py [--input 안전비상벨정보.xlsx] [--snapshot emergency_bells.snapshot]
+                           [--json emergency_bells.json | --no-json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import warnings
+
+from openpyxl import load_workbook
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, 'backend'))
+
+from emergency_bells.dataset import LAT_COLUMN, LNG_COLUMN, BellDataset  # noqa: E402
+from emergency_bells.snapshot import write_snapshot  # noqa: E402
+from emergency_bells.spatial import GridIndex  # noqa: E402
+
+DEFAULT_INPUT = os.path.join(BASE_DIR, '안전비상벨정보.xlsx')
+DEFAULT_SNAPSHOT = os.path.join(BASE_DIR, 'emergency_bells.snapshot')
+DEFAULT_JSON = os.path.join(BASE_DIR, 'emergency_bells.json')
+
+# 국내 좌표 유효 범위 (위도, 경도)
+LAT_RANGE = (33.0, 39.0)
+LNG_RANGE = (124.0, 132.0)
+
+
+def normalize_value(value):
+    """셀 값을 문자열로 정규화"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def normalize_coordinates(record, stats):
+    """좌표 검증 및 정규화 (위경도 뒤바뀜 보정, 범위 밖 좌표 제거)"""
+    try:
+        lat = float(record.get(LAT_COLUMN))
+        lng = float(record.get(LNG_COLUMN))
+    except (TypeError, ValueError):
+        lat = lng = None
+
+    def in_range(a, b):
+        return LAT_RANGE[0] <= a <= LAT_RANGE[1] and LNG_RANGE[0] <= b <= LNG_RANGE[1]
+
+    if lat is not None and in_range(lat, lng):
+        return
+    if lat is not None and in_range(lng, lat):
+        record[LAT_COLUMN], record[LNG_COLUMN] = record[LNG_COLUMN], record[LAT_COLUMN]
+        stats['swapped'] += 1
+        return
+    record[LAT_COLUMN] = ''
+    record[LNG_COLUMN] = ''
+    stats['invalid'] += 1
+
+
+def read_records(path, stats):
+    """엑셀 파일을 read-only 모드로 한 행씩 읽어 레코드 생성"""
+    with warnings.catch_warnings():
+        # 원본 파일에 기본 스타일이 없어 발생하는 경고 무시
+        warnings.simplefilter('ignore')
+        workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.active
+        # 원본 파일의 dimension 정보가 잘못되어 있어 실제 범위로 다시 계산
+        sheet.reset_dimensions()
+        rows = sheet.iter_rows(values_only=True)
+        header = [normalize_value(name) for name in next(rows)]
+        for row in rows:
+            if row is None or all(value is None for value in row):
+                stats['empty'] += 1
+                continue
+            record = {name: normalize_value(value) for name, value in zip(header, row) if name}
+            normalize_coordinates(record, stats)
+            stats['rows'] += 1
+            yield record
+    finally:
+        workbook.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='안전비상벨 엑셀 데이터를 바이너리 스냅샷으로 변환')
+    parser.add_argument('--input', default=DEFAULT_INPUT, help='원본 엑셀 파일')
+    parser.add_argument('--snapshot', default=DEFAULT_SNAPSHOT, help='출력 스냅샷 파일')
+    parser.add_argument('--json', default=DEFAULT_JSON, help='호환용 JSON 출력 파일')
+    parser.add_argument('--no-json', action='store_true', help='JSON 파일을 만들지 않음')
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    stats = {'rows': 0, 'empty': 0, 'swapped': 0, 'invalid': 0}
+    records = list(read_records(args.input, stats))
+    print(f"📥 엑셀 읽기 완료: {stats['rows']}건 "
+          f"(좌표 보정 {stats['swapped']}건, 좌표 없음 {stats['invalid']}건, 빈 행 {stats['empty']}건)")
+
+    # 백엔드는 더 최근 파일을 쓰므로 JSON을 먼저, 스냅샷을 나중에 기록
+    if not args.no_json:
+        tmp_path = f'{args.json}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(records, f, ensure_ascii=False)
+        os.replace(tmp_path, args.json)
+        print(f"💾 JSON 저장: {args.json}")
+
+    dataset = BellDataset.from_records(records)
+    index = GridIndex(dataset.lat, dataset.lng)
+    header = write_snapshot(args.snapshot, dataset, index, source=os.path.basename(args.input))
+    print(f"💾 스냅샷 저장: {args.snapshot} (version {header['version']}, {len(index.cells)}개 격자 셀)")
+
+    print(f"✅ 변환 완료 ({time.perf_counter() - started:.1f}초)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""범죄 사건 밀도로 핫존 자동 생성/갱신
+
+사용법:
+    python derive_hotzones.py            # 증분: 새 사건이 들어온 격자 주변만 다시 계산
+    python derive_hotzones.py --full     # 전체: 모든 셀 재계산 (최근성 감쇠 반영, 주기 실행 권장)
+                              [--as-of 2024-01-31] [--threshold 30]
+"""
+import argparse
+import os
+import sys
+from datetime import date
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, 'backend'))
+
+from common.cache import response_cache  # noqa: E402
+from hotzone.derive import derive_hotzones  # noqa: E402
+from hotzone.routes import db  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='사건 밀도 기반 핫존 생성')
+    parser.add_argument('--full', action='store_true', help='모든 사건을 다시 집계하여 전체 재계산')
+    parser.add_argument('--as-of', type=date.fromisoformat, help='최근성 가중치 기준일 (기본: 오늘)')
+    parser.add_argument('--threshold', type=float, help='핫존 판정 밀도 (km² 당 가중 사건 수, 기본: 자동)')
+    args = parser.parse_args(argv)
+
+    summary = derive_hotzones(db, full=args.full, as_of=args.as_of, threshold=args.threshold)
+    print(f"🔥 핫존 {summary['mode']} 갱신: 생성 {summary['created']}, 갱신 {summary['updated']}, "
+          f"삭제 {summary['deleted']} (새 사건 {summary['binned_incidents']}건, 타일 {summary['tiles']}개, "
+          f"임계 밀도 {summary['density_threshold']}/km², {summary['elapsed_ms'] / 1000:.1f}초)")
+
+    # 공유 응답 캐시(RESPONSE_CACHE_BACKEND=sqlite)를 쓰는 서버의 핫존 목록 무효화
+    response_cache.invalidate('hotzones')
+
+    db.close_all()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
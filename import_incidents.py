@@ -0,0 +1,52 @@
+"""범죄 사건 NDJSON/CSV 파일 → hotzone.db incidents 일괄 등록
+
+사용법:
+    python import_incidents.py incidents.ndjson [incidents2.csv ...]
+                               [--format ndjson|csv] [--batch-size 5000]
+"""
+import argparse
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, 'backend'))
+
+from common.cache import response_cache  # noqa: E402
+from hotzone.ingest import BATCH_SIZE, ingest_incidents, open_text, read_csv, read_ndjson  # noqa: E402
+from hotzone.routes import db  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='범죄 사건 데이터를 핫존 데이터베이스에 일괄 등록')
+    parser.add_argument('files', nargs='+', help='NDJSON 또는 CSV 파일')
+    parser.add_argument('--format', choices=('ndjson', 'csv'), help='파일 형식 (기본: 확장자로 판단)')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='트랜잭션당 사건 수')
+    args = parser.parse_args(argv)
+
+    failed = False
+    inserted = 0
+    for path in args.files:
+        data_format = args.format or ('csv' if path.lower().endswith('.csv') else 'ndjson')
+        with open(path, 'rb') as f:
+            stream = open_text(f)
+            records = read_csv(stream) if data_format == 'csv' else read_ndjson(stream)
+            summary = ingest_incidents(db, records, batch_size=args.batch_size)
+
+        print(f"📥 {path}: {summary['inserted']}/{summary['received']}건 등록 "
+              f"(핫존 배정 {summary['assigned']}건, 오류 {summary['rejected']}건, "
+              f"{summary['elapsed_ms'] / 1000:.1f}초, {summary['rows_per_sec']}건/초)")
+        for error in summary['errors']:
+            print(f"   ⚠️  {error['line']}행: {error['error']}")
+        failed = failed or summary['rejected'] > 0
+        inserted += summary['inserted']
+
+    # 공유 응답 캐시(RESPONSE_CACHE_BACKEND=sqlite)를 쓰는 서버의 핫존 목록 무효화
+    if inserted:
+        response_cache.invalidate('hotzones')
+
+    db.close_all()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,36 @@
+import os
+import sys
+
+# 백엔드 모듈을 서버와 같은 방식(최상위 import)으로 불러오기 위해 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import pytest  # noqa: E402
+
+from common.db import Database  # noqa: E402
+
+
+@pytest.fixture
+def hotzone_db(tmp_path, monkeypatch):
+    """임시 파일로 초기화한 핫존 데이터베이스 (샘플 핫존 포함)"""
+    import hotzone.routes as hotzone_routes
+    database = Database(str(tmp_path / 'hotzone.db'))
+    monkeypatch.setattr(hotzone_routes, 'db', database)
+    hotzone_routes.init_database()
+    yield database
+    database.close_all()
+
+
+@pytest.fixture
+def community_db(tmp_path, monkeypatch):
+    """임시 파일로 초기화한 커뮤니티 데이터베이스 (라우트가 이 데이터베이스를 사용)"""
+    import community.routes as community_routes
+    from common.cache import response_cache
+    database = Database(str(tmp_path / 'community.db'))
+    monkeypatch.setattr(community_routes, 'db', database)
+    monkeypatch.setattr(community_routes, 'writer', None)
+    with database.transaction() as conn:
+        community_routes.init_schema(conn.cursor())
+    # 다른 테스트의 데이터베이스로 캐시된 목록 응답을 쓰지 않도록
+    response_cache.invalidate('posts')
+    yield database
+    database.close_all()
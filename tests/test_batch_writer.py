@@ -0,0 +1,128 @@
+import sqlite3
+import threading
+
+import pytest
+from flask import Flask
+
+import community.routes as community_routes
+from common.db import Database
+from common.writer import BatchWriter
+from community.routes import community_bp, insert_comment, insert_post
+from community.search import match_query, search_posts
+
+
+@pytest.fixture
+def database(tmp_path):
+    database = Database(str(tmp_path / 'writer.db'))
+    with database.transaction() as conn:
+        conn.execute('CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE)')
+    yield database
+    database.close_all()
+
+
+def _insert(cursor, name):
+    cursor.execute('INSERT INTO items (name) VALUES (?)', (name,))
+    return cursor.lastrowid
+
+
+def _names(database):
+    return sorted(row[0] for row in database.connection().execute('SELECT name FROM items'))
+
+
+def test_queued_writes_share_one_commit(database):
+    writer = BatchWriter(database, max_batch=64, max_delay=0.5)
+    futures = [writer.submit(_insert, f'item {i}') for i in range(20)]
+    ids = [future.result(5) for future in futures]
+    writer.close(5)
+
+    assert ids == sorted(ids) and len(set(ids)) == 20
+    assert len(_names(database)) == 20
+    assert (writer.batches, writer.writes, writer.largest_batch) == (1, 20, 20)
+
+
+def test_batches_respect_max_batch(database):
+    writer = BatchWriter(database, max_batch=8, max_delay=0.5)
+    futures = [writer.submit(_insert, f'item {i}') for i in range(20)]
+    for future in futures:
+        future.result(5)
+    writer.close(5)
+    assert writer.batches == 3 and writer.largest_batch == 8
+
+
+def test_failed_write_does_not_affect_its_batch(database):
+    writer = BatchWriter(database, max_batch=64, max_delay=0.5)
+    first = writer.submit(_insert, 'a')
+    duplicate = writer.submit(_insert, 'a')
+    partial = writer.submit(lambda cursor: (_insert(cursor, 'rolled back'), _insert(cursor, None)))
+    last = writer.submit(_insert, 'b')
+
+    assert first.result(5) and last.result(5)
+    with pytest.raises(sqlite3.IntegrityError):
+        duplicate.result(5)
+    with pytest.raises(sqlite3.IntegrityError):
+        partial.result(5)
+    writer.close(5)
+
+    # 실패한 작업이 쓴 행만 되돌려지고 같은 배치의 나머지는 커밋됨
+    assert _names(database) == ['a', 'b']
+    assert (writer.batches, writer.failed) == (1, 2)
+
+
+def test_results_arrive_after_commit(database):
+    """Future 결과를 받은 시점에는 다른 연결에서도 보임"""
+    writer = BatchWriter(database)
+    seen = []
+
+    def check(name):
+        writer.execute(_insert, name, timeout=5)
+        other = sqlite3.connect(database.path)
+        seen.append(other.execute('SELECT COUNT(*) FROM items WHERE name = ?', (name,)).fetchone()[0])
+        other.close()
+
+    threads = [threading.Thread(target=check, args=(f'item {i}',)) for i in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    writer.close(5)
+    assert seen == [1] * 16
+
+
+def test_close_flushes_pending_writes(database):
+    writer = BatchWriter(database, max_batch=4, max_delay=0.05)
+    futures = [writer.submit(_insert, f'item {i}') for i in range(10)]
+    writer.close(5)
+    assert all(future.done() for future in futures)
+    assert len(_names(database)) == 10
+
+
+def test_routes_write_through_batch_writer(community_db, monkeypatch):
+    writer = BatchWriter(community_db, max_batch=32)
+    monkeypatch.setattr(community_routes, 'writer', writer)
+    app = Flask(__name__)
+    app.register_blueprint(community_bp, url_prefix='/api/community')
+    client = app.test_client()
+
+    post_id = client.post('/api/community/', json={'title': '강남역 소식', 'content': '본문', 'author': '작성자'}).get_json()['post_id']
+    comment = client.post(f'/api/community/{post_id}/comments', json={'content': '댓글', 'author': '댓글러'})
+    missing = client.post('/api/community/999/comments', json={'content': '댓글', 'author': '댓글러'})
+    writer.close(5)
+
+    assert comment.status_code == 201 and missing.status_code == 404
+    post = client.get(f'/api/community/{post_id}').get_json()['data']
+    assert post['comment_count'] == 1 and post['comments'][0]['id'] == comment.get_json()['comment_id']
+    assert writer.writes == 3
+
+
+def test_batched_inserts_match_direct_inserts(community_db):
+    """같은 쓰기 함수를 묶어 실행해도 검색 색인/카운터가 그대로 갱신"""
+    writer = BatchWriter(community_db, max_batch=16, max_delay=0.2)
+    posts = [writer.submit(insert_post, (f'서초역 {i}', '본문', '작성자', None, None, None, '일반')) for i in range(10)]
+    post_ids = [future.result(5) for future in posts]
+    comments = [writer.submit(insert_comment, post_id, '댓글', '댓글러') for post_id in post_ids]
+    assert all(future.result(5) for future in comments)
+    writer.close(5)
+
+    cursor = community_db.connection().cursor()
+    assert len(search_posts(cursor, match_query('서초역'), columns='p.id')) == 10
+    assert cursor.execute('SELECT SUM(comment_count) FROM posts').fetchone()[0] == 10
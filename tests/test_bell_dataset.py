@@ -0,0 +1,21 @@
+from emergency_bells.dataset import BellDataset
+
+
+RECORDS = [
+    {'번호': '1', '설치목적': '방범용', '설치장소유형': '공원', '관리기관명': '강남구', 'WGS84위도': '37.5', 'WGS84경도': '127.0'},
+    {'번호': '2', '설치목적': None, '설치장소유형': '공원', '관리기관명': None, 'WGS84위도': '37.6', 'WGS84경도': '127.1'},
+    {'번호': '3', '설치장소유형': None, '비고': None, 'WGS84위도': '', 'WGS84경도': None},
+]
+
+
+def test_rows_match_original_records():
+    """None 값은 키를 None으로 그대로, 원래 없던 키는 없는 채로 복원"""
+    dataset = BellDataset.from_records(RECORDS)
+    assert dataset.rows(range(len(RECORDS))) == RECORDS
+    assert dataset.rows([2], fields={'설치목적', '설치장소유형'}) == [{'설치장소유형': None}]
+
+
+def test_value_counts_group_missing_and_absent_as_default():
+    dataset = BellDataset.from_records(RECORDS)
+    assert dataset.value_counts('설치목적') == {'방범용': 1, '기타': 2}
+    assert dataset.value_counts('설치장소유형') == {'공원': 2, '기타': 1}
@@ -0,0 +1,94 @@
+import gzip
+import json
+from datetime import datetime
+
+import pytest
+from flask import Flask
+
+import emergency_bells.routes as bell_routes
+from emergency_bells.dataset import BellDataset
+from emergency_bells.store import BellSnapshot
+
+
+RECORDS = [
+    {'번호': str(i), '설치목적': ['방범용', '약자보호'][i % 2], 'WGS84위도': f'{37.5 + i * 0.001:.6f}', 'WGS84경도': '127.0'}
+    for i in range(200)
+]
+
+
+@pytest.fixture
+def snapshots(monkeypatch):
+    """테스트 안에서 store 가 돌려줄 스냅샷을 바꿀 수 있는 목록"""
+    current = [BellSnapshot(BellDataset.from_records(RECORDS), 'v1', 0, 0, datetime.now())]
+    monkeypatch.setattr(bell_routes.bell_store, 'get', lambda: current[-1])
+    return current
+
+
+@pytest.fixture
+def client(snapshots):
+    app = Flask(__name__)
+    app.register_blueprint(bell_routes.emergency_bells_bp, url_prefix='/api/emergency-bells')
+    return app.test_client()
+
+
+def test_identity_response_with_etag(client):
+    response = client.get('/api/emergency-bells/')
+    assert response.status_code == 200
+    assert 'Content-Encoding' not in response.headers
+    assert response.headers['Vary'] == 'Accept-Encoding'
+    assert response.get_json()['count'] == len(RECORDS)
+    assert response.get_json()['data'] == RECORDS
+    assert response.headers['ETag'].startswith('"v1-')
+
+
+def test_gzip_negotiation(client):
+    plain = client.get('/api/emergency-bells/')
+    response = client.get('/api/emergency-bells/', headers={'Accept-Encoding': 'gzip, deflate'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(response.data) == plain.data
+    assert response.headers['ETag'] != plain.headers['ETag']
+    # q=0 이면 압축하지 않음
+    refused = client.get('/api/emergency-bells/', headers={'Accept-Encoding': 'gzip;q=0'})
+    assert 'Content-Encoding' not in refused.headers
+
+
+def test_brotli_preferred_when_available(client):
+    brotli = pytest.importorskip('brotli')
+    plain = client.get('/api/emergency-bells/')
+    response = client.get('/api/emergency-bells/', headers={'Accept-Encoding': 'gzip, br'})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert brotli.decompress(response.data) == plain.data
+
+
+def test_if_none_match_returns_304(client):
+    first = client.get('/api/emergency-bells/', headers={'Accept-Encoding': 'gzip'})
+    etag = first.headers['ETag']
+    response = client.get('/api/emergency-bells/', headers={'If-None-Match': etag, 'Accept-Encoding': 'gzip'})
+    assert response.status_code == 304 and response.data == b''
+    assert response.headers['ETag'] == etag
+
+    # 다른 인코딩으로 받은 ETag 도 같은 내용이므로 304
+    response = client.get('/api/emergency-bells/', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert client.get('/api/emergency-bells/', headers={'If-None-Match': '"other"'}).status_code == 200
+
+
+def test_new_dataset_version_changes_etag(client, snapshots):
+    etag = client.get('/api/emergency-bells/').headers['ETag']
+    snapshots.append(BellSnapshot(BellDataset.from_records(RECORDS[:100]), 'v2', 0, 0, datetime.now()))
+    response = client.get('/api/emergency-bells/', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'].startswith('"v2-')
+    assert json.loads(response.data)['count'] == 100
+
+
+def test_filter_responses_are_encoded_per_purpose(client):
+    response = client.get('/api/emergency-bells/filter?purpose=방범용', headers={'Accept-Encoding': 'gzip'})
+    body = json.loads(gzip.decompress(response.data))
+    assert body['count'] == 100 and {bell['설치목적'] for bell in body['data']} == {'방범용'}
+    etag = response.headers['ETag']
+    assert client.get('/api/emergency-bells/filter?purpose=방범용', headers={'If-None-Match': etag}).status_code == 304
+
+    # 없는 설치목적은 캐시하지 않고 바로 응답
+    unknown = client.get('/api/emergency-bells/filter?purpose=없음')
+    assert unknown.get_json()['count'] == 0 and 'ETag' not in unknown.headers
@@ -0,0 +1,71 @@
+import json
+from datetime import datetime
+
+import pytest
+from flask import Flask
+
+import emergency_bells.routes as bell_routes
+from emergency_bells.dataset import BellDataset
+from emergency_bells.store import BellSnapshot
+
+
+RECORDS = [
+    {'번호': str(i), '설치목적': ['방범용', '약자보호', None][i % 3], '비고': f'"따옴표"\n{i}',
+     'WGS84위도': f'{37.5 + i * 0.0001:.6f}', 'WGS84경도': '127.0'}
+    for i in range(25)
+]
+
+
+@pytest.fixture
+def snapshots(monkeypatch):
+    current = [BellSnapshot(BellDataset.from_records(RECORDS), 'v1', 0, 0, datetime.now())]
+    monkeypatch.setattr(bell_routes.bell_store, 'get', lambda: current[-1])
+    # 청크 경계를 여러 번 지나도록 작게
+    monkeypatch.setattr(bell_routes, 'EXPORT_CHUNK_SIZE', 4)
+    return current
+
+
+@pytest.fixture
+def client(snapshots):
+    app = Flask(__name__)
+    app.register_blueprint(bell_routes.emergency_bells_bp, url_prefix='/api/emergency-bells')
+    return app.test_client()
+
+
+def test_ndjson_export_round_trips_records(client):
+    response = client.get('/api/emergency-bells/export')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert response.headers['X-Total-Count'] == str(len(RECORDS))
+    assert response.headers['X-Dataset-Version'] == 'v1'
+    assert 'emergency_bells.ndjson' in response.headers['Content-Disposition']
+
+    text = response.get_data(as_text=True)
+    assert text.endswith('\n')
+    assert [json.loads(line) for line in text.splitlines()] == RECORDS
+
+
+def test_json_export_is_a_single_array(client):
+    response = client.get('/api/emergency-bells/export?format=json')
+    assert response.mimetype == 'application/json'
+    assert json.loads(response.data) == RECORDS
+
+
+def test_export_filters_by_purpose(client):
+    text = client.get('/api/emergency-bells/export?purpose=약자보호').get_data(as_text=True)
+    assert [json.loads(line) for line in text.splitlines()] == [r for r in RECORDS if r['설치목적'] == '약자보호']
+    empty = client.get('/api/emergency-bells/export?purpose=없음&format=json')
+    assert empty.headers['X-Total-Count'] == '0' and json.loads(empty.data) == []
+
+
+def test_export_keeps_snapshot_while_streaming(client, snapshots):
+    response = client.get('/api/emergency-bells/export', buffered=False)
+    # 스트리밍 도중 새 데이터로 교체되어도 시작한 버전을 끝까지 내보냄
+    snapshots.append(BellSnapshot(BellDataset.from_records(RECORDS[:3]), 'v2', 0, 0, datetime.now()))
+    lines = b''.join(response.response).decode('utf-8').splitlines()
+    assert len(lines) == len(RECORDS)
+    response.close()
+
+
+def test_export_rejects_unknown_format(client):
+    assert client.get('/api/emergency-bells/export?format=csv').status_code == 400
@@ -0,0 +1,85 @@
+import time
+from datetime import datetime
+
+import numpy as np
+import pytest
+from flask import Flask
+
+import emergency_bells.routes as bell_routes
+from emergency_bells.dataset import BellDataset
+from emergency_bells.store import BellSnapshot
+
+
+@pytest.fixture(scope='module')
+def records():
+    rng = np.random.default_rng(7)
+    purposes = ['방범용', '약자보호', '기타']
+    return [
+        {
+            '번호': str(i),
+            '설치목적': purposes[i % 3],
+            '설치장소유형': '가로변',
+            'WGS84위도': f'{lat:.6f}',
+            'WGS84경도': f'{lng:.6f}',
+        }
+        for i, (lat, lng) in enumerate(zip(rng.uniform(37.42, 37.70, 3000), rng.uniform(126.76, 127.18, 3000)))
+    ]
+
+
+@pytest.fixture
+def client(records, monkeypatch):
+    snapshot = BellSnapshot(BellDataset.from_records(records), 'test', 0, 0, datetime.now())
+    monkeypatch.setattr(bell_routes.bell_store, 'get', lambda: snapshot)
+    app = Flask(__name__)
+    app.register_blueprint(bell_routes.emergency_bells_bp, url_prefix='/api/emergency-bells')
+    return app.test_client()
+
+
+def test_bbox_world_extent_is_fast_and_complete(client, records):
+    started = time.perf_counter()
+    response = client.get('/api/emergency-bells/bbox?min_lat=-90&min_lng=-180&max_lat=90&max_lng=180&limit=10')
+    assert time.perf_counter() - started < 0.5
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body['total_count'] == len(records)
+    assert body['truncated'] and body['count'] == 10
+
+
+def test_bbox_matches_brute_force(client, records):
+    box = (37.50, 126.90, 37.60, 127.05)
+    response = client.get('/api/emergency-bells/bbox?min_lat=%s&min_lng=%s&max_lat=%s&max_lng=%s&limit=2000' % box)
+    expected = {
+        r['번호'] for r in records
+        if box[0] <= float(r['WGS84위도']) <= box[2] and box[1] <= float(r['WGS84경도']) <= box[3]
+    }
+    assert {bell['번호'] for bell in response.get_json()['data']} == expected
+
+
+@pytest.mark.parametrize('query', [
+    'min_lat=37.6&min_lng=127.0&max_lat=37.5&max_lng=127.1',
+    'min_lat=-100&min_lng=126&max_lat=38&max_lng=128',
+    'min_lat=37&min_lng=126&max_lat=38&max_lng=200',
+    'min_lat=nan&min_lng=126&max_lat=38&max_lng=128',
+])
+def test_bbox_rejects_invalid_boxes(client, query):
+    assert client.get('/api/emergency-bells/bbox?' + query).status_code == 400
+
+
+def test_nearby_large_radius_returns_everything(client, records):
+    started = time.perf_counter()
+    response = client.get('/api/emergency-bells/nearby?lat=37.55&lng=127.0&radius=1000')
+    assert time.perf_counter() - started < 1.0
+    assert response.status_code == 200
+    assert response.get_json()['count'] == len(records)
+
+
+@pytest.mark.parametrize('radius', ['0', '-1', 'nan'])
+def test_nearby_rejects_invalid_radius(client, radius):
+    assert client.get(f'/api/emergency-bells/nearby?lat=37.55&lng=127.0&radius={radius}').status_code == 400
+
+
+def test_nearest_far_query(client):
+    started = time.perf_counter()
+    response = client.get('/api/emergency-bells/nearest?lat=1&lng=1&k=3')
+    assert time.perf_counter() - started < 0.5
+    assert response.get_json()['count'] == 3
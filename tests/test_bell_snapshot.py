@@ -0,0 +1,35 @@
+import numpy as np
+
+from emergency_bells.dataset import BellDataset
+from emergency_bells.snapshot import StringTable, dataset_version, read_header, read_snapshot, write_snapshot
+from emergency_bells.spatial import GridIndex
+
+
+RECORDS = [
+    {'번호': '1', '설치목적': '방범용', '관리기관명': '강남구', '비고': None, 'WGS84위도': '37.5', 'WGS84경도': '127.0'},
+    {'번호': '2', '설치목적': None, '관리기관명': '서초구', '비고': 'None', 'WGS84위도': '37.48', 'WGS84경도': '127.03'},
+    {'번호': '3', '비고': '', 'WGS84위도': None, 'WGS84경도': None},
+    {'번호': '4', '설치목적': '방범용', '관리기관명': '강남구', 'WGS84위도': '37.51', 'WGS84경도': '127.04'},
+]
+
+
+def test_string_table_keeps_none():
+    table = StringTable.from_strings(['가', None, 'None', ''])
+    assert list(table) == ['가', None, 'None', '']
+
+
+def test_snapshot_round_trip(tmp_path):
+    dataset = BellDataset.from_records(RECORDS)
+    path = str(tmp_path / 'bells.snapshot')
+    header = write_snapshot(path, dataset, source='bells.json')
+    assert read_header(path) == header
+
+    loaded, index, loaded_header = read_snapshot(path)
+    assert loaded_header['version'] == dataset_version(dataset) == dataset_version(loaded)
+    assert loaded.rows(range(len(RECORDS))) == RECORDS
+    np.testing.assert_array_equal(loaded.lat, dataset.lat)
+    np.testing.assert_array_equal(loaded.valid, dataset.valid)
+    assert loaded.value_counts('관리기관명') == dataset.value_counts('관리기관명')
+
+    expected = GridIndex(dataset.lat, dataset.lng)
+    assert index.within_radius(37.5, 127.0, 10)[1].tolist() == expected.within_radius(37.5, 127.0, 10)[1].tolist() == [0, 1, 3]
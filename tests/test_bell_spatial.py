@@ -0,0 +1,138 @@
+import time
+
+import numpy as np
+import pytest
+
+from common.geo import haversine_km
+from emergency_bells.spatial import GridIndex
+
+
+@pytest.fixture(scope='module')
+def points():
+    # 서울 범위의 무작위 좌표 + 좌표 없는 레코드 일부
+    rng = np.random.default_rng(42)
+    lats = rng.uniform(37.42, 37.70, 5000)
+    lngs = rng.uniform(126.76, 127.18, 5000)
+    lats[::97] = np.nan
+    return lats, lngs
+
+
+@pytest.fixture(scope='module')
+def index(points):
+    return GridIndex(*points)
+
+
+def brute_radius(points, lat, lng, radius_km):
+    lats, lngs = points
+    distances = haversine_km(lat, lng, lats, lngs)
+    ids = np.nonzero(distances <= radius_km)[0]
+    order = np.lexsort((ids, distances[ids]))
+    return distances[ids][order], ids[order]
+
+
+def brute_bbox(points, min_lat, min_lng, max_lat, max_lng):
+    lats, lngs = points
+    inside = (lats >= min_lat) & (lats <= max_lat) & (lngs >= min_lng) & (lngs <= max_lng)
+    return np.nonzero(inside)[0]
+
+
+@pytest.mark.parametrize('lat, lng, radius_km', [
+    (37.5665, 126.9780, 0.3),
+    (37.5665, 126.9780, 2.0),
+    (37.4200, 126.7600, 1.5),   # 데이터 모서리
+    (37.6000, 127.0500, 30.0),  # 전체를 덮는 반경
+    (37.8000, 127.3000, 5.0),   # 데이터 밖
+])
+def test_within_radius_matches_brute_force(index, points, lat, lng, radius_km):
+    distances, ids = index.within_radius(lat, lng, radius_km)
+    expected_distances, expected_ids = brute_radius(points, lat, lng, radius_km)
+    np.testing.assert_array_equal(ids, expected_ids)
+    np.testing.assert_allclose(distances, expected_distances)
+
+
+def test_within_radius_with_mask(index, points):
+    mask = np.zeros(len(points[0]), dtype=bool)
+    mask[::3] = True
+    _, ids = index.within_radius(37.55, 127.0, 3.0, mask)
+    _, expected_ids = brute_radius(points, 37.55, 127.0, 3.0)
+    np.testing.assert_array_equal(ids, expected_ids[mask[expected_ids]])
+
+
+@pytest.mark.parametrize('box', [
+    (37.50, 126.90, 37.60, 127.05),
+    (37.00, 126.00, 38.00, 128.00),
+    (-90.0, -180.0, 90.0, 180.0),
+    (10.0, 10.0, 11.0, 11.0),
+    (37.60, 127.00, 37.50, 127.10),  # 뒤집힌 영역
+])
+def test_within_bbox_matches_brute_force(index, points, box):
+    ids = index.within_bbox(*box)
+    np.testing.assert_array_equal(np.sort(ids), brute_bbox(points, *box))
+
+
+def test_wide_queries_scale_with_data_not_area(index):
+    started = time.perf_counter()
+    index.within_radius(37.55, 127.0, 3000.0)
+    index.within_bbox(-90.0, -180.0, 90.0, 180.0)
+    index.within_bbox(30.0, 120.0, 45.0, 135.0)
+    assert time.perf_counter() - started < 0.5
+
+
+def test_empty_index():
+    index = GridIndex(np.array([np.nan]), np.array([np.nan]))
+    assert len(index.within_bbox(-90, -180, 90, 180)) == 0
+    distances, ids = index.within_radius(37.5, 127.0, 10.0)
+    assert len(distances) == len(ids) == 0
+
+
+def brute_nearest(points, lat, lng, k, mask=None, max_radius_km=None):
+    distances, ids = brute_radius(points, lat, lng, np.inf if max_radius_km is None else max_radius_km)
+    if mask is not None:
+        keep = mask[ids]
+        distances, ids = distances[keep], ids[keep]
+    return distances[:k], ids[:k]
+
+
+@pytest.mark.parametrize('lat, lng, k', [
+    (37.5665, 126.9780, 1),
+    (37.5665, 126.9780, 25),
+    (37.4200, 127.1800, 10),   # 데이터 모서리
+    (37.9000, 126.5000, 5),    # 데이터 밖 (가까움)
+    (1.0, 1.0, 3),             # 데이터 밖 (아주 멂)
+    (-37.5, -53.0, 1),         # 지구 반대편
+])
+def test_nearest_matches_brute_force(index, points, lat, lng, k):
+    distances, ids = index.nearest(lat, lng, k)
+    expected_distances, expected_ids = brute_nearest(points, lat, lng, k)
+    np.testing.assert_array_equal(ids, expected_ids)
+    np.testing.assert_allclose(distances, expected_distances)
+
+
+def test_nearest_with_mask_and_max_radius(index, points):
+    mask = np.zeros(len(points[0]), dtype=bool)
+    mask[::50] = True
+    for lat, lng in ((37.55, 127.0), (37.43, 126.77), (37.0, 127.0)):
+        for max_radius in (None, 0.5, 2.0, 60.0):
+            distances, ids = index.nearest(lat, lng, 7, mask, max_radius)
+            expected_distances, expected_ids = brute_nearest(points, lat, lng, 7, mask, max_radius)
+            np.testing.assert_array_equal(ids, expected_ids)
+            np.testing.assert_allclose(distances, expected_distances)
+
+
+def test_nearest_far_from_data_is_fast(index):
+    started = time.perf_counter()
+    index.nearest(1.0, 1.0, 1)
+    index.nearest(89.0, 179.0, 100)
+    index.nearest(1.0, 1.0, 1, max_radius_km=5.0)
+    assert time.perf_counter() - started < 0.5
+
+
+def test_nearest_on_sparse_grid_matches_brute_force():
+    # 멀리 떨어진 좌표 하나 때문에 격자 범위가 넓어진 경우
+    lats = np.array([37.50, 37.51, 37.52, 33.0])
+    lngs = np.array([127.00, 127.01, 127.02, 120.0])
+    index = GridIndex(lats, lngs)
+    distances, ids = index.nearest(35.0, 124.0, 2)
+    expected_distances, expected_ids = brute_nearest((lats, lngs), 35.0, 124.0, 2)
+    np.testing.assert_array_equal(ids, expected_ids)
+    np.testing.assert_allclose(distances, expected_distances)
@@ -0,0 +1,93 @@
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+import pytest
+from flask import Flask
+
+import emergency_bells.routes as bell_routes
+from emergency_bells.dataset import BellDataset
+from emergency_bells.spatial import GridIndex
+from emergency_bells.stats import BellStats
+from emergency_bells.store import BellSnapshot
+
+
+@pytest.fixture(scope='module')
+def records():
+    rng = np.random.default_rng(5)
+    purposes = ['방범용', '약자보호', '기타', None]
+    districts = ['강남구', '서초구', None]
+    result = []
+    for i, (lat, lng) in enumerate(zip(rng.uniform(37.42, 37.70, 4000), rng.uniform(126.76, 127.18, 4000))):
+        record = {'번호': str(i), 'WGS84위도': f'{lat:.6f}', 'WGS84경도': f'{lng:.6f}'}
+        if i % 7:
+            record['설치목적'] = purposes[i % 4]
+        record['관리기관명'] = districts[i % 3]
+        result.append(record)
+    result.append({'번호': 'no-coord', '설치목적': '방범용', 'WGS84위도': '0', 'WGS84경도': '0'})
+    return result
+
+
+@pytest.fixture(scope='module')
+def stats(records):
+    dataset = BellDataset.from_records(records)
+    return BellStats(dataset, GridIndex(dataset.lat, dataset.lng))
+
+
+def _purpose(record):
+    return record.get('설치목적') or '기타'
+
+
+def _brute_bbox(records, min_lat, min_lng, max_lat, max_lng):
+    counts = Counter()
+    for record in records:
+        lat, lng = float(record['WGS84위도']), float(record['WGS84경도'])
+        if lat and lng and min_lat <= lat <= max_lat and min_lng <= lng <= max_lng:
+            counts[_purpose(record)] += 1
+    return sum(counts.values()), dict(counts)
+
+
+def test_column_counts_and_crosstab(stats, records):
+    assert stats.total_count == len(records)
+    assert stats.purpose_stats == dict(Counter(_purpose(record) for record in records))
+
+    crosstab = {}
+    for record in records:
+        row = crosstab.setdefault(record.get('관리기관명') or '기타', {})
+        row[_purpose(record)] = row.get(_purpose(record), 0) + 1
+    assert stats.district_purpose_stats == crosstab
+
+
+def test_bbox_counts_match_brute_force(stats, records):
+    rng = np.random.default_rng(9)
+    boxes = [
+        (-90, -180, 90, 180),
+        (37.5, 127.0, 37.5, 127.0),
+        (37.0, 126.0, 37.3, 126.5),
+        (37.6, 127.1, 37.5, 127.2),
+    ]
+    for _ in range(50):
+        lat0, lat1 = sorted(rng.uniform(37.40, 37.72, 2))
+        lng0, lng1 = sorted(rng.uniform(126.74, 127.20, 2))
+        boxes.append((lat0, lng0, lat1, lng1))
+    for box in boxes:
+        assert stats.bbox_counts(*box) == _brute_bbox(records, *box), box
+
+
+def test_bbox_counts_on_empty_dataset():
+    dataset = BellDataset.from_records([])
+    stats = BellStats(dataset, GridIndex(dataset.lat, dataset.lng))
+    assert stats.bbox_counts(-90, -180, 90, 180) == (0, {})
+
+
+def test_bbox_stats_route(records, monkeypatch):
+    snapshot = BellSnapshot(BellDataset.from_records(records), 'test', 0, 0, datetime.now())
+    monkeypatch.setattr(bell_routes.bell_store, 'get', lambda: snapshot)
+    app = Flask(__name__)
+    app.register_blueprint(bell_routes.emergency_bells_bp, url_prefix='/api/emergency-bells')
+    client = app.test_client()
+
+    body = client.get('/api/emergency-bells/stats/bbox?min_lat=37.5&min_lng=126.9&max_lat=37.6&max_lng=127.05').get_json()
+    total, purposes = _brute_bbox(records, 37.5, 126.9, 37.6, 127.05)
+    assert (body['total_count'], body['purpose_stats']) == (total, purposes)
+    assert client.get('/api/emergency-bells/stats/bbox?min_lat=37.5').status_code == 400
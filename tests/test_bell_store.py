@@ -0,0 +1,113 @@
+import json
+import os
+import time
+
+import pytest
+
+import emergency_bells.store as store
+from emergency_bells.dataset import BellDataset
+from emergency_bells.snapshot import write_snapshot
+
+
+def _records(count):
+    return [
+        {'번호': str(i), '설치목적': '방범용', 'WGS84위도': f'{37.5 + i * 0.001:.6f}', 'WGS84경도': '127.0'}
+        for i in range(count)
+    ]
+
+
+def _write_json(path, records, mtime):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(records, f, ensure_ascii=False)
+    os.utime(path, (mtime, mtime))
+
+
+def _write_snapshot(path, records, mtime):
+    write_snapshot(path, BellDataset.from_records(records))
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def files(tmp_path, monkeypatch):
+    data_file = str(tmp_path / 'bells.json')
+    snapshot_file = str(tmp_path / 'bells.snapshot')
+    monkeypatch.setattr(store, 'DATA_FILE', data_file)
+    monkeypatch.setattr(store, 'SNAPSHOT_FILE', snapshot_file)
+    return data_file, snapshot_file
+
+
+def test_default_source_prefers_newer_file(files):
+    data_file, snapshot_file = files
+    assert store.default_source() == data_file
+
+    _write_json(data_file, _records(3), 1000)
+    assert store.default_source() == data_file
+    _write_snapshot(snapshot_file, _records(3), 1000)
+    assert store.default_source() == snapshot_file
+
+    # 스냅샷을 다시 만들지 않고 JSON만 갱신
+    _write_json(data_file, _records(5), 2000)
+    assert store.default_source() == data_file
+    os.remove(data_file)
+    assert store.default_source() == snapshot_file
+
+
+def test_store_reloads_when_json_becomes_newer(files):
+    data_file, snapshot_file = files
+    _write_json(data_file, _records(3), 1000)
+    _write_snapshot(snapshot_file, _records(3), 2000)
+    bell_store = store.BellStore(check_interval=0)
+    first = bell_store.get()
+    assert (first.source, first.count) == (snapshot_file, 3)
+    assert bell_store.reload_if_changed() is False
+
+    _write_json(data_file, _records(5), 3000)
+    assert bell_store.reload_if_changed() is True
+    assert (bell_store.get().source, bell_store.get().count) == (data_file, 5)
+    # 요청 중이던 쪽은 이전 스냅샷을 그대로 봄
+    assert first.count == 3
+
+    _write_snapshot(snapshot_file, _records(7), 4000)
+    assert bell_store.reload_if_changed() is True
+    assert (bell_store.get().source, bell_store.get().count) == (snapshot_file, 7)
+    assert bell_store.reload_count == 2
+
+
+def test_store_keeps_data_when_reload_fails(files):
+    data_file, _ = files
+    _write_json(data_file, _records(3), 1000)
+    bell_store = store.BellStore(check_interval=0)
+    assert bell_store.get().count == 3
+
+    with open(data_file, 'w', encoding='utf-8') as f:
+        f.write('[{"번호": ')
+    os.utime(data_file, (2000, 2000))
+    assert bell_store.reload_if_changed() is False
+    assert bell_store.get().count == 3
+    assert bell_store.last_error is not None
+
+
+def test_watcher_thread_swaps_snapshot(files):
+    data_file, _ = files
+    _write_json(data_file, _records(3), 1000)
+    bell_store = store.BellStore(check_interval=0.01)
+    try:
+        assert bell_store.get().count == 3
+        _write_json(data_file, _records(4), 2000)
+        deadline = time.monotonic() + 5
+        while bell_store.get().count != 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert bell_store.get().count == 4
+        assert bell_store.info()['reload_count'] == 1
+    finally:
+        bell_store.stop()
+
+
+def test_touch_without_content_change_keeps_snapshot(files):
+    data_file, _ = files
+    _write_json(data_file, _records(3), 1000)
+    bell_store = store.BellStore(check_interval=0)
+    first = bell_store.get()
+    os.utime(data_file, (2000, 2000))
+    assert bell_store.reload_if_changed() is False
+    assert bell_store.get() is first
@@ -0,0 +1,114 @@
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+import pytest
+from flask import Flask
+
+import emergency_bells.routes as bell_routes
+import emergency_bells.tiles as tiles
+from emergency_bells.dataset import BellDataset
+from emergency_bells.spatial import GridIndex
+from emergency_bells.store import BellSnapshot
+from emergency_bells.tiles import ClusterPyramid, TileCache, lnglat_to_unit
+
+
+@pytest.fixture(scope='module')
+def records():
+    rng = np.random.default_rng(11)
+    purposes = ['방범용', '약자보호', None]
+    # 서울 전역 + 좁은 구역에 몰린 안전벨
+    lats = np.concatenate([rng.uniform(37.42, 37.70, 2000), rng.uniform(37.5000, 37.5020, 300)])
+    lngs = np.concatenate([rng.uniform(126.76, 127.18, 2000), rng.uniform(127.0000, 127.0020, 300)])
+    result = [
+        {'번호': str(i), '설치목적': purposes[i % 3], 'WGS84위도': f'{lat:.6f}', 'WGS84경도': f'{lng:.6f}'}
+        for i, (lat, lng) in enumerate(zip(lats, lngs))
+    ]
+    result.append({'번호': 'no-coord', '설치목적': '방범용', 'WGS84위도': '', 'WGS84경도': ''})
+    return result
+
+
+@pytest.fixture(scope='module')
+def pyramid(records):
+    dataset = BellDataset.from_records(records)
+    return ClusterPyramid(dataset, GridIndex(dataset.lat, dataset.lng))
+
+
+@pytest.fixture
+def client(records, monkeypatch):
+    snapshot = BellSnapshot(BellDataset.from_records(records), 'test', 0, 0, datetime.now())
+    monkeypatch.setattr(bell_routes.bell_store, 'get', lambda: snapshot)
+    monkeypatch.setattr(bell_routes, 'tile_cache', TileCache())
+    app = Flask(__name__)
+    app.register_blueprint(bell_routes.emergency_bells_bp, url_prefix='/api/emergency-bells')
+    return app.test_client()
+
+
+def _tile_counts(pyramid, z):
+    """좌표로 직접 계산한 타일별 안전벨 수"""
+    ids = pyramid.index.ids
+    unit_x, unit_y = lnglat_to_unit(pyramid.index.lats[ids], pyramid.index.lngs[ids])
+    n = 2 ** z
+    tx = np.minimum((unit_x * n).astype(np.int64), n - 1)
+    ty = np.minimum((unit_y * n).astype(np.int64), n - 1)
+    return Counter(zip(tx.tolist(), ty.tolist()))
+
+
+def test_world_tile_holds_every_bell(pyramid, records):
+    clusters = pyramid.clusters(0, 0, 0)
+    assert sum(cluster['count'] for cluster in clusters) == len(records) - 1
+
+    purposes = Counter()
+    for cluster in clusters:
+        purposes.update(cluster['purpose_stats'])
+    assert purposes == Counter({'방범용': 767, '약자보호': 767, '기타': 766})
+
+
+@pytest.mark.parametrize('z', [5, 9, 12, 14])
+def test_cluster_tiles_match_brute_force(pyramid, z):
+    for (x, y), expected in _tile_counts(pyramid, z).items():
+        clusters = pyramid.clusters(z, x, y)
+        assert sum(cluster['count'] for cluster in clusters) == expected
+        assert len(clusters) <= tiles.CLUSTER_GRID ** 2
+
+
+def test_cluster_centers_are_member_means(pyramid):
+    index = pyramid.index
+    for level in pyramid.levels[::7]:
+        assert (level.lats * level.counts).sum() == pytest.approx(index.lats[index.ids].sum())
+        assert (level.lngs * level.counts).sum() == pytest.approx(index.lngs[index.ids].sum())
+
+
+def test_bell_tiles_cover_each_bell_once(pyramid, records):
+    z = 15
+    seen = []
+    for x, y in _tile_counts(pyramid, z):
+        rows, count = pyramid.bells(z, x, y)
+        assert count == len(rows)
+        seen.extend(row['번호'] for row in rows)
+    assert sorted(seen) == sorted(record['번호'] for record in records[:-1])
+
+
+def test_bell_tile_reports_truncation(client, pyramid, monkeypatch):
+    monkeypatch.setattr(tiles, 'MAX_TILE_BELLS', 50)
+    z = 15
+    (x, y), expected = _tile_counts(pyramid, z).most_common(1)[0]
+    body = client.get(f'/api/emergency-bells/tiles/{z}/{x}/{y}').get_json()
+    assert body['type'] == 'bells'
+    assert body['count'] == expected > 50
+    assert body['truncated'] is True and len(body['data']) == 50
+
+    (x, y), expected = _tile_counts(pyramid, z).most_common()[-1]
+    body = client.get(f'/api/emergency-bells/tiles/{z}/{x}/{y}').get_json()
+    assert body['truncated'] is False and body['count'] == len(body['data']) == expected
+
+
+def test_cluster_tile_response(client):
+    body = client.get('/api/emergency-bells/tiles/0/0/0').get_json()
+    assert body['type'] == 'clusters' and body['truncated'] is False
+    assert body['count'] == len(body['data'])
+
+
+@pytest.mark.parametrize('path', ['23/0/0', '3/8/0', '3/0/8'])
+def test_invalid_tile_coordinates(client, path):
+    assert client.get(f'/api/emergency-bells/tiles/{path}').status_code == 400
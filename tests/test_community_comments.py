@@ -0,0 +1,81 @@
+import pytest
+from flask import Flask
+
+from community.routes import community_bp, insert_comment, insert_post
+
+
+def _client():
+    app = Flask(__name__)
+    app.register_blueprint(community_bp, url_prefix='/api/community')
+    return app.test_client()
+
+
+@pytest.fixture
+def thread(community_db):
+    """댓글 45개가 달린 게시물과 댓글 없는 게시물 (댓글 작성 시각이 여러 건씩 겹침)"""
+    with community_db.transaction() as conn:
+        cursor = conn.cursor()
+        post_id = insert_post(cursor, ('댓글 많은 글', '본문', '작성자', None, None, None, '일반'))
+        empty_id = insert_post(cursor, ('댓글 없는 글', '본문', '작성자', None, None, None, '일반'))
+        comment_ids = [insert_comment(cursor, post_id, f'댓글 {i}', '댓글러') for i in range(45)]
+        cursor.execute("UPDATE comments SET created_at = datetime('2024-05-01', '+' || (id % 4) || ' minutes')")
+        rows = cursor.execute('SELECT id, created_at FROM comments ORDER BY created_at, id').fetchall()
+    assert len(comment_ids) == 45
+    return post_id, empty_id, [row['id'] for row in rows]
+
+
+def test_post_list_includes_comment_counters(community_db, thread):
+    post_id, empty_id, _ = thread
+    posts = {post['id']: post for post in _client().get('/api/community/').get_json()['data']}
+    assert posts[post_id]['comment_count'] == 45
+    assert posts[post_id]['last_comment_at'] is not None
+    assert (posts[empty_id]['comment_count'], posts[empty_id]['last_comment_at']) == (0, None)
+
+
+def test_add_comment_updates_counters_and_list_cache(community_db, thread):
+    _, empty_id, _ = thread
+    client = _client()
+    # 목록을 먼저 캐시해 두고 댓글 작성 후 캐시가 비워지는지 확인
+    posts = {post['id']: post for post in client.get('/api/community/').get_json()['data']}
+    assert posts[empty_id]['comment_count'] == 0
+    response = client.post(f'/api/community/{empty_id}/comments', json={'content': '첫 댓글', 'author': '댓글러'})
+    assert response.status_code == 201
+    posts = {post['id']: post for post in client.get('/api/community/').get_json()['data']}
+    assert posts[empty_id]['comment_count'] == 1
+
+
+def test_comment_thread_pages_in_order(thread):
+    post_id, _, ordered = thread
+    client = _client()
+    body = client.get(f'/api/community/{post_id}?comments_limit=10').get_json()['data']
+    seen = [comment['id'] for comment in body['comments']]
+    pagination = body['comments_pagination']
+    assert pagination['total_count'] == 45 and pagination['has_more']
+
+    while pagination['has_more']:
+        page = client.get(f"/api/community/{post_id}/comments?per_page=10&after={pagination['next_cursor']}").get_json()
+        seen.extend(comment['id'] for comment in page['data'])
+        pagination = page['pagination']
+    assert pagination['next_cursor'] is None
+    assert seen == ordered
+
+
+def test_first_comment_page_without_cursor(thread):
+    post_id, empty_id, ordered = thread
+    client = _client()
+    body = client.get(f'/api/community/{post_id}/comments?per_page=45').get_json()
+    assert [comment['id'] for comment in body['data']] == ordered
+    assert body['pagination'] == {'per_page': 45, 'total_count': 45, 'has_more': False, 'next_cursor': None}
+    assert client.get(f'/api/community/{empty_id}/comments').get_json()['data'] == []
+
+
+def test_comments_for_missing_post(community_db):
+    client = _client()
+    assert client.get('/api/community/999/comments').status_code == 404
+    assert client.post('/api/community/999/comments', json={'content': '댓글', 'author': '댓글러'}).status_code == 404
+    assert client.post('/api/community/999/comments', json={'content': '댓글'}).status_code == 400
+
+
+def test_bad_comment_cursor(thread):
+    post_id, _, _ = thread
+    assert _client().get(f'/api/community/{post_id}/comments?after=abc').status_code == 400
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from flask import Flask
+
+from common.geo import haversine_km
+from community.routes import MAX_NEARBY_RADIUS_KM, community_bp, insert_post
+
+CENTER = (37.5, 127.0)
+
+
+def _client():
+    app = Flask(__name__)
+    app.register_blueprint(community_bp, url_prefix='/api/community')
+    return app.test_client()
+
+
+@pytest.fixture
+def posts(community_db):
+    """중심 주변 게시물 (작성 시각은 최근 몇 시간 ~ 2년 전, 일부는 같은 시각)"""
+    rng = np.random.default_rng(4)
+    with community_db.transaction() as conn:
+        cursor = conn.cursor()
+        for i, (dlat, dlng) in enumerate(zip(rng.uniform(-0.04, 0.04, 300), rng.uniform(-0.05, 0.05, 300))):
+            insert_post(cursor, (f'글 {i}', '본문', '작성자', None, CENTER[0] + dlat, CENTER[1] + dlng, '일반'))
+        insert_post(cursor, ('좌표 없는 글', '본문', '작성자', None, None, None, '일반'))
+        ages = rng.integers(0, 800 * 24, 300) // 5 * 5
+        cursor.executemany(
+            "UPDATE posts SET created_at = datetime('now', ?) WHERE id = ?",
+            [(f'-{int(hours)} hours', post_id) for post_id, hours in enumerate(ages.tolist(), start=1)]
+        )
+    rows = community_db.connection().execute(
+        'SELECT id, latitude, longitude, created_at FROM posts WHERE latitude IS NOT NULL'
+    ).fetchall()
+    return [tuple(row) for row in rows]
+
+
+def _expected(posts, radius, since=None):
+    distances = haversine_km(CENTER[0], CENTER[1], np.array([row[1] for row in posts]), np.array([row[2] for row in posts]))
+    hits = [
+        (row[3], row[0]) for row, distance in zip(posts, distances.tolist())
+        if distance <= radius and (since is None or row[3] >= since)
+    ]
+    return [post_id for _, post_id in sorted(hits, reverse=True)]
+
+
+def _walk(client, query):
+    ids, distances = [], []
+    url = f'/api/community/nearby?lat={CENTER[0]}&lng={CENTER[1]}&{query}'
+    while True:
+        body = client.get(url).get_json()
+        assert body['success']
+        ids.extend(post['id'] for post in body['data'])
+        distances.extend(post['distance_km'] for post in body['data'])
+        if not body['pagination']['has_more']:
+            return ids, distances
+        url = f"/api/community/nearby?lat={CENTER[0]}&lng={CENTER[1]}&{query}&before={body['pagination']['next_cursor']}"
+
+
+@pytest.mark.parametrize('radius', [0.5, 2.0, 5.0])
+def test_nearby_pages_match_brute_force(posts, radius):
+    ids, distances = _walk(_client(), f'radius={radius}&per_page=9')
+    assert ids == _expected(posts, radius)
+    assert all(distance <= radius for distance in distances)
+
+
+def test_nearby_since_filter(community_db, posts):
+    since = community_db.connection().execute("SELECT datetime('now', '-45 days')").fetchone()[0]
+    ids, _ = _walk(_client(), f'radius=3&per_page=10&since={since.replace(" ", "T")}Z')
+    assert ids == _expected(posts, 3, since)
+    assert 0 < len(ids) < len(_expected(posts, 3))
+
+
+def test_moved_post_follows_its_coordinates(community_db, posts):
+    client = _client()
+    query = f'/api/community/nearby?lat={CENTER[0]}&lng={CENTER[1]}&radius=0.2&per_page=100'
+    with community_db.transaction() as conn:
+        conn.execute('UPDATE posts SET latitude = ?, longitude = ? WHERE id = 1', CENTER)
+    assert 1 in [post['id'] for post in client.get(query).get_json()['data']]
+    with community_db.transaction() as conn:
+        conn.execute('UPDATE posts SET latitude = NULL, longitude = NULL WHERE id = 1')
+    assert 1 not in [post['id'] for post in client.get(query).get_json()['data']]
+
+
+@pytest.mark.parametrize('query', [
+    'lng=127.0',
+    'lat=91&lng=127.0',
+    'lat=37.5&lng=127.0&radius=0',
+    f'lat=37.5&lng=127.0&radius={MAX_NEARBY_RADIUS_KM + 1}',
+    'lat=37.5&lng=127.0&since=어제',
+    'lat=37.5&lng=127.0&before=abc',
+])
+def test_nearby_rejects_bad_parameters(community_db, query):
+    assert _client().get(f'/api/community/nearby?{query}').status_code == 400
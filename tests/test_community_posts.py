@@ -0,0 +1,80 @@
+import pytest
+from flask import Flask
+
+from community.routes import community_bp, insert_post
+
+
+def _client():
+    app = Flask(__name__)
+    app.register_blueprint(community_bp, url_prefix='/api/community')
+    return app.test_client()
+
+
+@pytest.fixture
+def posts(community_db):
+    """작성 시각이 여러 건씩 겹치는 게시물 (커서가 id 로 동점을 가르는지 확인)"""
+    with community_db.transaction() as conn:
+        cursor = conn.cursor()
+        for i in range(53):
+            insert_post(cursor, (f'글 {i}', '본문', '작성자', None, None, None, ['일반', '안전'][i % 2]))
+        cursor.execute("UPDATE posts SET created_at = datetime('2024-05-01', '+' || (id % 6) || ' hours')")
+    rows = community_db.connection().execute('SELECT id, category, created_at FROM posts').fetchall()
+    return [tuple(row) for row in rows]
+
+
+def _expected(posts, category='all'):
+    rows = [row for row in posts if category in ('all', row[1])]
+    return [row[0] for row in sorted(rows, key=lambda row: (row[2], row[0]), reverse=True)]
+
+
+def _walk(client, query):
+    ids, url = [], f'/api/community/?{query}'
+    while True:
+        body = client.get(url).get_json()
+        assert body['success']
+        ids.extend(post['id'] for post in body['data'])
+        pagination = body['pagination']
+        if not pagination['has_more']:
+            assert pagination['next_cursor'] is None
+            return ids, pagination
+        url = f"/api/community/?{query}&after={pagination['next_cursor']}"
+
+
+@pytest.mark.parametrize('category', ['all', '안전'])
+def test_cursor_pages_cover_every_post_once(posts, category):
+    ids, pagination = _walk(_client(), f'per_page=7&category={category}')
+    assert ids == _expected(posts, category)
+    assert pagination['total_count'] == len(ids)
+
+
+def test_offset_pages_match_cursor_order(posts):
+    client = _client()
+    ids = []
+    for page in range(1, 7):
+        body = client.get(f'/api/community/?per_page=10&page={page}').get_json()
+        assert body['pagination']['page'] == page
+        assert body['pagination']['total_pages'] == 6
+        ids.extend(post['id'] for post in body['data'])
+    assert ids == _expected(posts)
+
+
+def test_new_posts_do_not_shift_cursor_pages(community_db, posts):
+    client = _client()
+    first = client.get('/api/community/?per_page=10').get_json()
+    with community_db.transaction() as conn:
+        insert_post(conn.cursor(), ('새 글', '본문', '작성자', None, None, None, '일반'))
+    # 첫 페이지를 받은 뒤 새 글이 올라와도 다음 페이지는 밀리지 않음
+    second = client.get(f"/api/community/?per_page=10&after={first['pagination']['next_cursor']}").get_json()
+    assert [post['id'] for post in second['data']] == _expected(posts)[10:20]
+
+
+def test_list_content_is_a_preview(community_db):
+    with community_db.transaction() as conn:
+        insert_post(conn.cursor(), ('긴 글', '가' * 500, '작성자', None, None, None, '일반'))
+    post = _client().get('/api/community/').get_json()['data'][0]
+    assert post['content'] == '가' * 100 + '...'
+
+
+@pytest.mark.parametrize('after', ['abc', '2024-05-01', '2024-05-01 00:00:00,x'])
+def test_bad_cursor_is_rejected(community_db, after):
+    assert _client().get(f'/api/community/?after={after}').status_code == 400
@@ -0,0 +1,102 @@
+import sqlite3
+
+from common.db import Database
+from community.routes import init_schema, insert_comment, insert_post
+from community.search import match_query, search_posts
+
+
+def _search(cursor, q):
+    return [row['id'] for row in search_posts(cursor, match_query(q), columns='p.id')]
+
+
+def _database(tmp_path):
+    database = Database(str(tmp_path / 'community.db'))
+    with database.transaction() as conn:
+        init_schema(conn.cursor())
+    return database
+
+
+def test_inserted_posts_and_comments_are_searchable(tmp_path):
+    database = _database(tmp_path)
+    with database.transaction() as conn:
+        cursor = conn.cursor()
+        post_id = insert_post(cursor, ('강남역 폭행 목격', '밤에 조심하세요', '작성자', '강남구', None, None, '일반'))
+        other_id = insert_post(cursor, ('홍대 소식', '별일 없음', '작성자', '마포구', None, None, '일반'))
+        insert_comment(cursor, other_id, '신촌역 근처도 위험해요', '댓글러')
+
+    cursor = database.connection().cursor()
+    assert _search(cursor, '강남역') == [post_id]
+    assert _search(cursor, '신촌역') == [other_id]
+    database.close_all()
+
+
+def test_other_connections_are_indexed_by_triggers(tmp_path):
+    """ngrams() 함수 없는 다른 연결(다른 워커, 스크립트, sqlite3 CLI)이 쓴 글도 트리거로 바로 색인"""
+    database = _database(tmp_path)
+    cursor = database.connection().cursor()
+
+    plain = sqlite3.connect(str(tmp_path / 'community.db'))
+    post_id = insert_post(plain.cursor(), ('강남역 폭행 목격', '밤에 조심하세요', '작성자', None, None, None, '일반'))
+    insert_comment(plain.cursor(), post_id, '신촌역 근처도', '댓글러')
+    plain.commit()
+    assert _search(cursor, '강남역') == [post_id]
+    assert _search(cursor, '신촌역') == [post_id]
+
+    # n-gram 컬럼 없이 쓴 행도 쓰기는 되고, 다음 초기화 때 채워져 색인됨
+    plain.execute("INSERT INTO posts (title, content, author) VALUES ('종로 소식', '내용', 'cli')")
+    plain.commit()
+    assert _search(cursor, '종로') == []
+    with database.transaction() as conn:
+        init_schema(conn.cursor())
+    assert len(_search(cursor, '종로')) == 1
+
+    plain.execute('DELETE FROM comments WHERE post_id = ?', (post_id,))
+    plain.execute('DELETE FROM posts WHERE id = ?', (post_id,))
+    plain.commit()
+    assert _search(cursor, '강남역') == []
+    assert _search(cursor, '신촌역') == []
+    plain.execute("INSERT INTO posts_fts (posts_fts) VALUES ('integrity-check')")
+    plain.execute("INSERT INTO comments_fts (comments_fts) VALUES ('integrity-check')")
+    plain.close()
+    database.close_all()
+
+
+def test_legacy_contentless_index_is_rebuilt(tmp_path):
+    """ngrams() 트리거를 쓰던 이전 색인을 새 형식으로 바꾸고 기존 게시물을 다시 색인"""
+    path = str(tmp_path / 'community.db')
+    legacy = sqlite3.connect(path)
+    legacy.create_function('ngrams', 1, lambda text: text)
+    legacy.executescript('''
+        CREATE TABLE posts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT NOT NULL, content TEXT NOT NULL,
+            author TEXT NOT NULL, location TEXT, latitude REAL, longitude REAL,
+            category TEXT DEFAULT '일반', created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            comment_count INTEGER NOT NULL DEFAULT 0, last_comment_at TIMESTAMP
+        );
+        CREATE VIRTUAL TABLE posts_fts USING fts5(title, content, location, content='', tokenize='unicode61');
+        CREATE TRIGGER posts_fts_insert AFTER INSERT ON posts BEGIN
+            INSERT INTO posts_fts (rowid, title, content, location)
+            VALUES (NEW.id, ngrams(NEW.title), ngrams(NEW.content), ngrams(NEW.location));
+        END;
+        INSERT INTO posts (title, content, author) VALUES ('강남역 사건', '내용', '작성자');
+    ''')
+    legacy.commit()
+    legacy.close()
+
+    database = Database(path)
+    with database.transaction() as conn:
+        init_schema(conn.cursor())
+    cursor = database.connection().cursor()
+    assert _search(cursor, '강남역') == [1]
+    cursor.execute("INSERT INTO posts_fts (posts_fts) VALUES ('integrity-check')")
+    database.connection().commit()
+    triggers = cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'trigger'").fetchall()
+    assert not any('ngrams(' in row[0] for row in triggers)
+
+    plain = sqlite3.connect(path)
+    insert_post(plain.cursor(), ('새 글 서초역', '내용', 'cli', None, None, None, '일반'))
+    plain.commit()
+    plain.close()
+    assert len(_search(cursor, '서초역')) == 1
+    database.close_all()
@@ -0,0 +1,197 @@
+import json
+import logging
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from flask import Flask
+from werkzeug.serving import make_server
+
+import community.routes as community_routes
+from common.db import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(str(tmp_path / 'test.db'))
+    with database.transaction() as conn:
+        conn.execute('CREATE TABLE items (id INTEGER PRIMARY KEY, writer INTEGER, value TEXT)')
+    yield database
+    database.close_all()
+
+
+def run_threads(count, target):
+    """count 개 스레드에서 target(i) 실행 - 발생한 예외 목록 반환"""
+    errors = []
+
+    def run(i):
+        try:
+            target(i)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+def test_wal_and_pragmas(db):
+    conn = db.connection()
+    assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    assert conn.execute('PRAGMA busy_timeout').fetchone()[0] == 5000
+    assert conn.execute('PRAGMA synchronous').fetchone()[0] == 1  # NORMAL
+
+
+def test_concurrent_readers_and_writers(db):
+    writers, readers, writes_per_thread = 8, 8, 50
+    done = threading.Event()
+    reads = []
+
+    def write(i):
+        for n in range(writes_per_thread):
+            with db.transaction() as conn:
+                conn.execute('INSERT INTO items (writer, value) VALUES (?, ?)', (i, f'{i}-{n}'))
+        db.release()
+
+    def read(i):
+        count = 0
+        while not done.is_set():
+            db.connection().execute('SELECT COUNT(*) FROM items').fetchone()
+            db.release()
+            count += 1
+        reads.append(count)
+
+    reader_threads = [threading.Thread(target=read, args=(i,)) for i in range(readers)]
+    for thread in reader_threads:
+        thread.start()
+    errors = run_threads(writers, write)
+    done.set()
+    for thread in reader_threads:
+        thread.join()
+
+    assert errors == []
+    assert db.connection().execute('SELECT COUNT(*) FROM items').fetchone()[0] == writers * writes_per_thread
+    assert all(count > 0 for count in reads)
+
+
+def test_reader_not_blocked_by_open_write_transaction(db):
+    started, finish = threading.Event(), threading.Event()
+
+    def hold_write():
+        with db.transaction() as conn:
+            conn.execute("INSERT INTO items (writer, value) VALUES (0, 'pending')")
+            started.set()
+            finish.wait(5)
+        db.release()
+
+    writer = threading.Thread(target=hold_write)
+    writer.start()
+    assert started.wait(5)
+    try:
+        began = time.perf_counter()
+        count = db.connection().execute('SELECT COUNT(*) FROM items').fetchone()[0]
+        elapsed = time.perf_counter() - began
+    finally:
+        finish.set()
+        writer.join()
+
+    # 쓰기 트랜잭션이 열려 있어도 커밋 전 상태를 바로 읽음 (rollback journal 이면 잠금 대기)
+    assert count == 0
+    assert elapsed < 0.5
+
+
+def test_released_connections_are_reused_by_new_threads(db):
+    def request(i):
+        db.connection().execute('SELECT 1').fetchone()
+        db.release()
+
+    for i in range(200):
+        thread = threading.Thread(target=request, args=(i,))
+        thread.start()
+        thread.join()
+
+    assert db.info()['connections'] <= 2
+
+
+def test_connections_of_finished_threads_are_reclaimed(db):
+    def use_without_release():
+        db.connection().execute('SELECT 1').fetchone()
+
+    for _ in range(100):
+        thread = threading.Thread(target=use_without_release)
+        thread.start()
+        thread.join()
+
+    assert db.info()['connections'] <= 2
+
+
+def test_pool_size_bounds_idle_connections(tmp_path):
+    database = Database(str(tmp_path / 'pool.db'), pool_size=4)
+    barrier = threading.Barrier(12)
+
+    def request(i):
+        database.connection().execute('SELECT 1').fetchone()
+        barrier.wait(5)
+        database.release()
+
+    assert run_threads(12, request) == []
+    assert database.info() == {'connections': 4, 'idle': 4, 'pool_size': 4}
+    database.close_all()
+
+
+def test_rolls_back_uncommitted_transaction_on_release(db):
+    conn = db.connection()
+    conn.execute('BEGIN IMMEDIATE')
+    conn.execute("INSERT INTO items (writer, value) VALUES (0, 'abandoned')")
+    db.release()
+
+    # 잠금이 풀려 다른 스레드가 바로 쓸 수 있어야 함
+    def write(i):
+        with db.transaction() as conn:
+            conn.execute("INSERT INTO items (writer, value) VALUES (1, 'committed')")
+        db.release()
+
+    assert run_threads(1, write) == []
+    rows = db.connection().execute('SELECT value FROM items').fetchall()
+    assert [row['value'] for row in rows] == ['committed']
+
+
+def test_threaded_server_concurrent_posts_and_reads(tmp_path, monkeypatch):
+    """스레드 서버에서 게시물 작성과 목록 조회를 동시에 보내도 잠금 오류 없이 처리"""
+    database = Database(str(tmp_path / 'community.db'))
+    monkeypatch.setattr(community_routes, 'db', database)
+    community_routes.init_database()
+
+    app = Flask(__name__)
+    app.register_blueprint(community_routes.community_bp, url_prefix='/api/community')
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_port}/api/community/'
+
+    def call(i):
+        if i % 2:
+            body = json.dumps({'title': f'제목 {i}', 'content': '내용', 'author': '작성자'}).encode()
+            request = urllib.request.Request(base, data=body, headers={'Content-Type': 'application/json'})
+        else:
+            request = urllib.request.Request(base + '?per_page=5')
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.loads(response.read())
+
+    try:
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            results = list(pool.map(call, range(200)))
+    finally:
+        server.shutdown()
+
+    assert all(result['success'] for _, result in results)
+    assert sorted({status for status, _ in results}) == [200, 201]
+    assert database.connection().execute('SELECT COUNT(*) FROM posts').fetchone()[0] == 100
+    # 요청마다 새 스레드지만 연결은 동시 요청 수 이내로 재사용
+    assert database.info()['connections'] <= 17
+    database.close_all()
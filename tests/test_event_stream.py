@@ -0,0 +1,113 @@
+import sqlite3
+
+import pytest
+
+from common.events import EventFeed, EventHub, EventLog
+from community.events import community_event
+from community.routes import insert_comment, insert_post
+from hotzone.events import hotzone_event
+
+
+def _feed(community_db, hotzone_db):
+    """워커 하나의 허브 + 기록 읽기 (스레드 없이 poll 을 직접 호출)"""
+    feed = EventFeed(EventHub(), [
+        EventLog(community_db, 'community_events', community_event),
+        EventLog(hotzone_db, 'hotzone_events', hotzone_event),
+    ])
+    feed.cursor = tuple(log.last_seq() for log in feed.logs)
+    return feed
+
+
+def _subscribe(feed, *args, **kwargs):
+    # start() 가 스레드를 띄우지 않도록 이미 실행 중인 것처럼 둠
+    feed.start = lambda: None
+    return feed.subscribe(*args, **kwargs)
+
+
+def _post(database, title, category='일반', lat=None, lng=None):
+    with database.transaction() as conn:
+        return insert_post(conn.cursor(), (title, '본문 ' * 100, '작성자', None, lat, lng, category))
+
+
+def test_post_and_comment_events_from_log(community_db, hotzone_db):
+    feed = _feed(community_db, hotzone_db)
+    subscription = _subscribe(feed)
+
+    post_id = _post(community_db, '새 글', category='안전', lat=37.5, lng=127.0)
+    with community_db.transaction() as conn:
+        comment_id = insert_comment(conn.cursor(), post_id, '댓글', '댓글러')
+    assert feed.poll() == 2
+
+    post, comment = subscription.wait(0)
+    assert post.kind == 'post' and post.data['id'] == post_id
+    assert post.data['category'] == '안전' and len(post.data['content']) == 100
+    assert (post.category, post.lat, post.lng) == ('안전', 37.5, 127.0)
+    assert comment.kind == 'comment' and comment.data == {
+        'id': comment_id, 'post_id': post_id, 'content': '댓글', 'author': '댓글러'
+    }
+    # 댓글은 게시물의 카테고리/좌표로 거름
+    assert (comment.category, comment.lat, comment.lng) == ('안전', 37.5, 127.0)
+    assert post.id == f'{feed.cursor[0] - 1}-{feed.cursor[1]}'
+    assert comment.id == feed.format_id(feed.cursor)
+
+
+def test_workers_see_same_event_ids(community_db, hotzone_db):
+    """다른 워커(또는 다른 연결)가 쓴 글도 모든 워커가 같은 id 로 발행"""
+    first, second = _feed(community_db, hotzone_db), _feed(community_db, hotzone_db)
+    first_sub, second_sub = _subscribe(first), _subscribe(second)
+
+    plain = sqlite3.connect(community_db.path)
+    plain.execute("INSERT INTO posts (title, content, author) VALUES ('CLI 글', '내용', 'cli')")
+    plain.commit()
+    plain.close()
+    hotzone_db.connection().execute('''
+        INSERT INTO hotzones (area_name, risk_level, latitude, longitude, radius) VALUES ('새 핫존', 3, 37.5, 127.0, 0.5)
+    ''')
+    hotzone_db.connection().commit()
+
+    first.poll()
+    second.poll()
+    first_events, second_events = first_sub.wait(0), second_sub.wait(0)
+    assert [event.kind for event in first_events] == ['post', 'hotzone']
+    assert [event.id for event in first_events] == [event.id for event in second_events]
+
+
+def test_last_event_id_replays_missed_events_after_restart(community_db, hotzone_db):
+    feed = _feed(community_db, hotzone_db)
+    subscription = _subscribe(feed)
+    _post(community_db, '첫 글')
+    feed.poll()
+    last_seen = subscription.wait(0)[-1].id
+
+    # 연결이 끊긴 동안 쓰인 글 - 재시작한 워커(새 허브)에 재연결
+    missed = [_post(community_db, f'놓친 글 {i}') for i in range(3)]
+    restarted = _feed(community_db, hotzone_db)
+    resumed = _subscribe(restarted, last_event_id=last_seen)
+    live = _post(community_db, '재연결 후 글')
+    restarted.poll()
+
+    events = resumed.wait(0)
+    assert [event.data['id'] for event in events] == missed + [live]
+    assert len({event.id for event in events}) == 4
+
+
+def test_client_ahead_of_worker_gets_no_duplicates(community_db, hotzone_db):
+    """다른 워커에서 더 앞선 이벤트까지 받은 클라이언트는 같은 이벤트를 다시 받지 않음"""
+    ahead = _feed(community_db, hotzone_db)
+    behind = _feed(community_db, hotzone_db)
+    ahead_sub = _subscribe(ahead)
+    _post(community_db, '글 1')
+    _post(community_db, '글 2')
+    ahead.poll()
+    last_seen = ahead_sub.wait(0)[-1].id
+
+    resumed = _subscribe(behind, last_event_id=last_seen)
+    _post(community_db, '글 3')
+    behind.poll()
+    assert [event.data['title'] for event in resumed.wait(0)] == ['글 3']
+
+
+@pytest.mark.parametrize('value', ['12', 'abc', '1-2-3', '-1-2'])
+def test_invalid_last_event_id(community_db, hotzone_db, value):
+    with pytest.raises(ValueError):
+        _feed(community_db, hotzone_db).parse_id(value)
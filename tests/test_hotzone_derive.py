@@ -0,0 +1,107 @@
+import warnings
+from datetime import date
+
+import numpy as np
+
+from hotzone.derive import derive_hotzones, incident_weights
+from hotzone.ingest import ingest_incidents
+
+# 샘플 핫존(서울)과 겹치지 않는 지점 - 사건은 처음에 어느 핫존에도 배정되지 않음
+CENTER = (35.1, 129.0)
+AS_OF = date(2024, 6, 1)
+
+
+def _records(count, start=0, day='2024-05-20'):
+    rng = np.random.default_rng(start)
+    lats = CENTER[0] + rng.normal(0, 0.0005, count)
+    lngs = CENTER[1] + rng.normal(0, 0.0005, count)
+    return [
+        (start + i + 1, {'incident_type': '절도', 'incident_date': f'{day} 2{i % 4}:00:00',
+                         'latitude': float(lat), 'longitude': float(lng), 'severity': 3})
+        for i, (lat, lng) in enumerate(zip(lats, lngs))
+    ]
+
+
+def _derived_zones(cursor):
+    return cursor.execute('SELECT * FROM hotzones WHERE derived = 1').fetchall()
+
+
+def _assert_rollups_match(cursor, zone_id):
+    zone = cursor.execute('SELECT incident_count, last_incident_date FROM hotzones WHERE id = ?', (zone_id,)).fetchone()
+    actual = cursor.execute('''
+        SELECT COUNT(*), MAX(substr(incident_date, 1, 10)) FROM incidents WHERE hotzone_id = ?
+    ''', (zone_id,)).fetchone()
+    assert (zone['incident_count'], zone['last_incident_date']) == (actual[0], actual[1])
+    for table in ('zone_incident_counts', 'zone_incident_daily', 'zone_incident_hourly'):
+        total = cursor.execute(f'SELECT SUM(incident_count) FROM {table} WHERE hotzone_id = ?', (zone_id,)).fetchone()[0]
+        assert total == actual[0], table
+
+
+def test_derived_zone_receives_incidents_and_rollups(hotzone_db):
+    ingest_incidents(hotzone_db, _records(200))
+    summary = derive_hotzones(hotzone_db, full=True, as_of=AS_OF, threshold=10)
+    cursor = hotzone_db.connection().cursor()
+
+    zones = _derived_zones(cursor)
+    assert summary['created'] == 1 and len(zones) == 1
+    zone = zones[0]
+    assert zone['incident_count'] > 100
+    assert zone['last_incident_date'] == '2024-05-20'
+    assert f"사건 {zone['incident_count']}건" in zone['description']
+    _assert_rollups_match(cursor, zone['id'])
+
+    # 새 사건은 증분 실행에서 같은 파생 핫존으로 배정됨
+    ingest_incidents(hotzone_db, _records(50, start=200, day='2024-05-25'))
+    summary = derive_hotzones(hotzone_db, as_of=AS_OF, threshold=10)
+    assert summary['updated'] == 1 and summary['created'] == 0
+    updated = cursor.execute('SELECT * FROM hotzones WHERE id = ?', (zone['id'],)).fetchone()
+    assert updated['incident_count'] > zone['incident_count']
+    assert updated['last_incident_date'] == '2024-05-25'
+    _assert_rollups_match(cursor, zone['id'])
+
+
+def test_derive_keeps_manual_zone_incidents(hotzone_db):
+    cursor = hotzone_db.connection().cursor()
+    manual = cursor.execute('SELECT id, latitude, longitude FROM hotzones ORDER BY id LIMIT 1').fetchone()
+    records = [
+        (i + 1, {'incident_type': '폭행', 'incident_date': '2024-05-20',
+                 'latitude': manual['latitude'], 'longitude': manual['longitude']})
+        for i in range(100)
+    ]
+    ingest_incidents(hotzone_db, records)
+    before = cursor.execute('SELECT COUNT(*) FROM incidents WHERE hotzone_id = ?', (manual['id'],)).fetchone()[0]
+    assert before == 100
+
+    derive_hotzones(hotzone_db, full=True, as_of=AS_OF, threshold=10)
+    after = cursor.execute('SELECT COUNT(*) FROM incidents WHERE hotzone_id = ?', (manual['id'],)).fetchone()[0]
+    assert after == before
+
+
+def test_stale_derived_zone_releases_incidents(hotzone_db):
+    ingest_incidents(hotzone_db, _records(200))
+    derive_hotzones(hotzone_db, full=True, as_of=AS_OF, threshold=10)
+    cursor = hotzone_db.connection().cursor()
+    zone_id = _derived_zones(cursor)[0]['id']
+
+    # 임계 밀도를 올리면 묶음이 사라지고 사건은 미배정으로 돌아감
+    summary = derive_hotzones(hotzone_db, full=True, as_of=AS_OF, threshold=1e12)
+    assert summary['deleted'] == 1
+    assert cursor.execute('SELECT COUNT(*) FROM incidents WHERE hotzone_id = ?', (zone_id,)).fetchone()[0] == 0
+    assert cursor.execute('SELECT COUNT(*) FROM zone_incident_counts WHERE hotzone_id = ?', (zone_id,)).fetchone()[0] == 0
+
+
+def test_far_future_dates_do_not_overflow(hotzone_db):
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        weights = incident_weights(['2999-01-01', '2024-01-01', 'bad'], [3, 3, None])
+    assert np.isfinite(weights).all()
+    assert weights[2] == 0
+
+    # 검증을 거치지 않고 들어온 먼 미래 사건이 있어도 임계 밀도가 유한함
+    ingest_incidents(hotzone_db, _records(50))
+    hotzone_db.connection().execute('UPDATE incidents SET incident_date = ? WHERE id % 5 = 0', ('2999-01-01',))
+    hotzone_db.connection().commit()
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        summary = derive_hotzones(hotzone_db, full=True, as_of=AS_OF)
+    assert np.isfinite(summary['density_threshold'])
@@ -0,0 +1,35 @@
+from datetime import date, timedelta
+
+import pytest
+
+from hotzone.ingest import IncidentError, ingest_incidents, parse_incident_date
+
+
+def test_parse_incident_date_normalises():
+    assert parse_incident_date('2024-03-01') == '2024-03-01'
+    assert parse_incident_date('2024-03-01T12:30:00Z') == '2024-03-01 21:30:00'
+
+
+@pytest.mark.parametrize('value', ['2999-01-01', (date.today() + timedelta(days=30)).isoformat(), '2024-13-01', '', None])
+def test_parse_incident_date_rejects_invalid_and_future(value):
+    with pytest.raises(IncidentError):
+        parse_incident_date(value)
+
+
+def test_parse_incident_date_allows_today():
+    today = date.today().isoformat()
+    assert parse_incident_date(today) == today
+
+
+def test_future_incident_does_not_move_last_incident_date(hotzone_db):
+    cursor = hotzone_db.connection().cursor()
+    zone = cursor.execute('SELECT id, latitude, longitude FROM hotzones ORDER BY id LIMIT 1').fetchone()
+    records = [
+        (1, {'incident_type': '절도', 'incident_date': '2024-05-01', 'latitude': zone['latitude'], 'longitude': zone['longitude']}),
+        (2, {'incident_type': '절도', 'incident_date': '2999-01-01', 'latitude': zone['latitude'], 'longitude': zone['longitude']}),
+    ]
+    summary = ingest_incidents(hotzone_db, records)
+    assert summary['inserted'] == 1 and summary['rejected'] == 1
+    assert summary['errors'][0]['line'] == 2
+    row = cursor.execute('SELECT MAX(incident_date) FROM incidents').fetchone()
+    assert row[0] == '2024-05-01'
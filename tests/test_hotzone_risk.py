@@ -0,0 +1,118 @@
+import time
+
+import numpy as np
+import pytest
+from flask import Flask
+
+from common.geo import haversine_km
+from hotzone.risk import covering_pairs
+from hotzone.routes import MAX_RADIUS_KM, MAX_RISK_POINTS, hotzone_bp
+
+
+def _client():
+    app = Flask(__name__)
+    app.register_blueprint(hotzone_bp, url_prefix='/api/hotzone')
+    return app.test_client()
+
+
+def _zones(lats, lngs, radii, risks=None):
+    n = len(lats)
+    return {
+        'id': np.arange(1, n + 1, dtype=np.int64),
+        'lat': np.asarray(lats, dtype=np.float64),
+        'lng': np.asarray(lngs, dtype=np.float64),
+        'radius': np.asarray(radii, dtype=np.float64),
+        'risk': np.asarray(risks if risks is not None else [1] * n, dtype=np.int64),
+    }
+
+
+def _brute_force(lats, lngs, zones):
+    pairs = set()
+    for p in range(len(lats)):
+        distances = haversine_km(np.full(len(zones['id']), lats[p]), np.full(len(zones['id']), lngs[p]), zones['lat'], zones['lng'])
+        pairs.update((p, z) for z in np.nonzero(distances <= zones['radius'])[0].tolist())
+    return pairs
+
+
+def test_covering_pairs_matches_brute_force():
+    rng = np.random.default_rng(7)
+    lats = 37.5 + rng.uniform(-0.2, 0.2, 500)
+    lngs = 127.0 + rng.uniform(-0.2, 0.2, 500)
+    zones = _zones(37.5 + rng.uniform(-0.2, 0.2, 40), 127.0 + rng.uniform(-0.2, 0.2, 40), rng.uniform(0.1, 3, 40))
+    point_idx, zone_idx = covering_pairs(lats, lngs, zones)
+    assert set(zip(point_idx.tolist(), zone_idx.tolist())) == _brute_force(lats, lngs, zones)
+
+
+@pytest.mark.parametrize('radius', [2000.0, 10000.0])
+def test_covering_pairs_huge_radius_skips_grid(radius):
+    """아주 넓은 핫존도 셀로 펼치지 않고 바로 거리 계산 (메모리/시간이 점 수에 비례)"""
+    lats = np.array([37.5, 37.51, -33.9])
+    lngs = np.array([127.0, 127.01, 151.2])
+    zones = _zones([37.5, 37.505], [127.0, 127.0], [radius, 0.5])
+    started = time.perf_counter()
+    point_idx, zone_idx = covering_pairs(lats, lngs, zones)
+    assert time.perf_counter() - started < 0.5
+    assert set(zip(point_idx.tolist(), zone_idx.tolist())) == _brute_force(lats, lngs, zones)
+
+
+@pytest.mark.parametrize('radius', [0, -1, MAX_RADIUS_KM + 1, 10000, 'abc'])
+def test_create_hotzone_rejects_invalid_radius(hotzone_db, radius):
+    response = _client().post('/api/hotzone/', json={
+        'area_name': '넓은 핫존', 'risk_level': 3, 'latitude': 37.5, 'longitude': 127.0, 'radius': radius
+    })
+    assert response.status_code == 400
+
+
+def test_create_hotzone_accepts_max_radius(hotzone_db):
+    response = _client().post('/api/hotzone/', json={
+        'area_name': '넓은 핫존', 'risk_level': 3, 'latitude': 37.5, 'longitude': 127.0, 'radius': MAX_RADIUS_KM
+    })
+    assert response.status_code == 201
+
+
+def _db_zones(database):
+    rows = database.connection().execute('SELECT id, latitude, longitude, radius, risk_level FROM hotzones').fetchall()
+    return _zones([r['latitude'] for r in rows], [r['longitude'] for r in rows], [r['radius'] for r in rows],
+                  [r['risk_level'] for r in rows]) | {'id': np.array([r['id'] for r in rows], dtype=np.int64)}
+
+
+def test_risk_endpoint_matches_brute_force(hotzone_db):
+    rng = np.random.default_rng(3)
+    lats = 37.55 + rng.uniform(-0.08, 0.08, 300)
+    lngs = 126.98 + rng.uniform(-0.12, 0.12, 300)
+    # 샘플 핫존(강남역) 중심은 반드시 포함되도록
+    lats, lngs = np.append(lats, 37.4979), np.append(lngs, 127.0276)
+    points = [{'lat': lat, 'lng': lng} for lat, lng in zip(lats.tolist(), lngs.tolist())]
+
+    body = _client().post('/api/hotzone/risk', json={'points': points, 'include_zones': True}).get_json()
+    assert body['success'] and body['count'] == len(points)
+
+    zones = _db_zones(hotzone_db)
+    covering = {}
+    for p, z in _brute_force(lats, lngs, zones):
+        covering.setdefault(p, []).append(z)
+    for i, result in enumerate(body['data']):
+        hit = covering.get(i, [])
+        assert sorted(result['zone_ids']) == sorted(zones['id'][hit].tolist())
+        assert result['zone_count'] == len(hit)
+        assert result['risk_sum'] == int(zones['risk'][hit].sum())
+        assert result['max_risk_level'] == (int(zones['risk'][hit].max()) if hit else 0)
+    assert body['data'][-1]['zone_count'] >= 1
+
+
+def test_risk_endpoint_omits_zone_ids_by_default(hotzone_db):
+    body = _client().post('/api/hotzone/risk', json={'points': [[37.4979, 127.0276]]}).get_json()
+    assert 'zone_ids' not in body['data'][0]
+
+
+@pytest.mark.parametrize('payload', [
+    {},
+    {'points': []},
+    {'points': 'abc'},
+    {'points': [[37.5]]},
+    {'points': [{'lat': 37.5}]},
+    {'points': [[37.5, 127.0]] * (MAX_RISK_POINTS + 1)},
+])
+def test_risk_endpoint_rejects_bad_points(hotzone_db, payload):
+    response = _client().post('/api/hotzone/risk', json=payload)
+    assert response.status_code == 400
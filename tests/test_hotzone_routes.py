@@ -0,0 +1,56 @@
+from flask import Flask
+
+import hotzone.routes as hotzone_routes
+from hotzone.ingest import ingest_incidents
+from hotzone.routes import hotzone_bp
+
+
+def _client():
+    app = Flask(__name__)
+    app.register_blueprint(hotzone_bp, url_prefix='/api/hotzone')
+    return app.test_client()
+
+
+def test_zone_incidents_keyset_pages(hotzone_db):
+    cursor = hotzone_db.connection().cursor()
+    zone = cursor.execute('SELECT id, latitude, longitude FROM hotzones ORDER BY id LIMIT 1').fetchone()
+    # 같은 날짜의 사건이 여러 건이어도 id 로 이어서 빠짐없이 나뉨
+    records = [
+        (i + 1, {'incident_type': '절도', 'incident_date': f'2024-05-{1 + i // 3:02d}',
+                 'latitude': zone['latitude'], 'longitude': zone['longitude']})
+        for i in range(25)
+    ]
+    ingest_incidents(hotzone_db, records)
+    client = _client()
+
+    seen = []
+    url = f"/api/hotzone/{zone['id']}?per_page=7"
+    while True:
+        body = client.get(url).get_json()
+        assert body['success']
+        pagination = body['data']['incident_pagination']
+        seen.extend((incident['incident_date'], incident['id']) for incident in body['data']['incidents'])
+        if not pagination['has_more']:
+            assert pagination['next_cursor'] is None
+            break
+        url = f"/api/hotzone/{zone['id']}?per_page=7&after={pagination['next_cursor']}"
+
+    assert pagination['total_count'] == 25
+    assert len(seen) == 25 and len(set(seen)) == 25
+    assert seen == sorted(seen, reverse=True)
+
+
+def test_zone_incidents_rejects_bad_cursor(hotzone_db):
+    zone_id = hotzone_db.connection().execute('SELECT id FROM hotzones LIMIT 1').fetchone()[0]
+    response = _client().get(f'/api/hotzone/{zone_id}?after=2024-05-01')
+    assert response.status_code == 400
+
+
+def test_create_hotzone_wakes_event_stream(hotzone_db, monkeypatch):
+    calls = []
+    monkeypatch.setattr(hotzone_routes.event_hub, 'notify', lambda: calls.append(1))
+    response = _client().post('/api/hotzone/', json={
+        'area_name': '새 핫존', 'risk_level': 3, 'latitude': 37.5, 'longitude': 127.0, 'radius': 0.5
+    })
+    assert response.status_code == 201
+    assert calls == [1]
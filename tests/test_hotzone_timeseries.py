@@ -0,0 +1,94 @@
+from collections import Counter
+from datetime import date
+
+import numpy as np
+import pytest
+from flask import Flask
+
+from hotzone.ingest import ingest_incidents
+from hotzone.routes import MAX_TIMESERIES_DAYS, hotzone_bp
+
+
+def _client():
+    app = Flask(__name__)
+    app.register_blueprint(hotzone_bp, url_prefix='/api/hotzone')
+    return app.test_client()
+
+
+@pytest.fixture
+def zone(hotzone_db):
+    """샘플 핫존 하나에 2024년 3~4월 사건을 무작위로 등록"""
+    cursor = hotzone_db.connection().cursor()
+    zone = cursor.execute('SELECT id, latitude, longitude FROM hotzones ORDER BY id LIMIT 1').fetchone()
+    rng = np.random.default_rng(1)
+    records = []
+    for i in range(400):
+        day = date(2024, 3, 1).toordinal() + int(rng.integers(0, 61))
+        incident_date = date.fromordinal(day).isoformat()
+        # 일부는 날짜만 있는 사건 (시간대/요일 집계에서는 빠짐)
+        if i % 5:
+            incident_date += f' {int(rng.integers(0, 24)):02d}:{int(rng.integers(0, 60)):02d}:00'
+        records.append((i + 1, {
+            'incident_type': ['절도', '폭행'][i % 2], 'incident_date': incident_date,
+            'latitude': zone['latitude'], 'longitude': zone['longitude'],
+        }))
+    assert ingest_incidents(hotzone_db, records)['inserted'] == 400
+    return zone['id']
+
+
+def _incidents(hotzone_db, zone_id, start, end, incident_type=None):
+    """incidents 원본 테이블에서 직접 읽은 (유형, 일시) 목록"""
+    rows = hotzone_db.connection().execute(
+        'SELECT incident_type, incident_date FROM incidents WHERE hotzone_id = ?', (zone_id,)
+    ).fetchall()
+    return [
+        (row['incident_type'], row['incident_date']) for row in rows
+        if start <= row['incident_date'][:10] <= end and incident_type in (None, row['incident_type'])
+    ]
+
+
+@pytest.mark.parametrize('incident_type', [None, '폭행'])
+def test_daily_series_matches_incidents(hotzone_db, zone, incident_type):
+    url = f'/api/hotzone/{zone}/timeseries?start=2024-03-10&end=2024-04-05'
+    if incident_type:
+        url += f'&incident_type={incident_type}'
+    body = _client().get(url).get_json()
+    incidents = _incidents(hotzone_db, zone, '2024-03-10', '2024-04-05', incident_type)
+
+    assert body['total_count'] == len(incidents)
+    assert body['incident_type_stats'] == dict(Counter(kind for kind, _ in incidents))
+    assert body['series'] == dict(sorted(Counter(when[:10] for _, when in incidents).items()))
+
+
+def test_hourly_series_and_profiles(hotzone_db, zone):
+    body = _client().get(f'/api/hotzone/{zone}/timeseries?granularity=hour&start=2024-03-01&end=2024-04-30').get_json()
+    timed = [when for _, when in _incidents(hotzone_db, zone, '2024-03-01', '2024-04-30') if len(when) > 10]
+
+    assert body['series'] == dict(sorted(Counter(when[:13] for when in timed).items()))
+    hour_of_day = Counter(int(when[11:13]) for when in timed)
+    assert body['hour_of_day'] == [hour_of_day[h] for h in range(24)]
+    weekday_hour = Counter((date.fromisoformat(when[:10]).weekday(), int(when[11:13])) for when in timed)
+    assert body['weekday_hour'] == [[weekday_hour[(d, h)] for h in range(24)] for d in range(7)]
+    assert body['weekday'] == [sum(row) for row in body['weekday_hour']]
+    # 전체 개수는 날짜만 있는 사건까지 포함
+    assert body['total_count'] == 400 > len(timed)
+
+
+def test_days_window_ends_at_end_date(zone):
+    body = _client().get(f'/api/hotzone/{zone}/timeseries?end=2024-03-07&days=7').get_json()
+    assert (body['start'], body['end']) == ('2024-03-01', '2024-03-07')
+    assert all('2024-03-01' <= day <= '2024-03-07' for day in body['series'])
+
+
+@pytest.mark.parametrize('query', [
+    'granularity=week',
+    'start=2024/03/01',
+    'start=2024-04-01&end=2024-03-01',
+    f'days={MAX_TIMESERIES_DAYS + 1}',
+])
+def test_timeseries_rejects_bad_parameters(zone, query):
+    assert _client().get(f'/api/hotzone/{zone}/timeseries?{query}').status_code == 400
+
+
+def test_timeseries_unknown_zone(hotzone_db):
+    assert _client().get('/api/hotzone/999999/timeseries').status_code == 404
@@ -0,0 +1,89 @@
+import pytest
+from flask import Flask, jsonify, request
+
+from common.cache import MemoryBackend, ResponseCache, SQLiteBackend
+
+
+def make_app(cache):
+    app = Flask(__name__)
+    calls = []
+
+    @app.route('/items')
+    @cache.cached('items')
+    def items():
+        calls.append(request.query_string)
+        return jsonify({'args': sorted(request.args.items(multi=True))})
+
+    @app.route('/missing')
+    @cache.cached('items')
+    def missing():
+        return jsonify({'success': False}), 404
+
+    return app, calls
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def cache(request, tmp_path):
+    if request.param == 'memory':
+        return ResponseCache(MemoryBackend(8), ttl=30)
+    return ResponseCache(SQLiteBackend(str(tmp_path / 'cache.db'), 8), ttl=30)
+
+
+def test_hit_miss_and_invalidation(cache):
+    app, calls = make_app(cache)
+    client = app.test_client()
+    assert client.get('/items?a=1').headers['X-Cache'] == 'MISS'
+    assert client.get('/items?a=1').headers['X-Cache'] == 'HIT'
+    cache.invalidate('items')
+    assert client.get('/items?a=1').headers['X-Cache'] == 'MISS'
+    assert len(calls) == 2
+    assert cache.info()['hits'] == 1 and cache.info()['misses'] == 2
+
+
+def test_query_order_does_not_matter(cache):
+    app, calls = make_app(cache)
+    client = app.test_client()
+    client.get('/items?a=1&b=2')
+    assert client.get('/items?b=2&a=1').headers['X-Cache'] == 'HIT'
+
+
+def test_encoded_separators_do_not_collide(cache):
+    """값 안의 인코딩된 '&', '=' 가 다른 쿼리의 캐시 항목을 덮어쓰지 않아야 함"""
+    app, calls = make_app(cache)
+    client = app.test_client()
+    poisoned = client.get('/items?category=%EC%95%88%EC%A0%84%26page%3D2').get_json()
+    response = client.get('/items?category=%EC%95%88%EC%A0%84&page=2')
+    assert response.headers['X-Cache'] == 'MISS'
+    assert response.get_json() != poisoned
+    assert response.get_json()['args'] == [['category', '안전'], ['page', '2']]
+
+
+def test_error_responses_are_not_cached(cache):
+    app, _ = make_app(cache)
+    client = app.test_client()
+    client.get('/missing')
+    assert client.get('/missing').headers['X-Cache'] == 'MISS'
+
+
+def test_lru_eviction():
+    cache = ResponseCache(MemoryBackend(2), ttl=30)
+    app, _ = make_app(cache)
+    client = app.test_client()
+    for value in ('1', '2', '3'):
+        client.get('/items?a=' + value)
+    assert cache.info()['evictions'] == 1
+    assert client.get('/items?a=1').headers['X-Cache'] == 'MISS'
+    assert client.get('/items?a=3').headers['X-Cache'] == 'HIT'
+
+
+def test_sqlite_generations_are_shared(tmp_path):
+    path = str(tmp_path / 'shared.db')
+    first = ResponseCache(SQLiteBackend(path))
+    second = ResponseCache(SQLiteBackend(path))
+    app, _ = make_app(first)
+    client = app.test_client()
+    client.get('/items')
+    assert client.get('/items').headers['X-Cache'] == 'HIT'
+    # 다른 워커의 쓰기가 이 워커의 캐시도 무효화
+    second.invalidate('items')
+    assert client.get('/items').headers['X-Cache'] == 'MISS'
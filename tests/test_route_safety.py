@@ -0,0 +1,68 @@
+import time
+
+import numpy as np
+import pytest
+from flask import Flask
+
+from emergency_bells.spatial import GridIndex
+from route_safety.analysis import RoutePath, bells_along
+from route_safety.routes import route_safety_bp
+
+
+@pytest.fixture(scope='module')
+def index():
+    rng = np.random.default_rng(3)
+    return GridIndex(rng.uniform(37.42, 37.70, 20000), rng.uniform(126.76, 127.18, 20000))
+
+
+def brute_bells_along(path, index, buffer_km):
+    ids = index.ids
+    segments, distances, along = path.nearest_segments(index.lats[ids], index.lngs[ids])
+    return np.sort(ids[distances <= buffer_km])
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('buffer_km', [0.05, 0.3])
+def test_bells_along_matches_brute_force(index, seed, buffer_km):
+    rng = np.random.default_rng(seed)
+    # 무작위 방향으로 꺾이는 5km 안팎의 도보 경로
+    steps = rng.normal(0, 0.004, (40, 2))
+    points = np.array([37.55, 126.98]) + np.cumsum(steps, axis=0)
+    path = RoutePath(points[:, 0], points[:, 1])
+    ids, _, _, _ = bells_along(path, index, buffer_km)
+    np.testing.assert_array_equal(np.sort(ids), brute_bells_along(path, index, buffer_km))
+
+
+def test_corridor_cells_follow_the_segment(index):
+    # 대각선 10km 선분: 경계 사각형(약 80 x 100 셀) 대신 선분 주변 셀만
+    path = RoutePath([37.45, 37.65], [126.80, 127.10])
+    cells = path.corridor_cells(0.1, index.cell_size)
+    assert len(cells) < 200
+
+
+def test_corridor_cells_are_clamped_to_index_bounds(index):
+    path = RoutePath([-60.0, 60.0], [-170.0, 170.0])
+    started = time.perf_counter()
+    cells = path.corridor_cells(0.1, index.cell_size, index.bounds)
+    assert time.perf_counter() - started < 0.5
+    min_row, min_col, max_row, max_col = index.bounds
+    assert all(min_row <= row <= max_row and min_col <= col <= max_col for row, col in cells)
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.register_blueprint(route_safety_bp, url_prefix='/api/route')
+    return app.test_client()
+
+
+@pytest.mark.parametrize('points', [
+    [[-60, -170], [60, 170]],
+    [[37.5, 126.9], [38.5, 127.9]],
+    [[37.5, 126.9], [95, 127.0]],
+])
+def test_rejects_routes_beyond_city_scale(client, points):
+    started = time.perf_counter()
+    response = client.post('/api/route/safety', json={'points': points})
+    assert response.status_code == 400
+    assert time.perf_counter() - started < 0.5